@@ -152,6 +152,19 @@ class KeyTime:
         )
 
 
+@dataclass
+class KeysPage:
+    content: list[KeyTime]
+    cursor: int | None
+
+    @classmethod
+    def from_core(cls, core: dto.TypedKeysPage):
+        return cls(
+            content=[KeyTime.from_core(key_time) for key_time in core.keys],
+            cursor=core.cursor,
+        )
+
+
 @dataclass
 class LevelTime:
     id: int
@@ -3,16 +3,18 @@ from typing import Annotated
 from dishka.integrations.fastapi import FromDishka
 from dishka.integrations.fastapi import inject
 from fastapi import APIRouter
-from fastapi.params import Path
+from fastapi.params import Path, Header, Query
 from fastapi.responses import StreamingResponse, Response
 from starlette.status import HTTP_404_NOT_FOUND, HTTP_403_FORBIDDEN
 
 from shvatka.api.models import responses
 from shvatka.api.utils.error_converter import to_http_error
+from shvatka.api.utils.file_response import stream_file
 from shvatka.core.games.interactors import (
     GameFileReaderInteractor,
     GamePlayReaderInteractor,
     GameKeysReaderInteractor,
+    GameKeysPageReaderInteractor,
     GameStatReaderInteractor,
 )
 from shvatka.core.models import dto
@@ -22,6 +24,7 @@ from shvatka.core.services.game import (
     get_full_game,
     get_active,
 )
+from shvatka.core.services.game_stat import MAX_KEYS_PAGE_SIZE
 from shvatka.core.utils import exceptions
 from shvatka.infrastructure.db.dao.holder import HolderDao
 
@@ -73,6 +76,27 @@ async def get_game_keys(
     return {k: [responses.KeyTime.from_core(key_time) for key_time in v] for k, v in keys.items()}
 
 
+@inject
+async def get_game_keys_log(
+    interactor: FromDishka[GameKeysPageReaderInteractor],
+    user: FromDishka[dto.User],
+    id_: Annotated[int, Path(alias="id")],
+    since: Annotated[int | None, Query()] = None,
+    limit: Annotated[int, Query(gt=0, le=MAX_KEYS_PAGE_SIZE)] = MAX_KEYS_PAGE_SIZE,
+    team_id: Annotated[int | None, Query()] = None,
+    level_number: Annotated[int | None, Query()] = None,
+) -> responses.KeysPage:
+    page = await interactor(
+        user=user,
+        game_id=id_,
+        since=since,
+        limit=limit,
+        team_id=team_id,
+        level_number=level_number,
+    )
+    return responses.KeysPage.from_core(page)
+
+
 @inject
 async def get_game_stat(
     interactor: FromDishka[GameStatReaderInteractor],
@@ -89,13 +113,15 @@ async def get_game_file(
     file_reader: FromDishka[GameFileReaderInteractor],
     id_: Annotated[int, Path(alias="id")],
     guid: Annotated[str, Path(alias="guid")],
+    range_: Annotated[str | None, Header(alias="Range")] = None,
 ) -> StreamingResponse:
     try:
-        return StreamingResponse(b for b in await file_reader(guid=guid, user=user, game_id=id_))
+        reader = await file_reader(guid=guid, user=user, game_id=id_)
     except exceptions.FileNotFound as e:
         raise to_http_error(e, HTTP_404_NOT_FOUND) from e
     except exceptions.NotAuthorizedForEdit as e:
         raise to_http_error(e, HTTP_403_FORBIDDEN) from e
+    return stream_file(reader, range_)
 
 
 @inject
@@ -114,6 +140,7 @@ def setup() -> APIRouter:
     router.add_api_route("/running/hints", get_running_game_hints, methods=["GET"])
     router.add_api_route("/{id}", get_game_card, methods=["GET"])
     router.add_api_route("/{id}/keys", get_game_keys, methods=["GET"])
+    router.add_api_route("/{id}/keys/log", get_game_keys_log, methods=["GET"])
     router.add_api_route("/{id}/stat", get_game_stat, methods=["GET"])
     router.add_api_route("/{id}/files/{guid}", get_game_file, methods=["GET"])
     return router
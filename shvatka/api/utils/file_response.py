@@ -0,0 +1,50 @@
+import re
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from starlette.status import HTTP_206_PARTIAL_CONTENT, HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+
+from shvatka.core.interfaces.clients.file_storage import FileReader
+
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def stream_file(reader: FileReader, range_header: str | None = None) -> StreamingResponse:
+    headers = {"Accept-Ranges": "bytes"}
+    bytes_range = parse_range(range_header, reader.size) if range_header else None
+    if bytes_range is None:
+        headers["Content-Length"] = str(reader.size)
+        return StreamingResponse(reader.iter_chunks(), headers=headers)
+    start, stop = bytes_range
+    headers["Content-Length"] = str(stop - start)
+    headers["Content-Range"] = f"bytes {start}-{stop - 1}/{reader.size}"
+    return StreamingResponse(
+        reader.iter_chunks(start, stop),
+        status_code=HTTP_206_PARTIAL_CONTENT,
+        headers=headers,
+    )
+
+
+def parse_range(range_header: str, size: int) -> tuple[int, int] | None:
+    """
+    :return: start and stop (not included) byte of the only range in header
+    or None if whole content should be sent
+    (header is malformed or asks for several ranges).
+    """
+    match = RANGE_PATTERN.match(range_header.strip())
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        start, stop = max(size - int(last), 0), size
+    else:
+        start = int(first)
+        stop = min(int(last) + 1, size) if last else size
+    if start >= stop:
+        raise HTTPException(
+            status_code=HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, stop
@@ -1 +1,2 @@
 TIME_TO_PREPARING_GAME = 5
+TIME_TO_WARM_UP_FILES = 30
@@ -1,6 +1,6 @@
 from typing import Protocol
 
-from shvatka.core.interfaces.dal.complex import TypedKeyGetter, GameStatDao
+from shvatka.core.interfaces.dal.complex import TypedKeyGetter, GameStatDao, TypedKeysPageGetter
 from shvatka.core.interfaces.dal.file_info import FileInfoGetter
 from shvatka.core.interfaces.dal.game import GameByIdGetter, ActiveGameFinder
 from shvatka.core.interfaces.dal.key_log import GameTeamKeyGetter
@@ -10,7 +10,9 @@ from shvatka.core.interfaces.dal.player import PlayerByUserGetter, TeamByPlayerG
 from shvatka.core.interfaces.dal.waiver import WaiverChecker
 
 
-class GameKeysReader(TypedKeyGetter, GameByIdGetter, PlayerByUserGetter, Protocol):
+class GameKeysReader(
+    TypedKeyGetter, TypedKeysPageGetter, GameByIdGetter, PlayerByUserGetter, Protocol
+):
     pass
 
 
@@ -1,8 +1,7 @@
 from datetime import datetime
-from typing import BinaryIO
 
 from shvatka.core.games.dto import CurrentHints
-from shvatka.core.interfaces.clients.file_storage import FileGateway
+from shvatka.core.interfaces.clients.file_storage import FileGateway, FileReader
 from shvatka.core.games.adapters import (
     GameFileReader,
     GamePlayReader,
@@ -11,7 +10,7 @@ from shvatka.core.games.adapters import (
 )
 from shvatka.core.models import dto
 from shvatka.core.rules.game import check_can_read
-from shvatka.core.services.game_stat import get_typed_keys, get_game_stat
+from shvatka.core.services.game_stat import get_typed_keys, get_game_stat, get_typed_keys_page
 from shvatka.core.services.scenario.files import check_file_meta_can_read
 from shvatka.core.utils import exceptions
 from shvatka.core.utils.datetime_utils import tz_utc
@@ -28,6 +27,32 @@ class GameKeysReaderInteractor:
         return {t.id: k for t, k in keys.items()}
 
 
+class GameKeysPageReaderInteractor:
+    def __init__(self, dao: GameKeysReader):
+        self.dao = dao
+
+    async def __call__(
+        self,
+        game_id: int,
+        user: dto.User,
+        since: int | None,
+        limit: int,
+        team_id: int | None = None,
+        level_number: int | None = None,
+    ) -> dto.TypedKeysPage:
+        player = await self.dao.get_by_user(user)
+        game = await self.dao.get_by_id(game_id)
+        return await get_typed_keys_page(
+            game,
+            player,
+            self.dao,
+            since=since,
+            limit=limit,
+            team_id=team_id,
+            level_number=level_number,
+        )
+
+
 class GameStatReaderInteractor:
     def __init__(self, dao: GameStatReader):
         self.dao = dao
@@ -43,7 +68,7 @@ class GameFileReaderInteractor:
         self.file_gateway = file_gateway
         self.dao = dao
 
-    async def __call__(self, guid: str, game_id: int, user: dto.User) -> BinaryIO:
+    async def __call__(self, guid: str, game_id: int, user: dto.User) -> FileReader:
         player = await self.dao.get_by_user(user)
         game = await self.dao.get_full(game_id)
         check_can_read(game, player)
@@ -59,7 +84,7 @@ class GameFileReaderInteractor:
             )
         meta = await self.dao.get_by_guid(guid)
         check_file_meta_can_read(player, meta, game)
-        return await self.file_gateway.get(meta)
+        return await self.file_gateway.open(meta)
 
 
 class GamePlayReaderInteractor:
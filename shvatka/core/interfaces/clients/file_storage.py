@@ -1,16 +1,39 @@
-from typing import Protocol, BinaryIO
+from typing import Protocol, BinaryIO, AsyncIterator
 
 from shvatka.core.models import dto
 from shvatka.core.models.dto import hints
 
 
+class FileReader(Protocol):
+    size: int
+
+    def iter_chunks(self, start: int = 0, stop: int | None = None) -> AsyncIterator[bytes]:
+        """content from start to stop (not included) byte, read by chunks"""
+        raise NotImplementedError
+
+
 class FileGateway(Protocol):
     async def put(self, file_meta: hints.UploadedFileMeta, content: BinaryIO, author: dto.Player):
         raise NotImplementedError
 
+    async def upload(
+        self, file_meta: hints.UploadedFileMeta, content: BinaryIO, author: dto.Player
+    ) -> hints.FileMeta:
+        """put content to storage and telegram, but not save file meta to db"""
+        raise NotImplementedError
+
     async def get(self, file_link: hints.FileMeta) -> BinaryIO:
         raise NotImplementedError
 
+    async def open(self, file_meta: hints.FileMeta) -> FileReader:
+        raise NotImplementedError
+
+    async def is_tg_link_valid(self, file_meta: hints.FileMeta) -> bool:
+        raise NotImplementedError
+
+    async def renew_file_id(self, author: dto.Player, file_meta: hints.StoredFileMeta) -> None:
+        raise NotImplementedError
+
 
 class FileStorage(Protocol):
     async def put(self, file_meta: hints.UploadedFileMeta, content: BinaryIO) -> hints.FileMeta:
@@ -19,5 +42,8 @@ class FileStorage(Protocol):
     async def get(self, file_link: hints.FileContentLink) -> BinaryIO:
         raise NotImplementedError
 
+    async def open(self, file_link: hints.FileContentLink) -> FileReader:
+        raise NotImplementedError
+
     async def put_content(self, local_file_name: str, content: BinaryIO) -> hints.FileContentLink:
         raise NotImplementedError
@@ -1,16 +1,26 @@
 from typing import Protocol
 
 from shvatka.core.interfaces.dal.base import Committer
-from shvatka.core.interfaces.dal.file_info import FileInfoGetter
+from shvatka.core.interfaces.dal.file_info import FileInfosGetter
 from shvatka.core.interfaces.dal.game import (
     MaxGameNumberGetter,
     GameNumberUpdater,
     GameStatusCompleter,
     GameByIdGetter,
+    SeasonGamesFinder,
+)
+from shvatka.core.interfaces.dal.key_log import (
+    TeamKeysMerger,
+    GameKeyGetter,
+    GameKeysPageGetter,
 )
-from shvatka.core.interfaces.dal.key_log import TeamKeysMerger, GameKeyGetter
 from shvatka.core.interfaces.dal.level import MaxLevelNumberGetter
-from shvatka.core.interfaces.dal.level_times import TeamLevelsMerger, LevelTimesGetter
+from shvatka.core.interfaces.dal.level_times import (
+    TeamLevelsMerger,
+    LevelTimesGetter,
+    CurrentLevelTimesGetter,
+    GamesLevelTimesGetter,
+)
 from shvatka.core.interfaces.dal.organizer import OrgByPlayerGetter
 from shvatka.core.interfaces.dal.player import TeamPlayersMerger
 from shvatka.core.interfaces.dal.team import ForumTeamMerger, TeamRemover
@@ -35,18 +45,31 @@ class TypedKeyGetter(GameKeyGetter, OrgByPlayerGetter, Protocol):
     pass
 
 
+class TypedKeysPageGetter(GameKeysPageGetter, OrgByPlayerGetter, Protocol):
+    pass
+
+
 class GameStatDao(
-    OrgByPlayerGetter, LevelTimesGetter, MaxLevelNumberGetter, GameByIdGetter, Protocol
+    OrgByPlayerGetter,
+    LevelTimesGetter,
+    CurrentLevelTimesGetter,
+    MaxLevelNumberGetter,
+    GameByIdGetter,
+    Protocol,
 ):
     pass
 
 
+class SeasonStatDao(SeasonGamesFinder, GamesLevelTimesGetter, Protocol):
+    pass
+
+
 class GameCompleter(
     MaxGameNumberGetter, GameNumberUpdater, GameStatusCompleter, Committer, Protocol
 ):
     pass
 
 
-class GamePackager(GameKeyGetter, LevelTimesGetter, GameWaiversGetter, FileInfoGetter, Protocol):
+class GamePackager(GameKeyGetter, LevelTimesGetter, GameWaiversGetter, FileInfosGetter, Protocol):
     async def get_full(self, id_: int) -> dto.FullGame:
         raise NotImplementedError
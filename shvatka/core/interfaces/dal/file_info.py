@@ -1,5 +1,7 @@
-from typing import Protocol
+from typing import Protocol, Iterable
 
+from shvatka.core.interfaces.dal.base import Committer
+from shvatka.core.interfaces.dal.organizer import GameOrgsGetter
 from shvatka.core.models import dto
 from shvatka.core.models.dto import hints
 
@@ -12,3 +14,12 @@ class FileInfoMerger(Protocol):
 class FileInfoGetter(Protocol):
     async def get_by_guid(self, guid: str) -> hints.VerifiableFileMeta:
         raise NotImplementedError
+
+
+class FileInfosGetter(Protocol):
+    async def get_by_guids(self, guids: Iterable[str]) -> dict[str, hints.VerifiableFileMeta]:
+        raise NotImplementedError
+
+
+class FilesWarmUpDao(FileInfosGetter, GameOrgsGetter, Committer, Protocol):
+    pass
@@ -1,8 +1,8 @@
 from datetime import datetime
-from typing import Protocol
+from typing import Protocol, Iterable, Sequence
 
 from shvatka.core.interfaces.dal.base import Committer
-from shvatka.core.interfaces.dal.level import LevelUpserter
+from shvatka.core.interfaces.dal.level import LevelUpserter, GameLevelsUpserter
 from shvatka.core.models import dto
 from shvatka.core.models.dto import scn
 from shvatka.core.models.dto import hints
@@ -28,14 +28,16 @@ class GameStatusCompleter(Protocol):
         raise NotImplementedError
 
 
-class GameUpserter(LevelUpserter, GameNameChecker, Protocol):
+class GameUpserter(LevelUpserter, GameLevelsUpserter, GameNameChecker, Protocol):
     async def upsert_game(self, author: dto.Player, scenario: scn.GameScenario) -> dto.Game:
         raise NotImplementedError
 
-    async def upsert_file(self, file: hints.FileMeta, author: dto.Player) -> hints.SavedFileMeta:
+    async def upsert_files(
+        self, files: Sequence[hints.FileMeta], author: dto.Player
+    ) -> list[hints.SavedFileMeta]:
         raise NotImplementedError
 
-    async def check_author_can_own_guid(self, author: dto.Player, guid: str) -> None:
+    async def check_author_can_own_guids(self, author: dto.Player, guids: Iterable[str]) -> None:
         raise NotImplementedError
 
     async def is_author_game_by_name(self, name: str, author: dto.Player) -> bool:
@@ -102,6 +104,13 @@ class CompletedGameFinder(Protocol):
         raise NotImplementedError
 
 
+class SeasonGamesFinder(Protocol):
+    async def get_completed_games_started_between(
+        self, started_from: datetime, started_to: datetime
+    ) -> list[dto.Game]:
+        raise NotImplementedError
+
+
 class GameAuthorMerger(Protocol):
     async def replace_games_author(self, primary: dto.Player, secondary: dto.Player) -> None:
         raise NotImplementedError
@@ -34,6 +34,11 @@ class GamePlayerDao(Committer, WaiverChecker, GameOrgsGetter, LevelByTeamGetter,
     async def get_current_level(self, team: dto.Team, game: dto.Game) -> dto.Level:
         raise NotImplementedError
 
+    async def get_key_submission_state(
+        self, team: dto.Team, game: dto.Game
+    ) -> dto.KeySubmissionState:
+        raise NotImplementedError
+
     async def get_correct_typed_keys(
         self,
         level_time: dto.LevelTime,
@@ -66,9 +71,3 @@ class GamePlayerDao(Committer, WaiverChecker, GameOrgsGetter, LevelByTeamGetter,
 
     async def finish(self, game: dto.Game) -> None:
         raise NotImplementedError
-
-    async def get_next_level(self, level: dto.Level, game: dto.Game) -> dto.Level:
-        raise NotImplementedError
-
-    async def get_level_by_name(self, level_name: str, game: dto.Game) -> dto.Level | None:
-        raise NotImplementedError
@@ -8,6 +8,18 @@ class GameKeyGetter(Protocol):
         raise NotImplementedError
 
 
+class GameKeysPageGetter(Protocol):
+    async def get_typed_keys_page(
+        self,
+        game: dto.Game,
+        since: int | None,
+        limit: int,
+        team_id: int | None = None,
+        level_number: int | None = None,
+    ) -> dto.TypedKeysPage:
+        raise NotImplementedError
+
+
 class GameTeamKeyGetter(Protocol):
     async def get_team_typed_keys(
         self, game: dto.Game, team: dto.Team, level_time: dto.LevelTime
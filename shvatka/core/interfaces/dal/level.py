@@ -1,4 +1,4 @@
-from typing import Protocol
+from typing import Protocol, Sequence
 
 from shvatka.core.interfaces.dal.base import Committer
 from shvatka.core.models import dto
@@ -19,6 +19,13 @@ class LevelUpserter(Committer, Protocol):
         raise NotImplementedError
 
 
+class GameLevelsUpserter(Protocol):
+    async def upsert_game_levels(
+        self, author: dto.Player, scenarios: Sequence[scn.LevelScenario], game: dto.Game
+    ) -> list[dto.Level]:
+        raise NotImplementedError
+
+
 class LevelByGameAndNumberGetter(Protocol):
     async def get_level_by_game_and_number(self, game: dto.Game, number: int) -> dto.Level:
         raise NotImplementedError
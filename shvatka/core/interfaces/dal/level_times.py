@@ -1,22 +1,22 @@
-from typing import Iterable, Protocol
+from typing import Iterable, Protocol, Sequence
 
 from shvatka.core.interfaces.dal.base import Committer
 from shvatka.core.models import dto
 
 
 class GameStarter(Committer, Protocol):
-    async def set_game_started(self, game: dto.Game) -> None:
+    async def set_game_started(self, game: dto.FullGame) -> None:
         raise NotImplementedError
 
     async def get_played_teams(self, game: dto.Game) -> Iterable[dto.Team]:
         raise NotImplementedError
 
-    async def set_to_level(
+    async def set_all_to_level(
         self,
-        team: dto.Team,
+        teams: Sequence[dto.Team],
         game: dto.Game,
         level_number: int,
-    ) -> dto.LevelTime:
+    ) -> list[dto.LevelTime]:
         raise NotImplementedError
 
 
@@ -35,6 +35,26 @@ class LevelTimesGetter(Protocol):
         raise NotImplementedError
 
 
+class GamesLevelTimesGetter(Protocol):
+    async def get_games_level_times(
+        self, games: Sequence[dto.Game]
+    ) -> dict[int, dict[dto.Team, list[dto.LevelTime]]]:
+        """by game id, then by team"""
+        raise NotImplementedError
+
+
+class CurrentLevelTimesGetter(Protocol):
+    async def get_current_level_times_with_hints(
+        self, game: dto.FullGame
+    ) -> list[dto.LevelTimeOnGame]:
+        raise NotImplementedError
+
+
+class TeamsLevelTimeGetter(Protocol):
+    async def get_current_level_times(self, game: dto.Game) -> list[dto.LevelTime]:
+        raise NotImplementedError
+
+
 class LevelByTeamGetter(Protocol):
     async def get_current_level_time(self, team: dto.Team, game: dto.Game) -> dto.LevelTime:
         raise NotImplementedError
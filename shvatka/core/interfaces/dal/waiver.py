@@ -1,4 +1,4 @@
-from typing import Iterable, Protocol
+from typing import Iterable, Protocol, Sequence
 
 from shvatka.core.interfaces.dal.base import Committer
 from shvatka.core.interfaces.dal.player import TeamPlayerGetter, TeamPlayersGetter
@@ -36,6 +36,9 @@ class WaiverApprover(Committer, TeamPlayerGetter, WaiverVoteGetter, TeamPlayersG
     async def upsert(self, waiver: dto.Waiver):
         raise NotImplementedError
 
+    async def upsert_many(self, waivers: Sequence[dto.Waiver]):
+        raise NotImplementedError
+
     async def del_player_vote(self, team_id: int, player_id: int) -> None:
         raise NotImplementedError
 
@@ -47,6 +50,9 @@ class GameWaiversGetter(Protocol):
     async def get_played(self, game: dto.Game, team: dto.Team) -> Iterable[dto.VotedPlayer]:
         raise NotImplementedError
 
+    async def get_all_played(self, game: dto.Game) -> dict[dto.Team, list[dto.VotedPlayer]]:
+        raise NotImplementedError
+
     async def get_all_by_game(self, game: dto.Game) -> list[dto.Waiver]:
         raise NotImplementedError
 
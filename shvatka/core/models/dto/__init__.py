@@ -12,7 +12,7 @@ from .level_testing import (
     SimpleKey,
     LevelTestingResult,
 )
-from .levels_times import LevelTime, GameStat, LevelTimeOnGame, SpyHintInfo
+from .levels_times import LevelTime, GameStat, LevelTimeOnGame, SpyHintInfo, ScheduledHint
 from .organizer import Organizer, PrimaryOrganizer, SecondaryOrganizer
 from .player import Player, PlayerWithStat
 from .poll import VotedPlayer, Vote
@@ -21,6 +21,8 @@ from .team_player import TeamPlayer, FullTeamPlayer, TeamDataRange
 from .time_key import (
     KeyTime,
     InsertedKey,
+    TypedKeysPage,
+    KeySubmissionState,
     KeyInsertResult,
     ParsedKey,
     ParsedBonusKey,
@@ -1,6 +1,7 @@
 import typing
 from abc import abstractmethod
 from dataclasses import dataclass
+from functools import cached_property
 from typing import Literal
 
 from shvatka.core.models import enums
@@ -180,10 +181,11 @@ class KeyBonusCondition(KeyCondition):
         return {key.text for key in self.keys}
 
     def _get_bonus(self, action: TypedKeyAction) -> BonusKey | None:
-        for bonus_key in self.keys:
-            if action.key == bonus_key.text:
-                return bonus_key
-        return None
+        return self._keys_by_text.get(action.key)
+
+    @cached_property
+    def _keys_by_text(self) -> dict[SHKey, BonusKey]:
+        return {key.text: key for key in self.keys}
 
 
 @dataclass(kw_only=True)
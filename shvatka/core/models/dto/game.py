@@ -2,8 +2,9 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from functools import cached_property
 
-from shvatka.core.config.constants import TIME_TO_PREPARING_GAME
+from shvatka.core.config.constants import TIME_TO_PREPARING_GAME, TIME_TO_WARM_UP_FILES
 from shvatka.core.models.enums import GameStatus
 from shvatka.core.models.enums.game_status import ACTIVE_STATUSES, EDITABLE_STATUSES
 from shvatka.core.utils.datetime_utils import tz_game, tz_utc
@@ -48,6 +49,10 @@ class Game:
     def prepared_at(self):
         return self.start_at - timedelta(minutes=TIME_TO_PREPARING_GAME)
 
+    @property
+    def files_warm_up_at(self):
+        return self.start_at - timedelta(minutes=TIME_TO_WARM_UP_FILES)
+
     @property
     def can_be_delete(self) -> bool:
         return self.status in (GameStatus.underconstruction, GameStatus.ready)
@@ -123,6 +128,31 @@ class FullGame(Game):
     def get_hint(self, level_number: int, hint_number: int) -> hints.TimeHint:
         return self.levels[level_number].get_hint(hint_number)
 
+    def get_level_by_number(self, level_number: int) -> Level:
+        return self._levels_by_number[level_number]
+
+    def get_level_by_name_id(self, name_id: str) -> Level | None:
+        return self._levels_by_name_id.get(name_id)
+
+    def get_level_by_db_id(self, db_id: int) -> Level | None:
+        return self._levels_by_db_id.get(db_id)
+
+    @cached_property
+    def _levels_by_number(self) -> dict[int, Level]:
+        return {
+            level.number_in_game: level
+            for level in self.levels
+            if level.number_in_game is not None
+        }
+
+    @cached_property
+    def _levels_by_name_id(self) -> dict[str, Level]:
+        return {level.name_id: level for level in self.levels}
+
+    @cached_property
+    def _levels_by_db_id(self) -> dict[int, Level]:
+        return {level.db_id: level for level in self.levels}
+
     @property
     def hints_count(self) -> int:
         return sum(level.hints_count for level in self.levels)
@@ -4,6 +4,7 @@ from dataclasses import dataclass
 from datetime import datetime
 
 from .game import Game
+from .level import Level
 from .team import Team
 
 
@@ -34,6 +35,14 @@ class LevelTime:
         )
 
 
+@dataclass(frozen=True)
+class ScheduledHint:
+    level: Level
+    team_id: int
+    hint_number: int
+    lt_id: int
+
+
 @dataclass
 class SpyHintInfo:
     number: int
@@ -4,12 +4,14 @@ from .game import (
     ParsedGameScenario,
     ParsedCompletedGameScenario,
     RawGameScenario,
+    GamePackage,
     UploadedGameScenario,
     check_all_files_saved,
 )
 
 from .level import (
     LevelScenario,
+    CompiledLevel,
     HintsList,
     Conditions,
     check_all_files_in_hints_saved,
@@ -55,6 +55,15 @@ class RawGameScenario:
     stat: dict | None = None
 
 
+@dataclass
+class GamePackage:
+    """scenario for packing, files contents are read only during packing"""
+
+    scn: dict
+    files: Sequence[hints.FileMeta]
+    stat: dict | None = None
+
+
 def check_all_files_saved(game: GameScenario, guids: set[str]):
     for level in game.levels:
         check_all_in_level_saved(level, guids)
@@ -1,7 +1,9 @@
 import logging
-from collections.abc import Sequence, Iterable
+from bisect import bisect_left
+from collections.abc import Sequence, Iterable, Mapping
 from dataclasses import dataclass
 from datetime import timedelta
+from functools import cached_property
 from typing import overload, Literal
 
 from shvatka.core.models.dto import action, hints
@@ -12,18 +14,15 @@ from shvatka.core.models.dto.action import (
     Action,
     Decision,
     StateHolder,
-    DecisionType,
-    Decisions,
-    TypedKeyDecision,
     KeyBonusCondition,
     NotImplementedActionDecision,
-    BonusKeyDecision,
     AnyCondition,
 )
 from shvatka.core.models.dto.action.keys import (
     SHKey,
     KeyWinCondition,
     TypedKeyAction,
+    TypedKeysState,
     WrongKeyDecision,
     BonusKey,
     KeyCondition,
@@ -180,14 +179,14 @@ class Conditions(Sequence[AnyCondition]):
         result: set[SHKey] = set()
         for condition in self.conditions:
             if isinstance(condition, KeyWinCondition):
-                result = result.union(condition.keys)
+                result.update(condition.keys)
         return result
 
     def get_bonus_keys(self) -> set[BonusKey]:
         result: set[BonusKey] = set()
         for condition in self.conditions:
             if isinstance(condition, KeyBonusCondition):
-                result = result.union(condition.keys)
+                result.update(condition.keys)
         return result
 
     @property
@@ -225,6 +224,55 @@ class Conditions(Sequence[AnyCondition]):
         return self.conditions == other.conditions
 
 
+@dataclass(frozen=True)
+class CompiledLevel:
+    """
+    Собранная один раз при загрузке уровня форма сценария:
+    условие ищется по ключу, подсказка по времени - бинарным поиском.
+    """
+
+    id: str
+    time_hints: HintsList
+    hint_times: tuple[timedelta, ...]
+    keys: frozenset[SHKey]
+    bonus_keys: frozenset[BonusKey]
+    conditions_by_key: Mapping[SHKey, KeyCondition]
+
+    @classmethod
+    def compile(
+        cls,
+        id: str,  # noqa: A002
+        time_hints: HintsList,
+        conditions: Conditions,
+    ) -> "CompiledLevel":
+        conditions_by_key: dict[SHKey, KeyCondition] = {}
+        for condition in conditions:
+            for key in condition.get_keys():
+                conditions_by_key[key] = condition
+        return cls(
+            id=id,
+            time_hints=time_hints,
+            hint_times=tuple(timedelta(minutes=hint.time) for hint in time_hints),
+            keys=frozenset(conditions.get_keys()),
+            bonus_keys=frozenset(conditions.get_bonus_keys()),
+            conditions_by_key=conditions_by_key,
+        )
+
+    def check(self, action: Action, state: StateHolder) -> Decision:
+        if not isinstance(action, TypedKeyAction):
+            return NotImplementedActionDecision()
+        condition = self.conditions_by_key.get(action.key)
+        if condition is None:
+            typed = state.get(TypedKeysState)
+            return WrongKeyDecision(duplicate=typed.is_duplicate(action), key=action.key)
+        return condition.check(action, state)
+
+    def get_hint_by_time(self, time: timedelta) -> EnumeratedTimeHint:
+        number = max(bisect_left(self.hint_times, time) - 1, 0)
+        hint = self.time_hints[number]
+        return EnumeratedTimeHint(time=hint.time, hint=hint.hint, number=number)
+
+
 @dataclass
 class LevelScenario:
     id: str
@@ -240,37 +288,23 @@ class LevelScenario:
         return self.time_hints[hint_number]
 
     def get_hint_by_time(self, time: timedelta) -> EnumeratedTimeHint:
-        return self.time_hints.get_hint_by_time(time)
+        return self.compiled.get_hint_by_time(time)
+
+    @cached_property
+    def compiled(self) -> CompiledLevel:
+        return CompiledLevel.compile(self.id, self.time_hints, self.conditions)
 
     def is_last_hint(self, hint_number: int) -> bool:
         return len(self.time_hints) == hint_number + 1
 
     def check(self, action: Action, state: StateHolder) -> Decision:
-        decisions = Decisions([cond.check(action, state) for cond in self.conditions])
-        implemented = decisions.get_implemented()
-        if not implemented:
-            return NotImplementedActionDecision()
-        if isinstance(action, TypedKeyAction):
-            if bonuses := implemented.get_all(BonusKeyDecision):
-                return bonuses.get_exactly_one(self.id)
-            key_decisions = implemented.get_all(TypedKeyDecision, WrongKeyDecision)
-            if not key_decisions:
-                return NotImplementedActionDecision()
-            if not key_decisions.get_significant():
-                assert all(d.type == DecisionType.NO_ACTION for d in key_decisions)
-                if duplicate_correct := key_decisions.get_all(TypedKeyDecision):
-                    return duplicate_correct.get_exactly_one(self.id)
-                return key_decisions[0]
-            significant_key_decisions = key_decisions.get_significant()
-            return significant_key_decisions.get_exactly_one(self.id)
-        else:
-            return NotImplementedActionDecision()
+        return self.compiled.check(action, state)
 
     def get_keys(self) -> set[SHKey]:
-        return self.conditions.get_keys()
+        return set(self.compiled.keys)
 
     def get_bonus_keys(self) -> set[BonusKey]:
-        return self.conditions.get_bonus_keys()
+        return set(self.compiled.bonus_keys)
 
     def get_guids(self) -> list[str]:
         guids = []
@@ -40,6 +40,20 @@ class InsertedKey(KeyTime):
         )
 
 
+@dataclass(frozen=True)
+class TypedKeysPage:
+    keys: list[KeyTime]
+    # id последнего ключа, с него начинается следующая страница
+    cursor: int | None
+
+
+@dataclass(frozen=True)
+class KeySubmissionState:
+    level_time: dto.LevelTime
+    typed_correct: set[action.SHKey]
+    all_typed: set[action.SHKey]
+
+
 @dataclass
 class KeyInsertResult:
     type_: enums.KeyType
@@ -27,11 +27,12 @@ from shvatka.core.rules.level import (
     check_can_link_to_game,
 )
 from shvatka.core.services.player import check_allow_be_author
-from shvatka.core.services.scenario.files import upsert_files, get_file_metas, get_file_contents
+from shvatka.core.services.scenario.files import upsert_files, get_file_metas
 from shvatka.core.services.scenario.game_ops import parse_uploaded_game
 from shvatka.core.models.dto.scn.game import check_all_files_saved
 from shvatka.core.utils import exceptions
 from shvatka.core.utils.exceptions import AnotherGameIsActive, CantEditGame
+from shvatka.core.utils.timing import StageTimer
 
 
 async def upsert_game(
@@ -42,7 +43,9 @@ async def upsert_game(
     file_gateway: FileGateway,
 ) -> dto.FullGame:
     check_allow_be_author(author)
-    game_scn = parse_uploaded_game(raw_scn, retort)
+    timer = StageTimer(f"upsert game by {author.id}")
+    with timer.stage("parse"):
+        game_scn = parse_uploaded_game(raw_scn, retort)
     if not await dao.is_name_available(name=game_scn.name):
         if not await dao.is_author_game_by_name(name=game_scn.name, author=author):
             raise CantEditGame(
@@ -50,15 +53,15 @@ async def upsert_game(
             )
         game = await dao.get_game_by_name(name=game_scn.name, author=author)
         check_game_editable(game)
-    guids = await upsert_files(author, raw_scn.files, game_scn.files, dao, file_gateway)
+    with timer.stage(f"{len(game_scn.files)} files"):
+        guids = await upsert_files(author, raw_scn.files, game_scn.files, dao, file_gateway)
     check_all_files_saved(game=game_scn, guids=guids)
-    game = await dao.upsert_game(author, game_scn)
-    await dao.unlink_all(game)
-    levels = []
-    for number, level in enumerate(game_scn.levels):
-        saved_level = await dao.upsert(author, level, game, number)
-        levels.append(saved_level)
-    await dao.commit()
+    with timer.stage(f"{len(game_scn.levels)} levels"):
+        game = await dao.upsert_game(author, game_scn)
+        await dao.unlink_all(game)
+        levels = await dao.upsert_game_levels(author, game_scn.levels, game)
+    with timer.stage("commit"):
+        await dao.commit()
     return game.to_full_game(levels)
 
 
@@ -123,12 +126,10 @@ async def get_game_package(
     author: dto.Player,
     dao: GamePackager,
     retort: Retort,
-    file_gateway: FileGateway,
-) -> scn.RawGameScenario:
+) -> scn.GamePackage:
     game = await dao.get_full(id_=id_)
     check_can_read(game, author)
     file_metas = await get_file_metas(game, author, dao)
-    contents = await get_file_contents(file_metas, file_gateway)
     scenario = scn.FullGameScenario(
         name=game.name,
         levels=[level.scenario for level in game.levels],
@@ -155,8 +156,8 @@ async def get_game_package(
         )
     else:
         game_stat = None
-    return scn.RawGameScenario(
-        scn=retort.dump(scenario), files=contents, stat=retort.dump(game_stat)
+    return scn.GamePackage(
+        scn=retort.dump(scenario), files=file_metas, stat=retort.dump(game_stat)
     )
 
 
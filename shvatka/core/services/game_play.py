@@ -1,10 +1,17 @@
 import asyncio
 import logging
 import typing
+from typing import Sequence
 from datetime import timedelta, datetime
 
+from shvatka.core.interfaces.clients.file_storage import FileGateway
+from shvatka.core.interfaces.dal.file_info import FilesWarmUpDao
 from shvatka.core.interfaces.dal.game_play import GamePreparer, GamePlayerDao
-from shvatka.core.interfaces.dal.level_times import GameStarter, LevelByTeamGetter
+from shvatka.core.interfaces.dal.level_times import (
+    GameStarter,
+    LevelByTeamGetter,
+    TeamsLevelTimeGetter,
+)
 from shvatka.core.interfaces.scheduler import Scheduler
 from shvatka.core.models import dto, enums
 from shvatka.core.models.dto import hints
@@ -21,6 +28,7 @@ from shvatka.core.views.game import (
     LevelUp,
     GameLogEvent,
     GameLogType,
+    FilesWarmedUp,
 )
 
 logger = logging.getLogger(__name__)
@@ -47,6 +55,44 @@ async def prepare_game(
     await game_preparer.delete_poll_data()
 
 
+async def warm_up_files(
+    game: dto.FullGame,
+    dao: FilesWarmUpDao,
+    file_gateway: FileGateway,
+    org_notifier: OrgNotifier,
+) -> FilesWarmedUp:
+    """
+    Перед началом игры проверяем, что все файлы сценария можно отправить по file_id.
+    Протухшие file_id перезаливаем заранее, чтобы не делать этого
+    во время игры при отправке заданий и подсказок.
+    О результате сообщаем оргам.
+    """
+    guids = list(dict.fromkeys(game.get_guids()))
+    file_metas = await dao.get_by_guids(guids)
+    renewed = []
+    failed = [guid for guid in guids if guid not in file_metas]
+    for guid, file_meta in file_metas.items():
+        if await file_gateway.is_tg_link_valid(file_meta):
+            continue
+        try:
+            await file_gateway.renew_file_id(game.author, file_meta)
+        except Exception as e:
+            logger.exception("can't renew file_id for file %s", guid, exc_info=e)
+            failed.append(guid)
+        else:
+            renewed.append(guid)
+    await dao.commit()
+    result = FilesWarmedUp(
+        orgs_list=await get_orgs(game, dao),
+        game=game,
+        checked=len(guids),
+        renewed=renewed,
+        failed=failed,
+    )
+    await org_notifier.notify(result)
+    return result
+
+
 async def start_game(
     game: dto.FullGame,
     dao: GameStarter,
@@ -68,20 +114,17 @@ async def start_game(
         return
     await dao.set_game_started(game)
     logger.info("game %s started", game.id)
-    teams = await dao.get_played_teams(game)
+    teams = list(await dao.get_played_teams(game))
 
-    level_times = {}
-    for team in teams:
-        level_times[team.id] = await dao.set_to_level(team=team, game=game, level_number=0)
+    level_times = await dao.set_all_to_level(teams=teams, game=game, level_number=0)
     await dao.commit()
 
-    await asyncio.gather(*[view.send_puzzle(team, game.levels[0]) for team in teams])
-
     await asyncio.gather(
+        *[view.send_puzzle(team, game.levels[0]) for team in teams],
         *[
-            schedule_first_hint(scheduler, team, game.levels[0], level_times[team.id].id, now)
-            for team in teams
-        ]
+            schedule_first_hint(scheduler, lt.team, game.levels[0], lt.id, now)
+            for lt in level_times
+        ],
     )
 
     await game_log.log(GameLogEvent(GameLogType.GAME_STARTED, {"game": game.name}))
@@ -171,12 +214,11 @@ async def process_level_up(
     locker: KeyCheckerFactory,
     scheduler: Scheduler,
 ):
-    async with locker.lock_globally():
-        if await dao.is_team_finished(team, game):
-            await finish_team(team, game, view, game_log, dao, locker)
-            return
-    next_level = await dao.get_current_level(team, game)
     lt = await dao.get_current_level_time(team, game)
+    if lt.level_number >= len(game.levels):
+        await finish_team(team, game, view, game_log, dao, locker)
+        return
+    next_level = game.get_level_by_number(lt.level_number)
 
     await view.send_puzzle(team=team, level=next_level)
     await schedule_first_hint(
@@ -210,16 +252,18 @@ async def finish_team(
     :param dao: Слой доступа к бд.
     :param view: Слой отображения данных.
     :param game_log: Логгер игры (публичные уведомления о статусе игры).
-    :param locker: Эту штуку мы просто очистим, если игра кончилась.
+    :param locker: Глобальный лок на завершение игры, очистим, если игра кончилась.
     """
     await view.game_finished(team)
-    if await dao.is_all_team_finished(game):
+    async with locker.lock_globally():
+        if not await dao.is_all_team_finished(game):
+            return
         await dao.finish(game)
         await dao.commit()
-        await game_log.log(GameLogEvent(GameLogType.GAME_FINISHED, {"game": game.name}))
-        locker.clear()
-        for team in await dao.get_played_teams(game):
-            await view.game_finished_by_all(team)
+    await game_log.log(GameLogEvent(GameLogType.GAME_FINISHED, {"game": game.name}))
+    locker.clear()
+    for team in await dao.get_played_teams(game):
+        await view.game_finished_by_all(team)
 
 
 async def send_hint(
@@ -256,6 +300,83 @@ async def send_hint(
             hint_number,
         )
         return
+    await send_hint_and_plain_next(level, lt_id, hint_number, team, view, scheduler)
+
+
+async def send_hints(
+    scheduled: Sequence[dto.ScheduledHint],
+    game: dto.Game,
+    dao: TeamsLevelTimeGetter,
+    view: GameView,
+    scheduler: Scheduler,
+):
+    """
+    Отправить все подсказки, время которых пришло, и запланировать следующие.
+    Текущие уровни всех команд загружаются один раз на всю пачку.
+    Команды получают подсказки параллельно, так что медленный чат одной команды
+    не задерживает остальные. Внутри команды порядок подсказок сохраняется.
+    Ошибка в одной подсказке не мешает отправить остальные.
+    """
+    current_level_times = {lt.team.id: lt for lt in await dao.get_current_level_times(game)}
+    by_team: dict[int, list[dto.ScheduledHint]] = {}
+    for hint in scheduled:
+        lt = current_level_times.get(hint.team_id)
+        if lt is None or lt.id != hint.lt_id:
+            logger.debug(
+                "team %s is not on level %s (should %s, actually %s), skip sending hint #%s",
+                hint.team_id,
+                hint.level.number_in_game,
+                hint.lt_id,
+                lt.id if lt else None,
+                hint.hint_number,
+            )
+            continue
+        by_team.setdefault(hint.team_id, []).append(hint)
+    results = await asyncio.gather(
+        *(
+            send_team_hints(team_hints, current_level_times[team_id].team, view, scheduler)
+            for team_id, team_hints in by_team.items()
+        ),
+        return_exceptions=True,
+    )
+    errors: list[Exception] = []
+    for result in results:
+        if isinstance(result, BaseException):
+            if not isinstance(result, Exception):
+                raise result
+            errors.append(result)
+        else:
+            errors.extend(result)
+    if errors:
+        raise ExceptionGroup("hints not sent", errors)
+
+
+async def send_team_hints(
+    scheduled: Sequence[dto.ScheduledHint],
+    team: dto.Team,
+    view: GameView,
+    scheduler: Scheduler,
+) -> list[Exception]:
+    errors = []
+    for hint in scheduled:
+        try:
+            await send_hint_and_plain_next(
+                hint.level, hint.lt_id, hint.hint_number, team, view, scheduler
+            )
+        except Exception as e:
+            logger.exception("hint #%s for team %s not sent", hint.hint_number, hint.team_id)
+            errors.append(e)
+    return errors
+
+
+async def send_hint_and_plain_next(
+    level: dto.Level,
+    lt_id: int,
+    hint_number: int,
+    team: dto.Team,
+    view: GameView,
+    scheduler: Scheduler,
+):
     await view.send_hint(team, hint_number, level)
     next_hint_number = hint_number + 1
     if level.is_last_hint(hint_number):
@@ -1,7 +1,17 @@
-from shvatka.core.interfaces.dal.complex import TypedKeyGetter, GameStatDao
+from datetime import datetime
+
+from shvatka.core.interfaces.dal.complex import (
+    TypedKeyGetter,
+    GameStatDao,
+    TypedKeysPageGetter,
+    SeasonStatDao,
+)
 from shvatka.core.models import dto
+from shvatka.core.utils.datetime_utils import tz_game
 from shvatka.core.services.organizers import get_by_player, check_can_see_log_keys, check_can_spy
 
+MAX_KEYS_PAGE_SIZE = 500
+
 
 async def get_typed_keys(
     game: dto.Game,
@@ -14,6 +24,28 @@ async def get_typed_keys(
     return await dao.get_typed_keys_grouped(game)
 
 
+async def get_typed_keys_page(
+    game: dto.Game,
+    player: dto.Player,
+    dao: TypedKeysPageGetter,
+    since: int | None = None,
+    limit: int = MAX_KEYS_PAGE_SIZE,
+    team_id: int | None = None,
+    level_number: int | None = None,
+) -> dto.TypedKeysPage:
+    """keys typed after key with id since, sorted by id"""
+    if not game.is_complete():
+        org = await get_by_player(game=game, player=player, dao=dao)
+        check_can_see_log_keys(org)
+    return await dao.get_typed_keys_page(
+        game=game,
+        since=since,
+        limit=min(limit, MAX_KEYS_PAGE_SIZE),
+        team_id=team_id,
+        level_number=level_number,
+    )
+
+
 async def get_game_stat(game: dto.Game, player: dto.Player, dao: GameStatDao) -> dto.GameStat:
     """return sorted by level number grouped by teams stat"""
     if not game.is_complete():
@@ -25,8 +57,27 @@ async def get_game_stat(game: dto.Game, player: dto.Player, dao: GameStatDao) ->
     return dto.GameStat(level_times=result)
 
 
+async def get_season_stat(
+    game: dto.Game, dao: SeasonStatDao
+) -> list[tuple[dto.Game, dict[dto.Team, list[dto.LevelTime]]]]:
+    """
+    level times of completed games of season (calendar year) when game was played,
+    sorted by game number and grouped by teams
+    """
+    assert game.start_at is not None
+    started_from = datetime(game.start_at.astimezone(tz_game).year, 1, 1, tzinfo=tz_game)
+    started_to = started_from.replace(year=started_from.year + 1)
+    games = await dao.get_completed_games_started_between(started_from, started_to)
+    level_times = await dao.get_games_level_times(games)
+    return [(game_, level_times[game_.id]) for game_ in games]
+
+
 async def get_game_spy(
     game: dto.Game, player: dto.Player, dao: GameStatDao
 ) -> list[dto.LevelTimeOnGame]:
-    stat = await get_game_stat(game, player, dao)
-    return [lts[-1] for lts in stat.level_times.values()]
+    """return current level time of every team"""
+    if not game.is_complete():
+        org = await get_by_player(game=game, player=player, dao=dao)
+        check_can_spy(org)
+    full_game = await dao.add_levels(game)
+    return await dao.get_current_level_times_with_hints(full_game)
@@ -32,17 +32,14 @@ class KeyProcessor:
         team: dto.Team,
     ) -> dto.InsertedKey | None:
         async with self.locker(team):
-            level_time = await self.dao.get_current_level_time(team, self.game)
-            lvl = await self.dao.get_current_level(team, self.game)
-            correct_keys = await self.dao.get_correct_typed_keys(
-                level_time=level_time, game=self.game, team=team
-            )
-            all_typed = await self.dao.get_team_typed_keys(self.game, team, level_time=level_time)
+            submission_state = await self.dao.get_key_submission_state(team, self.game)
+            level_time = submission_state.level_time
+            lvl = self.game.get_level_by_number(level_time.level_number)
             state = action.InMemoryStateHolder(
-                typed_correct=correct_keys,
-                all_typed={k.text for k in all_typed},
+                typed_correct=submission_state.typed_correct,
+                all_typed=submission_state.all_typed,
             )
-            decision = lvl.scenario.check(
+            decision = lvl.scenario.compiled.check(
                 action=action.TypedKeyAction(key=key),
                 state=state,
             )
@@ -77,19 +74,12 @@ class KeyProcessor:
     async def define_next_level(self, level: dto.Level, level_name: str | None = None) -> int:
         if level_name is None:
             assert level.number_in_game is not None
-            if len(self.game.levels) == level.number_in_game + 1:
-                return level.number_in_game + 1
-            next_level_ = await self.dao.get_next_level(level, self.game)
-            assert next_level_.number_in_game is not None
-            return next_level_.number_in_game
-        else:
-            next_level = await self.dao.get_level_by_name(level_name, self.game)
-            if next_level is None:
-                raise exceptions.ScenarioNotCorrect(
-                    text="Level name not found", name_id=level_name
-                )
-            assert next_level.number_in_game is not None
-            return next_level.number_in_game
+            return level.number_in_game + 1
+        next_level = self.game.get_level_by_name_id(level_name)
+        if next_level is None:
+            raise exceptions.ScenarioNotCorrect(text="Level name not found", name_id=level_name)
+        assert next_level.number_in_game is not None
+        return next_level.number_in_game
 
 
 def decision_to_parsed_key(
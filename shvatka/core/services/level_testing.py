@@ -83,7 +83,7 @@ async def check_level_testing_key(
     if not is_key_valid(key):
         raise InvalidKey(key=key, player=suite.tester.player)
     async with locker.lock_player(suite.tester.player):
-        keys = suite.level.get_keys()
+        keys = suite.level.scenario.compiled.keys
         is_correct_key = key in keys
         await dao.save_key(
             key=key,
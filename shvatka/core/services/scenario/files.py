@@ -1,11 +1,14 @@
+import asyncio
 from typing import BinaryIO, Sequence
 
 from shvatka.core.interfaces.clients.file_storage import FileGateway
-from shvatka.core.interfaces.dal.file_info import FileInfoGetter
+from shvatka.core.interfaces.dal.file_info import FileInfoGetter, FileInfosGetter
 from shvatka.core.interfaces.dal.game import GameUpserter
 from shvatka.core.models import dto
 from shvatka.core.models.dto import hints
-from shvatka.core.utils.exceptions import NotAuthorizedForEdit
+from shvatka.core.utils.exceptions import NotAuthorizedForEdit, FileNotFound
+
+UPLOAD_CONCURRENCY = 4
 
 
 async def upsert_files(
@@ -14,36 +17,45 @@ async def upsert_files(
     files: list[hints.UploadedFileMeta],
     dao: GameUpserter,
     file_gateway: FileGateway,
+    concurrency: int = UPLOAD_CONCURRENCY,
 ) -> set[str]:
-    guids = set()
-    for file in files:
-        await dao.check_author_can_own_guid(author, file.guid)
-        await file_gateway.put(file, contents[file.guid], author)
-        guids.add(file.guid)
-    return guids
+    if not files:
+        return set()
+    await dao.check_author_can_own_guids(author, [file.guid for file in files])
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def upload(file: hints.UploadedFileMeta) -> hints.FileMeta:
+        async with semaphore:
+            return await file_gateway.upload(file, contents[file.guid], author)
+
+    # uploads don't touch db session, so they can be done concurrently,
+    # and then all files are saved at once
+    uploading = [asyncio.create_task(upload(file)) for file in files]
+    try:
+        uploaded = await asyncio.gather(*uploading)
+    except BaseException:
+        for task in uploading:
+            task.cancel()
+        raise
+    await dao.upsert_files(uploaded, author)
+    return {file.guid for file in uploaded}
 
 
 async def get_file_metas(
-    game: dto.FullGame, author: dto.Player, dao: FileInfoGetter
+    game: dto.FullGame, author: dto.Player, dao: FileInfosGetter
 ) -> Sequence[hints.FileMeta]:
+    # same file can be used in several hints, but packed only once
+    guids = list(dict.fromkeys(game.get_guids()))
+    found = await dao.get_by_guids(guids)
     file_metas: list[hints.FileMeta] = []
-    for guid in game.get_guids():
-        file_meta = await dao.get_by_guid(guid)
-        check_file_meta_can_read(author, file_meta, game)
-        file_metas.append(file_meta)
+    for guid in guids:
+        if guid not in found:
+            raise FileNotFound(text=f"file {guid} of game {game.id} not found")
+        check_file_meta_can_read(author, found[guid], game)
+        file_metas.append(found[guid])
     return file_metas
 
 
-async def get_file_contents(
-    file_metas: Sequence[hints.FileMeta], file_gateway: FileGateway
-) -> dict[str, BinaryIO]:
-    contents = {}
-    for file_meta in file_metas:
-        content = await file_gateway.get(file_meta)
-        contents[file_meta.guid] = content
-    return contents
-
-
 async def get_file_content(
     guid: str, file_gateway: FileGateway, author: dto.Player, game: dto.Game, dao: FileInfoGetter
 ) -> BinaryIO:
@@ -1,14 +1,20 @@
+import asyncio
 import json
+import threading
 from io import BytesIO
-from typing import BinaryIO
-from zipfile import Path as ZipPath, ZipFile, ZIP_DEFLATED
+from typing import IO, BinaryIO, Callable, NamedTuple, Sequence
+from zipfile import Path as ZipPath, ZipFile, ZIP_DEFLATED, ZIP64_LIMIT
 
 import yaml
 
-from shvatka.core.models.dto import scn
+from shvatka.core.interfaces.clients.file_storage import FileGateway
+from shvatka.core.models.dto import scn, hints
 from shvatka.core.utils import exceptions
 
 RESULTS_FILENAME = "results.json"
+SCN_FILENAME = "scn.yaml"
+PACKAGE_FILES_CONCURRENCY = 4
+PACKAGE_CHUNKS_AHEAD = 16
 
 
 def unpack_scn(zip_file: ZipPath) -> scn.ParsedZip:
@@ -34,11 +40,127 @@ def unpack_scn(zip_file: ZipPath) -> scn.ParsedZip:
 
 def pack_scn(game: scn.RawGameScenario) -> BinaryIO:
     output = BytesIO()
-    data = yaml.safe_dump(game.scn, allow_unicode=True, sort_keys=False)
     with ZipFile(output, "a", ZIP_DEFLATED, False) as zipfile:
-        zipfile.writestr("scn.yaml", data.encode("utf8"))
-        zipfile.writestr(RESULTS_FILENAME, json.dumps(game.stat, ensure_ascii=False, indent=2))
+        write_scn(zipfile, game.scn, game.stat)
         for guid, content in game.files.items():
             zipfile.writestr(guid, content.read())
     output.seek(0)
     return output
+
+
+async def write_package(
+    package: scn.GamePackage,
+    output: BinaryIO,
+    file_gateway: FileGateway,
+    concurrency: int = PACKAGE_FILES_CONCURRENCY,
+) -> None:
+    """
+    writes zip to output by chunks, so no one file is kept in memory whole.
+    Compression and writing are done in worker thread, chunks are passed to it by queue.
+    Next files are read concurrently while current one is written,
+    but no more than concurrency files at once.
+    """
+    loop = asyncio.get_running_loop()
+    chunks: asyncio.Queue[ZipItem] = asyncio.Queue(maxsize=PACKAGE_CHUNKS_AHEAD)
+    failed = threading.Event()
+
+    def next_item() -> ZipItem:
+        return asyncio.run_coroutine_threadsafe(chunks.get(), loop).result()
+
+    writer = asyncio.ensure_future(
+        asyncio.to_thread(_write_zip, output, package, next_item, failed)
+    )
+    try:
+        await _read_files(package.files, file_gateway, concurrency, chunks, failed)
+    finally:
+        # writer finishes zip and stops only after None
+        await chunks.put(None)
+        await writer
+
+
+class ZipEntry(NamedTuple):
+    name: str
+    force_zip64: bool
+
+
+# new entry, its content chunk or None at the end
+ZipItem = ZipEntry | bytes | None
+
+
+async def _read_files(
+    files: Sequence[hints.FileMeta],
+    file_gateway: FileGateway,
+    concurrency: int,
+    chunks: asyncio.Queue[ZipItem],
+    writer_failed: threading.Event,
+) -> None:
+    file_queues = [asyncio.Queue[ZipItem | Exception](PACKAGE_CHUNKS_AHEAD) for _ in files]
+    reading: list[asyncio.Task[None]] = []
+    try:
+        for i, file_queue in enumerate(file_queues):
+            reading.extend(
+                asyncio.create_task(_read_file(file_gateway, files[j], file_queues[j]))
+                for j in range(len(reading), min(i + concurrency, len(files)))
+            )
+            while (item := await file_queue.get()) is not None:
+                if isinstance(item, Exception):
+                    raise item
+                if writer_failed.is_set():
+                    # error of writer is raised by write_package
+                    return
+                await chunks.put(item)
+    finally:
+        for task in reading:
+            task.cancel()
+
+
+async def _read_file(
+    file_gateway: FileGateway,
+    file_meta: hints.FileMeta,
+    file_queue: asyncio.Queue[ZipItem | Exception],
+) -> None:
+    try:
+        reader = await file_gateway.open(file_meta)
+        await file_queue.put(ZipEntry(file_meta.guid, reader.size > ZIP64_LIMIT))
+        async for chunk in reader.iter_chunks():
+            await file_queue.put(chunk)
+        await file_queue.put(None)
+    except Exception as e:
+        await file_queue.put(e)
+
+
+def _write_zip(
+    output: BinaryIO,
+    package: scn.GamePackage,
+    next_item: Callable[[], ZipItem],
+    failed: threading.Event,
+) -> None:
+    """runs in worker thread, gets items from event loop until None"""
+    try:
+        with ZipFile(output, "w", ZIP_DEFLATED, False) as zipfile:
+            write_scn(zipfile, package.scn, package.stat)
+            entry: IO[bytes] | None = None
+            try:
+                while (item := next_item()) is not None:
+                    if isinstance(item, ZipEntry):
+                        if entry is not None:
+                            entry.close()
+                        entry = zipfile.open(item.name, "w", force_zip64=item.force_zip64)
+                    else:
+                        assert entry is not None
+                        entry.write(item)
+            finally:
+                if entry is not None:
+                    entry.close()
+    except Exception:
+        failed.set()
+        # reading side waits for queue to be consumed until None
+        while next_item() is not None:
+            pass
+        raise
+
+
+def write_scn(zipfile: ZipFile, scenario: dict, stat: dict | None) -> None:
+    data = yaml.safe_dump(scenario, allow_unicode=True, sort_keys=False)
+    zipfile.writestr(SCN_FILENAME, data.encode("utf8"))
+    zipfile.writestr(RESULTS_FILENAME, json.dumps(stat, ensure_ascii=False, indent=2))
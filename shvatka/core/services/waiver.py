@@ -1,5 +1,5 @@
 import typing
-from typing import Iterable, Sequence
+from typing import Sequence
 
 from shvatka.core.interfaces.dal.waiver import (
     WaiverVoteAdder,
@@ -27,13 +27,8 @@ async def get_vote_to_voted(
 
 async def get_all_played(
     game: dto.Game, dao: GameWaiversGetter
-) -> dict[dto.Team, Iterable[dto.VotedPlayer]]:
-    teams = await dao.get_played_teams(game)
-    result = {}
-    for team in teams:
-        players = await dao.get_played(game, team)
-        result[team] = players
-    return result
+) -> dict[dto.Team, list[dto.VotedPlayer]]:
+    return await dao.get_all_played(game)
 
 
 async def get_voted_list(
@@ -85,16 +80,17 @@ async def approve_waivers(
     """
     team_player = await get_full_team_player(approver, team, dao)
     check_allow_approve_waivers(team_player)
-    for vote in await get_voted_list(team, dao):
-        if vote.vote == Played.not_allowed:
-            continue
-        waiver = dto.Waiver(
+    waivers = [
+        dto.Waiver(
             player=vote.player,
             team=team,
             game=game,
             played=vote.vote,
         )
-        await dao.upsert(waiver)
+        for vote in await get_voted_list(team, dao)
+        if vote.vote != Played.not_allowed
+    ]
+    await dao.upsert_many(waivers)
     await dao.commit()
 
 
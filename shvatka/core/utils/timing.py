@@ -0,0 +1,23 @@
+import logging
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+logger = logging.getLogger(__name__)
+
+
+class StageTimer:
+    """durations of stages of long operation, every stage is logged when it ends"""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.durations: dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, stage: str) -> Iterator[None]:
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.durations[stage] = time.perf_counter() - started_at
+            logger.info("%s: %s took %.1f ms", self.name, stage, self.durations[stage] * 1000)
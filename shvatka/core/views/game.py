@@ -96,3 +96,11 @@ class NewOrg(Event):
 class LevelTestCompleted(Event):
     suite: dto.LevelTestSuite
     result: dto.LevelTestingResult
+
+
+@dataclass
+class FilesWarmedUp(Event):
+    game: dto.Game
+    checked: int
+    renewed: list[str]
+    failed: list[str]
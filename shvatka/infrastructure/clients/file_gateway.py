@@ -1,13 +1,16 @@
 import logging
+from dataclasses import replace
 from io import BytesIO
 from typing import BinaryIO
 
 from aiogram import Bot
+from aiogram.exceptions import TelegramBadRequest
 from aiogram.types import BufferedInputFile
 
-from shvatka.core.interfaces.clients.file_storage import FileStorage, FileGateway
+from shvatka.core.interfaces.clients.file_storage import FileStorage, FileGateway, FileReader
 from shvatka.core.models import dto
 from shvatka.core.models.dto import hints
+from shvatka.infrastructure.clients.file_storage import MemoryFileReader
 from shvatka.infrastructure.db.dao import FileInfoDao
 from shvatka.tgbot.views import hint_sender
 from shvatka.tgbot.views.hint_factory.hint_parser import parse_message
@@ -29,19 +32,43 @@ class BotFileGateway(FileGateway):
         self.tech_chat_id = tech_chat_id
 
     async def put(self, file_meta: hints.UploadedFileMeta, content: BinaryIO, author: dto.Player):
-        if not file_meta.tg_link:
-            await self.upload_to_tg(author, content, file_meta)
-        saved_file = await self.storage.put(file_meta, content)
+        saved_file = await self.upload(file_meta, content, author)
         await self.dao.upsert(saved_file, author)
 
+    async def upload(
+        self, file_meta: hints.UploadedFileMeta, content: BinaryIO, author: dto.Player
+    ) -> hints.FileMeta:
+        if not file_meta.tg_link:
+            tg_link = await self.send_to_tg(author, content, file_meta)
+            file_meta = replace(file_meta, tg_link=tg_link)
+            content.seek(0)
+        return await self.storage.put(file_meta, content)
+
     async def get(self, file: hints.FileMeta) -> BinaryIO:
         try:
             return await self.storage.get(file.file_content_link)
         except (IOError, OSError):
             return await self.download_from_tg(tg_link=file.tg_link)
 
-    async def renew_file_id(self, author: dto.Player, file_meta: hints.SavedFileMeta):
-        return await self.upload_to_tg(
+    async def open(self, file_meta: hints.FileMeta) -> FileReader:
+        try:
+            return await self.storage.open(file_meta.file_content_link)
+        except (IOError, OSError):
+            content = await self.download_from_tg(tg_link=file_meta.tg_link)
+            return MemoryFileReader(content.read())
+
+    async def is_tg_link_valid(self, file_meta: hints.FileMeta) -> bool:
+        if not file_meta.tg_link.file_id:
+            return False
+        try:
+            await self.bot.get_file(file_meta.tg_link.file_id)
+        except TelegramBadRequest as e:
+            # bot api can't get big files, but still can send them by file_id
+            return "file is too big" in e.message
+        return True
+
+    async def renew_file_id(self, author: dto.Player, file_meta: hints.StoredFileMeta) -> None:
+        await self.upload_to_tg(
             author=author,
             content=await self.storage.get(file_meta.file_content_link),
             file_meta=file_meta,
@@ -50,6 +77,12 @@ class BotFileGateway(FileGateway):
     async def upload_to_tg(
         self, author: dto.Player, content: BinaryIO, file_meta: hints.FileMetaLightweight
     ):
+        tg_link = await self.send_to_tg(author, content, file_meta)
+        await self.dao.update_file_id(file_meta.guid, tg_link.file_id)
+
+    async def send_to_tg(
+        self, author: dto.Player, content: BinaryIO, file_meta: hints.FileMetaLightweight
+    ) -> hints.TgLink:
         assert file_meta.content_type is not None
         msg = await hint_sender.METHODS[file_meta.content_type](
             self.bot,
@@ -59,7 +92,7 @@ class BotFileGateway(FileGateway):
         await msg.delete()
         tg_link = parse_message(msg)
         assert tg_link
-        await self.dao.update_file_id(file_meta.guid, tg_link.file_id)
+        return tg_link
 
     async def download_from_tg(self, tg_link: hints.TgLink) -> BinaryIO:
         result = await self.bot.download(tg_link.file_id, BytesIO())
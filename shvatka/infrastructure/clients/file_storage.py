@@ -1,14 +1,51 @@
+import asyncio
 import logging
+import shutil
 from io import BytesIO
 from pathlib import Path
-from typing import BinaryIO
+from typing import BinaryIO, AsyncIterator
 
 from shvatka.common.config.models.main import FileStorageConfig
-from shvatka.core.interfaces.clients.file_storage import FileStorage
+from shvatka.core.interfaces.clients.file_storage import FileStorage, FileReader
 from shvatka.core.models.dto import hints
 
 logger = logging.getLogger(__name__)
 
+CHUNK_SIZE = 64 * 1024
+
+
+class LocalFileReader(FileReader):
+    def __init__(self, path: Path, size: int, chunk_size: int = CHUNK_SIZE) -> None:
+        self.path = path
+        self.size = size
+        self.chunk_size = chunk_size
+
+    async def iter_chunks(self, start: int = 0, stop: int | None = None) -> AsyncIterator[bytes]:
+        remaining = (self.size if stop is None else stop) - start
+        f = await asyncio.to_thread(self.path.open, "rb")
+        try:
+            await asyncio.to_thread(f.seek, start)
+            while remaining > 0:
+                chunk = await asyncio.to_thread(f.read, min(self.chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+        finally:
+            await asyncio.to_thread(f.close)
+
+
+class MemoryFileReader(FileReader):
+    def __init__(self, content: bytes, chunk_size: int = CHUNK_SIZE) -> None:
+        self.content = memoryview(content)
+        self.size = len(content)
+        self.chunk_size = chunk_size
+
+    async def iter_chunks(self, start: int = 0, stop: int | None = None) -> AsyncIterator[bytes]:
+        stop = self.size if stop is None else stop
+        for offset in range(start, stop, self.chunk_size):
+            yield bytes(self.content[offset : min(offset + self.chunk_size, stop)])
+
 
 class LocalFileStorage(FileStorage):
     def __init__(self, config: FileStorageConfig) -> None:
@@ -29,11 +66,18 @@ class LocalFileStorage(FileStorage):
 
     async def put_content(self, local_file_name: str, content: BinaryIO) -> hints.FileContentLink:
         result_path = self.path / local_file_name
-        with result_path.open("wb") as f:
-            f.write(content.read())
+        await asyncio.to_thread(_write, result_path, content)
         return hints.FileContentLink(file_path=str(result_path))
 
     async def get(self, file_link: hints.FileContentLink) -> BinaryIO:
-        with Path(file_link.file_path).open("rb") as f:  # noqa: ASYNC101
-            result = BytesIO(f.read())
-        return result
+        return BytesIO(await asyncio.to_thread(Path(file_link.file_path).read_bytes))
+
+    async def open(self, file_link: hints.FileContentLink) -> FileReader:
+        path = Path(file_link.file_path)
+        stat = await asyncio.to_thread(path.stat)
+        return LocalFileReader(path, stat.st_size)
+
+
+def _write(path: Path, content: BinaryIO) -> None:
+    with path.open("wb") as f:
+        shutil.copyfileobj(content, f, CHUNK_SIZE)
@@ -1,9 +1,11 @@
 import asyncio
 import json
 import logging
+from collections import deque
 from datetime import datetime, timedelta
+from io import BytesIO
 from pathlib import Path
-from typing import BinaryIO, Any, Callable, Coroutine
+from typing import BinaryIO, Any, Callable, Coroutine, AsyncIterator, Sequence
 from zipfile import Path as ZipPath
 
 from adaptix import Retort
@@ -57,18 +59,23 @@ async def main():
         await dishka.close()
 
 
+PREFETCH_FILES = 2
+
+
 async def load_scns(
     bot_player: dto.Player,
     dao: HolderDao,
     file_gateway: FileGateway,
     retort: Retort,
     path: Path,
+    prefetch: int = PREFETCH_FILES,
 ):
     files = sorted(path.glob("*.zip"), key=lambda p: int(p.stem))
-    for file in files:
+    results_loader = ResultsLoader(dao)
+    async for file, game_zip_scn in read_files(files, prefetch):
         logger.info("loading game from file %s...", file.name)
         try:
-            with file.open("rb") as game_zip_scn:
+            with game_zip_scn:
                 game = await load_scn(
                     player=bot_player,
                     dao=dao,
@@ -80,7 +87,7 @@ async def load_scns(
                     continue
                 results = load_results(game_zip_scn, retort)
             await dao.game.set_completed(game)
-            await set_results(game, results, dao)
+            await results_loader.set_results(game, results)
             await dao.commit()
 
         except exceptions.CantEditGame:
@@ -89,45 +96,125 @@ async def load_scns(
             logger.info("successfully loaded game %s with number %s", game.id, game.number)
 
 
-async def set_results(game: dto.FullGame, results: GameStat, dao: HolderDao):
-    game_start_at = add_timezone(results.start_at, timezone=tz_utc)
-    await dao.game.set_start_at(game, game_start_at)
-    await dao.game.set_number(game, results.id)
-    team_getter = get_team_getter(dao.team, results.team_identity)
-    level_times = []
-    for team_name, levels in results.results.items():
-        team = await team_getter(team_name)
-        for level in levels:
-            if level.at is not None:
-                lvl = await dao.level_time.set_to_level(
-                    team,
-                    game,
-                    level.number,
-                    add_timezone(level.at, timezone=tz_utc),
+async def read_files(files: Sequence[Path], prefetch: int) -> AsyncIterator[tuple[Path, BytesIO]]:
+    """
+    Читает следующие prefetch архивов в потоках, пока текущий сохраняется в БД.
+    Сами игры сохраняются строго по порядку: игроки, команды и составы общие для всех игр.
+    """
+    pending: deque[tuple[Path, asyncio.Task[BytesIO]]] = deque()
+    files_iter = iter(files)
+    try:
+        while True:
+            while len(pending) <= prefetch and (file := next(files_iter, None)) is not None:
+                pending.append((file, asyncio.create_task(asyncio.to_thread(read_file, file))))
+            if not pending:
+                return
+            file, task = pending.popleft()
+            yield file, await task
+    finally:
+        for _, task in pending:
+            task.cancel()
+
+
+def read_file(path: Path) -> BytesIO:
+    return BytesIO(path.read_bytes())
+
+
+class ResultsLoader:
+    """
+    Сохраняет результаты архивных игр.
+    Игроков, команды и текущие составы помнит между играми,
+    время уровней, ключи и вейверы игры пишет пачками.
+    Игры надо загружать в хронологическом порядке.
+    """
+
+    def __init__(self, dao: HolderDao) -> None:
+        self.dao = dao
+        self.players: dict[tuple[PlayerIdentity, str | int | None], dto.Player] = {}
+        self.teams: dict[tuple[TeamIdentity, str], dto.Team] = {}
+        self.player_teams: dict[int, dto.Team | None] = {}
+
+    async def set_results(self, game: dto.FullGame, results: GameStat):
+        game_start_at = add_timezone(results.start_at, timezone=tz_utc)
+        await self.dao.game.set_start_at(game, game_start_at)
+        await self.dao.game.set_number(game, results.id)
+        teams = {
+            team_name: await self.get_team(team_name, results.team_identity)
+            for team_name in (*results.results, *results.keys)
+        }
+        level_times = await self.dao.level_time.insert_many(
+            game,
+            [
+                (teams[team_name], level.number, add_timezone(level.at, timezone=tz_utc))
+                for team_name, levels in results.results.items()
+                for level in levels
+                if level.at is not None
+            ],
+        )
+        teams_level_times: dict[int, dict[int, dto.LevelTime]] = {}
+        for level_time in level_times:
+            teams_level_times.setdefault(level_time.team.id, {})[
+                level_time.level_number
+            ] = level_time
+        waivers: dict[tuple[int, int], dto.Waiver] = {}
+        for team_name, keys in results.keys.items():
+            team = teams[team_name]
+            for i, key in enumerate(keys):  # type: int, dto.export_stat.Key
+                player = await self.get_player(key.player)
+                await self.join_team(player, team, game_start_at)
+                waivers[(player.id, team.id)] = dto.Waiver(
+                    player=player,
+                    team=team,
+                    game=game,
+                    played=enums.Played.yes,
+                )
+                if i == len(keys) - 1:
+                    is_correct = True
+                elif key.level != keys[i + 1].level:
+                    is_correct = True
+                else:
+                    is_correct = False
+                await self.dao.key_time.save_key(
+                    key=key.value,
+                    team=team,
+                    game=game,
+                    player=player,
+                    level_time=teams_level_times[team.id][key.level],
+                    type_=enums.KeyType.simple if is_correct else enums.KeyType.wrong,
+                    is_duplicate=False,
+                    at=add_timezone(key.at, timezone=tz_utc),
                 )
-                level_times.append(lvl)
-    for team_name, keys in results.keys.items():
-        team = await team_getter(team_name)
-        for i, key in enumerate(keys):  # type: int, dto.export_stat.Key
-            player = await get_or_create_player(dao, key.player)
-            await join_team_if_already_not(player, team, game_start_at, dao)
-            await add_waiver_if_already_not(player, team, game, dao)
-            if i == len(keys) - 1:
-                is_correct = True
-            elif key.level != keys[i + 1].level:
-                is_correct = True
-            else:
-                is_correct = False
-            await dao.key_time.save_key(
-                key=key.value,
-                team=team,
-                game=game,
-                player=player,
-                level_time=level_times[key.level - 1],
-                type_=enums.KeyType.simple if is_correct else enums.KeyType.wrong,
-                is_duplicate=False,
-                at=add_timezone(key.at, timezone=tz_utc),
-            )
+        await self.dao.waiver.upsert_many(list(waivers.values()))
+
+    async def get_team(self, name: str, team_identity: TeamIdentity) -> dto.Team:
+        if (team := self.teams.get((team_identity, name))) is None:
+            team = await get_team_getter(self.dao.team, team_identity)(name)
+            self.teams[(team_identity, name)] = team
+        return team
+
+    async def get_player(self, player: Player) -> dto.Player:
+        identity = (player.identity, player.forum_name or player.tg_user_id)
+        if (result := self.players.get(identity)) is None:
+            result = await get_or_create_player(self.dao, player)
+            self.players[identity] = result
+        return result
+
+    async def join_team(self, player: dto.Player, team: dto.Team, at: datetime):
+        if player.id not in self.player_teams:
+            self.player_teams[player.id] = await self.dao.team_player.get_team(player, for_date=at)
+        current_team = self.player_teams[player.id]
+        if current_team is not None and current_team.id == team.id:
+            return
+        if current_team is not None:
+            await self.dao.team_player.leave_team(player, at - timedelta(hours=8))
+        await self.dao.team_player.join_team(
+            player=player,
+            team=team,
+            role="Полевой",
+            as_captain=False,
+            joined_at=at - timedelta(hours=6),
+        )
+        self.player_teams[player.id] = team
 
 
 def get_team_getter(
@@ -143,7 +230,7 @@ def get_team_getter(
     return team_getter
 
 
-async def get_or_create_player(dao: HolderDao, player: Player):
+async def get_or_create_player(dao: HolderDao, player: Player) -> dto.Player:
     match player.identity:
         case PlayerIdentity.forum_name:
             result = await dao.player.get_by_forum_player_name(player.forum_name)
@@ -159,36 +246,6 @@ async def get_or_create_player(dao: HolderDao, player: Player):
                 )
 
 
-async def add_waiver_if_already_not(
-    player: dto.Player, team: dto.Team, game: dto.Game, dao: HolderDao
-):
-    await dao.waiver.upsert_with_flush(
-        dto.Waiver(
-            player=player,
-            team=team,
-            game=game,
-            played=enums.Played.yes,
-        )
-    )
-
-
-async def join_team_if_already_not(
-    player: dto.Player, team: dto.Team, at: datetime, dao: HolderDao
-):
-    current_team = await dao.team_player.get_team(player, for_date=at)
-    if current_team is not None and current_team.id == team.id:
-        return
-    if current_team is not None:
-        await dao.team_player.leave_team(player, at - timedelta(hours=8))
-    await dao.team_player.join_team(
-        player=player,
-        team=team,
-        role="Полевой",
-        as_captain=False,
-        joined_at=at - timedelta(hours=6),
-    )
-
-
 async def transfer_ownership(game: dto.FullGame, bot_player: dto.Player, dao: HolderDao):
     for guid in game.get_guids():
         await dao.file_info.transfer(guid, bot_player)
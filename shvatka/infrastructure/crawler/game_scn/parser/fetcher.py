@@ -0,0 +1,161 @@
+import asyncio
+import hashlib
+import logging
+import uuid
+from pathlib import Path
+
+from aiohttp import (
+    ClientSession,
+    ClientConnectorError,
+    ClientResponseError,
+    ServerDisconnectedError,
+    ClientOSError,
+)
+
+logger = logging.getLogger(__name__)
+
+FETCH_CONCURRENCY = 4
+FETCH_RETRIES = 3
+RETRYABLE_ERRORS = (
+    ClientConnectorError,
+    ServerDisconnectedError,
+    ClientOSError,
+    asyncio.TimeoutError,
+)
+
+
+class ContentDownloadError(IOError):
+    pass
+
+
+class FetchCache:
+    """
+    Скачанные страницы и картинки на диске, чтобы перезапуск и правки парсера
+    работали без повторного обхода форума.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    def get(self, url: str) -> bytes | None:
+        try:
+            return self._get_path(url).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def put(self, url: str, content: bytes) -> None:
+        path = self._get_path(url)
+        tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+        tmp_path.write_bytes(content)
+        tmp_path.replace(path)
+
+    def _get_path(self, url: str) -> Path:
+        return self.path / hashlib.sha256(url.encode()).hexdigest()
+
+
+class AdaptiveRateLimiter:
+    """
+    Держит паузу между запросами: после ошибки сервера удваивает её,
+    после успешного ответа понемногу уменьшает.
+    """
+
+    def __init__(
+        self,
+        interval: float = 1.0,
+        min_interval: float = 0.2,
+        max_interval: float = 30.0,
+    ) -> None:
+        self.interval = interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self._next_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        async with self._lock:
+            now = asyncio.get_running_loop().time()
+            if self._next_at > now:
+                await asyncio.sleep(self._next_at - now)
+            self._next_at = max(now, self._next_at) + self.interval
+
+    def slow_down(self) -> None:
+        self.interval = min(self.interval * 2, self.max_interval)
+
+    def speed_up(self) -> None:
+        self.interval = max(self.interval * 0.9, self.min_interval)
+
+
+class Fetcher:
+    def __init__(
+        self,
+        session: ClientSession,
+        cache: FetchCache,
+        limiter: AdaptiveRateLimiter,
+        *,
+        concurrency: int = FETCH_CONCURRENCY,
+        retries: int = FETCH_RETRIES,
+        offline: bool = False,
+    ) -> None:
+        self.session = session
+        self.cache = cache
+        self.limiter = limiter
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.retries = retries
+        self.offline = offline
+
+    async def get_text(self, url: str, encoding: str = "cp1251") -> str:
+        content = await self.get(url, allow_redirects=False)
+        return content.decode(encoding, errors="backslashreplace")
+
+    async def get_image(self, url: str) -> bytes:
+        return await self.get(url, content_type="image")
+
+    async def get(
+        self, url: str, *, content_type: str | None = None, allow_redirects: bool = True
+    ) -> bytes:
+        if (content := self.cache.get(url)) is not None:
+            return content
+        if self.offline:
+            raise ContentDownloadError(f"url {url} is not cached")
+        try:
+            content = await self._download(url, content_type, allow_redirects)
+        except (*RETRYABLE_ERRORS, ClientResponseError, ValueError) as e:
+            logger.error("couldn't load content for url %s", url, exc_info=e)
+            raise ContentDownloadError from e
+        self.cache.put(url, content)
+        return content
+
+    async def _download(self, url: str, content_type: str | None, allow_redirects: bool) -> bytes:
+        async with self.semaphore:
+            for _ in range(self.retries):
+                try:
+                    return await self._download_once(url, content_type, allow_redirects)
+                except ClientResponseError as e:
+                    if not is_retryable_status(e.status):
+                        raise
+                    logger.warning("got status %s for url %s, retrying", e.status, url)
+                except RETRYABLE_ERRORS as e:
+                    logger.warning("couldn't load url %s, retrying", url, exc_info=e)
+                self.limiter.slow_down()
+            return await self._download_once(url, content_type, allow_redirects)
+
+    async def _download_once(
+        self, url: str, content_type: str | None, allow_redirects: bool
+    ) -> bytes:
+        await self.limiter.wait()
+        async with self.session.get(url, allow_redirects=allow_redirects) as resp:
+            resp.raise_for_status()
+            if resp.status != 200:
+                raise ValueError(f"unexpected response status {resp.status}")
+            if content_type and not resp.content_type.startswith(content_type):
+                raise ValueError(
+                    f"response contains no {content_type}, content-type is {resp.content_type}"
+                )
+            content = await resp.read()
+        self.limiter.speed_up()
+        return content
+
+
+def is_retryable_status(status: int) -> bool:
+    return status == 429 or status >= 500
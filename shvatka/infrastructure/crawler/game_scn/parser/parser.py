@@ -1,5 +1,6 @@
 import asyncio
 import logging
+import os
 import typing
 import uuid
 from datetime import datetime, timedelta
@@ -7,13 +8,7 @@ from io import BytesIO
 from pathlib import Path
 from typing import BinaryIO
 
-from aiohttp import (
-    ClientSession,
-    ClientConnectorError,
-    ClientResponseError,
-    ServerDisconnectedError,
-    ClientOSError,
-)
+from aiohttp import ClientSession
 from dataclass_factory import Factory, Schema, NameStyle
 from lxml import etree
 from lxml.etree import ElementBase
@@ -26,6 +21,13 @@ from shvatka.core.utils.datetime_utils import tz_utc, tz_game, add_timezone
 from shvatka.infrastructure.crawler.auth import get_auth_cookie
 from shvatka.infrastructure.crawler.constants import GAME_URL_TEMPLATE
 from shvatka.infrastructure.crawler.game_scn.common import UNPARSEABLE_GAMES
+from shvatka.infrastructure.crawler.game_scn.parser.fetcher import (
+    AdaptiveRateLimiter,
+    ContentDownloadError,
+    FetchCache,
+    Fetcher,
+    FETCH_CONCURRENCY,
+)
 from shvatka.infrastructure.crawler.game_scn.parser.resourses import load_error_img
 
 logger = logging.getLogger(__name__)
@@ -33,34 +35,15 @@ EVENING_TIME = datetime.strptime("20:00:00", "%H:%M:%S").time()
 PARSER_ERROR_IMG = load_error_img()
 
 
-class ContentDownloadError(IOError):
-    pass
-
-
-async def get_all_games(games_ids: list[int]) -> list[scn.ParsedCompletedGameScenario]:
-    games = []
-    async with ClientSession(cookies=await get_auth_cookie()) as session:
-        for game_id in reversed(games_ids):
-            await asyncio.sleep(1)
-            html_text = await download(game_id, session)
-            try:
-                games.append(await GameParser(html_text, session=session).build())
-            except (ValueError, AttributeError) as e:
-                logger.error("can't parse game %s", game_id, exc_info=e)
-    return games
-
-
-async def download(game_id: int, session: ClientSession) -> str:
-    async with session.get(
-        GAME_URL_TEMPLATE.format(game_id=game_id), allow_redirects=False
-    ) as resp:
-        return await resp.text(encoding="cp1251", errors="backslashreplace")
+async def get_game(game_id: int, fetcher: Fetcher) -> scn.ParsedCompletedGameScenario:
+    html_text = await fetcher.get_text(GAME_URL_TEMPLATE.format(game_id=game_id))
+    return await GameParser(html_text, fetcher=fetcher).build()
 
 
 class GameParser:
-    def __init__(self, html_str: str, *, session: ClientSession) -> None:
+    def __init__(self, html_str: str, *, fetcher: Fetcher) -> None:
         self.html = etree.HTML(html_str, base_url="shvatka.ru")
-        self.session = session
+        self.fetcher = fetcher
         self.id: int = 0
         self.name: str = ""
         self.start_at: datetime | None = None
@@ -225,23 +208,7 @@ class GameParser:
         return log_keys
 
     async def download_content(self, url: str) -> BinaryIO:
-        try:
-            async with self.session.get(url.strip()) as resp:
-                resp.raise_for_status()
-                if not resp.content_type.startswith("image"):
-                    raise ValueError(
-                        f"response contains no image, content-type is {resp.content_type}"
-                    )
-                return BytesIO(await resp.content.read())
-        except (
-            ClientConnectorError,
-            ClientResponseError,
-            ServerDisconnectedError,
-            ClientOSError,
-            ValueError,
-        ) as e:
-            logger.error("couldn't load content for url %s", url, exc_info=e)
-            raise ContentDownloadError from e
+        return BytesIO(await self.fetcher.get_image(url.strip()))
 
     def build_current_hint(self):
         parts = list(filter(lambda p: p, (p.strip() for p in self.current_hint_parts)))
@@ -298,22 +265,65 @@ class GameParser:
         return game
 
 
-async def save_all_scns_to_files(game_ids: list[int]):
-    games = await get_all_games(game_ids)
-    dcf = Factory(default_schema=Schema(name_style=NameStyle.kebab))
-    path = Path() / "scn"
+async def save_all_scns_to_files(
+    game_ids: list[int],
+    path: Path = Path() / "scn",
+    cache_path: Path = Path() / "cache",
+    concurrency: int = FETCH_CONCURRENCY,
+    offline: bool = False,
+):
+    """
+    Уже сохранённые архивы игр пропускаются,
+    так что после падения перезапуск продолжит с несохранённых.
+    """
     path.mkdir(exist_ok=True)
-    for game in games:
-        dct = dcf.dump(game, scn.ParsedGameScenario)
-        scenario = scn.RawGameScenario(
-            scn=dct,
-            files=game.files_contents,
-            stat=dcf.dump(game.stat),
+    saved_ids = {int(file.stem) for file in path.glob("*.zip")}
+    games_ids = [game_id for game_id in game_ids if game_id not in saved_ids]
+    logger.info("%s games already saved, %s to save", len(saved_ids), len(games_ids))
+    cookies = {} if offline else await get_auth_cookie()
+    async with ClientSession(cookies=cookies) as session:
+        fetcher = Fetcher(
+            session,
+            FetchCache(cache_path),
+            AdaptiveRateLimiter(),
+            concurrency=concurrency,
+            offline=offline,
         )
-        packed_scenario = pack_scn(scenario)
-        with (path / f"{game.id}.zip").open("wb") as f:
-            logger.debug("saved to filename %s", f.name)
-            f.write(packed_scenario.read())
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def save_game_bounded(game_id: int) -> None:
+            async with semaphore:
+                await save_game(game_id, fetcher, path)
+
+        await asyncio.gather(*[save_game_bounded(game_id) for game_id in games_ids])
+
+
+async def save_game(game_id: int, fetcher: Fetcher, path: Path) -> None:
+    try:
+        game = await get_game(game_id, fetcher)
+    except ContentDownloadError as e:
+        logger.error("can't download game %s", game_id, exc_info=e)
+        return
+    except (ValueError, AttributeError) as e:
+        logger.error("can't parse game %s", game_id, exc_info=e)
+        return
+    await asyncio.to_thread(write_game, game, path)
+
+
+def write_game(game: scn.ParsedCompletedGameScenario, path: Path) -> None:
+    dcf = Factory(default_schema=Schema(name_style=NameStyle.kebab))
+    dct = dcf.dump(game, scn.ParsedGameScenario)
+    scenario = scn.RawGameScenario(
+        scn=dct,
+        files=game.files_contents,
+        stat=dcf.dump(game.stat),
+    )
+    packed_scenario = pack_scn(scenario)
+    file_path = path / f"{game.id}.zip"
+    tmp_path = file_path.with_suffix(".tmp")
+    tmp_path.write_bytes(packed_scenario.read())
+    tmp_path.replace(file_path)
+    logger.debug("saved to filename %s", file_path)
 
 
 def get_finished_level_number(cells: list[ElementBase]):
@@ -327,4 +337,9 @@ def get_parseable_games_ids():
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.DEBUG)
-    asyncio.run(save_all_scns_to_files(get_parseable_games_ids()))
+    asyncio.run(
+        save_all_scns_to_files(
+            get_parseable_games_ids(),
+            offline=os.getenv("SH_CRAWLER_OFFLINE") == "1",
+        )
+    )
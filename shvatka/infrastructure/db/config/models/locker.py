@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import timedelta
+from enum import Enum
+
+
+class LockerType(Enum):
+    memory = "memory"
+    redis = "redis"
+
+
+@dataclass
+class LockerConfig:
+    type_: LockerType = LockerType.memory
+    lease: timedelta = timedelta(seconds=30)
+    """lock will be released by redis if holder doesn't release it in time"""
+    retry_interval: timedelta = timedelta(milliseconds=20)
@@ -0,0 +1,15 @@
+from datetime import timedelta
+from typing import Any
+
+from shvatka.infrastructure.db.config.models.locker import LockerConfig, LockerType
+
+
+def load_locker_config(dct: dict[str, Any] | None) -> LockerConfig:
+    if dct is None:
+        return LockerConfig()
+    config = LockerConfig(type_=LockerType[dct["type"]])
+    if lease := dct.get("lease-seconds"):
+        config.lease = timedelta(seconds=lease)
+    if retry_interval := dct.get("retry-interval-ms"):
+        config.retry_interval = timedelta(milliseconds=retry_interval)
+    return config
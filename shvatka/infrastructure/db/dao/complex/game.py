@@ -1,6 +1,6 @@
 import typing
 from dataclasses import dataclass
-from typing import Iterable
+from typing import Iterable, Sequence
 
 from shvatka.core.interfaces.dal.complex import GamePackager
 from shvatka.core.games.adapters import GameFileReader, GamePlayReader
@@ -29,14 +29,21 @@ class GameUpserterImpl(GameUpserter):
     ) -> dto.Level:
         return await self.dao.level.upsert(author, scenario, game, no_in_game)
 
+    async def upsert_game_levels(
+        self, author: dto.Player, scenarios: Sequence[scn.LevelScenario], game: dto.Game
+    ) -> list[dto.Level]:
+        return await self.dao.level.upsert_game_levels(author, scenarios, game)
+
     async def unlink_all(self, game: dto.Game) -> None:
         return await self.dao.level.unlink_all(game)
 
-    async def upsert_file(self, file: hints.FileMeta, author: dto.Player) -> hints.SavedFileMeta:
-        return await self.dao.file_info.upsert(file, author)
+    async def upsert_files(
+        self, files: Sequence[hints.FileMeta], author: dto.Player
+    ) -> list[hints.SavedFileMeta]:
+        return await self.dao.file_info.upsert_many(files, author)
 
-    async def check_author_can_own_guid(self, author: dto.Player, guid: str) -> None:
-        return await self.dao.file_info.check_author_can_own_guid(author, guid)
+    async def check_author_can_own_guids(self, author: dto.Player, guids: Iterable[str]) -> None:
+        return await self.dao.file_info.check_author_can_own_guids(author, guids)
 
     async def is_name_available(self, name: str) -> bool:
         return await self.dao.game.is_name_available(name)
@@ -78,6 +85,9 @@ class GamePackagerImpl(GamePackager):
     async def get_played(self, game: dto.Game, team: dto.Team) -> Iterable[dto.VotedPlayer]:
         return await self.dao.waiver.get_played(game, team)
 
+    async def get_all_played(self, game: dto.Game) -> dict[dto.Team, list[dto.VotedPlayer]]:
+        return await self.dao.waiver.get_all_played(game)
+
     async def get_all_by_game(self, game: dto.Game) -> list[dto.Waiver]:
         return await self.dao.waiver.get_all_by_game(game)
 
@@ -100,8 +110,8 @@ class GamePackagerImpl(GamePackager):
     async def get_full(self, id_: int) -> dto.FullGame:
         return await self.dao.game.get_full(id_)
 
-    async def get_by_guid(self, guid: str) -> hints.VerifiableFileMeta:
-        return await self.dao.file_info.get_by_guid(guid)
+    async def get_by_guids(self, guids: Iterable[str]) -> dict[str, hints.VerifiableFileMeta]:
+        return await self.dao.file_info.get_by_guids(guids)
 
 
 class GameFilesGetterImpl(GameFileReader):
@@ -144,7 +154,8 @@ class GamePlayReaderImpl(GamePlayReader):
         return await self.dao.level_time.get_current_level_time(team, game)
 
     async def get_level_by_game_and_number(self, game: dto.Game, number: int) -> dto.Level:
-        return await self.dao.level.get_by_number(game, number)
+        running_game = await self.dao.game.get_running(game.id)
+        return running_game.get_level_by_number(number)
 
     async def get_team_typed_keys(
         self, game: dto.Game, team: dto.Team, level_time: dto.LevelTime
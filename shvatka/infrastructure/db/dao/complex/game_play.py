@@ -1,11 +1,12 @@
 import typing
-from dataclasses import dataclass
-from typing import Iterable
-
+from dataclasses import dataclass, field
+from typing import Iterable, Sequence
 
+from shvatka.core.interfaces.dal.file_info import FilesWarmUpDao
 from shvatka.core.interfaces.dal.game_play import GamePreparer, GamePlayerDao
 from shvatka.core.interfaces.dal.level_times import GameStarter
 from shvatka.core.models import dto, enums
+from shvatka.core.models.dto import hints
 
 if typing.TYPE_CHECKING:
     from shvatka.infrastructure.db.dao.holder import HolderDao
@@ -32,24 +33,41 @@ class GamePreparerImpl(GamePreparer):
         return await self.dao.poll.get_poll_msg_id(chat_id=chat_id, game_id=game.id)
 
 
+@dataclass
+class FilesWarmUpDaoImpl(FilesWarmUpDao):
+    dao: "HolderDao"
+
+    async def get_by_guids(self, guids: Iterable[str]) -> dict[str, hints.VerifiableFileMeta]:
+        return await self.dao.file_info.get_by_guids(guids)
+
+    async def get_orgs(
+        self, game: dto.Game, with_deleted: bool = False
+    ) -> list[dto.SecondaryOrganizer]:
+        return await self.dao.organizer.get_orgs(game)
+
+    async def commit(self) -> None:
+        await self.dao.commit()
+
+
 @dataclass
 class GameStarterImpl(GameStarter):
     dao: "HolderDao"
 
-    async def set_game_started(self, game: dto.Game) -> None:
-        return await self.dao.game.set_started(game)
+    async def set_game_started(self, game: dto.FullGame) -> None:
+        await self.dao.game.set_started(game)
+        self.dao.running_games.put(game)
 
     async def get_played_teams(self, game: dto.Game) -> Iterable[dto.Team]:
         return await self.dao.waiver.get_played_teams(game)
 
-    async def set_to_level(
+    async def set_all_to_level(
         self,
-        team: dto.Team,
+        teams: Sequence[dto.Team],
         game: dto.Game,
         level_number: int,
-    ) -> dto.LevelTime:
-        return await self.dao.level_time.set_to_level(
-            team=team, game=game, level_number=level_number
+    ) -> list[dto.LevelTime]:
+        return await self.dao.level_time.set_all_to_level(
+            teams=teams, game=game, level_number=level_number
         )
 
     async def commit(self) -> None:
@@ -59,6 +77,7 @@ class GameStarterImpl(GameStarter):
 @dataclass
 class GamePlayerDaoImpl(GamePlayerDao):
     dao: "HolderDao"
+    saved_keys: list[tuple[dto.LevelTime, str, enums.KeyType]] = field(default_factory=list)
 
     async def check_waiver(self, player: dto.Player, team: dto.Team, game: dto.Game) -> bool:
         return await self.dao.waiver.check_waiver(player, team, game)
@@ -71,10 +90,7 @@ class GamePlayerDaoImpl(GamePlayerDao):
         return await self.dao.waiver.get_played_teams(game)
 
     async def is_all_team_finished(self, game: dto.FullGame) -> bool:
-        for team in await self.get_played_teams(game):
-            if not await self.is_team_finished(team, game):
-                return False
-        return True
+        return await self.dao.level_time.is_all_team_finished(game, levels_count=len(game.levels))
 
     async def is_key_duplicate(self, level: dto.LevelTime, team: dto.Team, key: str) -> bool:
         return await self.dao.key_time.is_duplicate(level, team, key)
@@ -85,6 +101,15 @@ class GamePlayerDaoImpl(GamePlayerDao):
             level_number=await self.dao.level_time.get_current_level(team=team, game=game),
         )
 
+    async def get_key_submission_state(
+        self, team: dto.Team, game: dto.Game
+    ) -> dto.KeySubmissionState:
+        if state := self.dao.key_submissions.get(game_id=game.id, team_id=team.id):
+            return state
+        state = await self.dao.key_time.get_submission_state(team=team, game=game)
+        self.dao.key_submissions.put(state)
+        return state
+
     async def get_correct_typed_keys(
         self,
         level_time: dto.LevelTime,
@@ -103,7 +128,7 @@ class GamePlayerDaoImpl(GamePlayerDao):
         type_: enums.KeyType,
         is_duplicate: bool,
     ) -> dto.KeyTime:
-        return await self.dao.key_time.save_key(
+        key_time = await self.dao.key_time.save_key(
             key=key,
             team=team,
             level_time=level_time,
@@ -112,6 +137,8 @@ class GamePlayerDaoImpl(GamePlayerDao):
             type_=type_,
             is_duplicate=is_duplicate,
         )
+        self.saved_keys.append((level_time, key, type_))
+        return key_time
 
     async def get_team_typed_keys(
         self, game: dto.Game, team: dto.Team, level_time: dto.LevelTime
@@ -138,12 +165,9 @@ class GamePlayerDaoImpl(GamePlayerDao):
     ) -> list[dto.SecondaryOrganizer]:
         return await self.dao.organizer.get_orgs(game)
 
-    async def get_next_level(self, level: dto.Level, game: dto.Game) -> dto.Level:
-        assert level.number_in_game is not None
-        return await self.dao.level.get_by_number(game=game, level_number=level.number_in_game + 1)
-
-    async def get_level_by_name(self, level_name: str, game: dto.Game) -> dto.Level | None:
-        return await self.dao.level.get_by_author_and_name_id(game.author, level_name)
-
     async def commit(self) -> None:
         await self.dao.commit()
+        # keys become visible for next submissions only after they are really saved
+        for level_time, key, type_ in self.saved_keys:
+            self.dao.key_submissions.add_key(level_time, key, type_)
+        self.saved_keys.clear()
@@ -33,6 +33,22 @@ class GameKeysReaderImpl(GameKeysReader):
     async def get_typed_keys_grouped(self, game: dto.Game) -> dict[Team, list[KeyTime]]:
         return await self.dao.key_time.get_typed_key_grouped(game=game)
 
+    async def get_typed_keys_page(
+        self,
+        game: dto.Game,
+        since: int | None,
+        limit: int,
+        team_id: int | None = None,
+        level_number: int | None = None,
+    ) -> dto.TypedKeysPage:
+        return await self.dao.key_time.get_typed_keys_page(
+            game=game,
+            since=since,
+            limit=limit,
+            team_id=team_id,
+            level_number=level_number,
+        )
+
     async def get_by_player(self, game: dto.Game, player: dto.Player) -> dto.SecondaryOrganizer:
         return await self.dao.organizer.get_by_player(game=game, player=player)
 
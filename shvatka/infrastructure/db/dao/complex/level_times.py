@@ -1,8 +1,10 @@
 import typing
 from dataclasses import dataclass
+from datetime import datetime
+from typing import Sequence
 
 from shvatka.core.games.adapters import GameStatReader
-from shvatka.core.interfaces.dal.complex import GameStatDao
+from shvatka.core.interfaces.dal.complex import GameStatDao, SeasonStatDao
 from shvatka.core.models import dto
 
 if typing.TYPE_CHECKING:
@@ -37,6 +39,11 @@ class GameStatImpl(GameStatDao):
     ) -> dict[dto.Team, list[dto.LevelTimeOnGame]]:
         return await self.dao.level_time.get_game_level_times_with_hints(game)
 
+    async def get_current_level_times_with_hints(
+        self, game: dto.FullGame
+    ) -> list[dto.LevelTimeOnGame]:
+        return await self.dao.level_time.get_current_level_times_with_hints(game)
+
     async def get_by_id(self, id_: int, author: dto.Player | None = None) -> dto.Game:
         return await self.dao.game.get_by_id(id_, author)
 
@@ -44,9 +51,26 @@ class GameStatImpl(GameStatDao):
         return await self.dao.game.get_full(id_)
 
     async def add_levels(self, game: dto.Game) -> dto.FullGame:
+        if game.is_started():
+            return await self.dao.game.get_running(game.id)
         return await self.dao.game.add_levels(game)
 
 
+@dataclass
+class SeasonStatImpl(SeasonStatDao):
+    dao: "HolderDao"
+
+    async def get_completed_games_started_between(
+        self, started_from: datetime, started_to: datetime
+    ) -> list[dto.Game]:
+        return await self.dao.game.get_completed_games_started_between(started_from, started_to)
+
+    async def get_games_level_times(
+        self, games: Sequence[dto.Game]
+    ) -> dict[int, dict[dto.Team, list[dto.LevelTime]]]:
+        return await self.dao.level_time.get_games_level_times(games)
+
+
 class GameStatReaderImpl(GameStatReader):
     def __init__(self, dao: "HolderDao"):
         self.dao = dao
@@ -75,6 +99,11 @@ class GameStatReaderImpl(GameStatReader):
     ) -> dict[dto.Team, list[dto.LevelTimeOnGame]]:
         return await self.dao.level_time.get_game_level_times_with_hints(game)
 
+    async def get_current_level_times_with_hints(
+        self, game: dto.FullGame
+    ) -> list[dto.LevelTimeOnGame]:
+        return await self.dao.level_time.get_current_level_times_with_hints(game)
+
     async def get_by_id(self, id_: int, author: dto.Player | None = None) -> dto.Game:
         return await self.dao.game.get_by_id(id_, author)
 
@@ -82,6 +111,8 @@ class GameStatReaderImpl(GameStatReader):
         return await self.dao.game.get_full(id_)
 
     async def add_levels(self, game: dto.Game) -> dto.FullGame:
+        if game.is_started():
+            return await self.dao.game.get_running(game.id)
         return await self.dao.game.add_levels(game)
 
     async def get_by_user(self, user: dto.User) -> dto.Player:
@@ -47,6 +47,9 @@ class WaiverApproverImpl(WaiverApprover, WaiverVoteGetterImpl):
     async def upsert(self, waiver: dto.Waiver) -> None:
         return await self.dao.waiver.upsert(waiver)
 
+    async def upsert_many(self, waivers: Sequence[dto.Waiver]) -> None:
+        return await self.dao.waiver.upsert_many(waivers)
+
     async def commit(self) -> None:
         return await self.dao.waiver.commit()
 
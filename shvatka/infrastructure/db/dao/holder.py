@@ -9,7 +9,9 @@ from shvatka.core.interfaces.dal.complex import (
     TypedKeyGetter,
     GameStatDao,
     GamePackager,
+    SeasonStatDao,
 )
+from shvatka.core.interfaces.dal.file_info import FilesWarmUpDao
 from shvatka.core.interfaces.dal.game import GameUpserter, GameCreator
 from shvatka.core.interfaces.dal.game_play import GamePreparer, GamePlayerDao
 from shvatka.core.interfaces.dal.level_testing import LevelTestingDao
@@ -20,15 +22,24 @@ from shvatka.core.interfaces.dal.team import TeamCreator
 from shvatka.core.interfaces.dal.waiver import WaiverVoteAdder, WaiverVoteGetter, WaiverApprover
 from .complex import WaiverVoteAdderImpl, WaiverVoteGetterImpl
 from .complex.game import GameUpserterImpl, GameCreatorImpl, GamePackagerImpl
-from .complex.game_play import GamePreparerImpl, GameStarterImpl, GamePlayerDaoImpl
+from .complex.game_play import (
+    GamePreparerImpl,
+    GameStarterImpl,
+    GamePlayerDaoImpl,
+    FilesWarmUpDaoImpl,
+)
 from .complex.key_log import TypedKeyGetterImpl
 from .complex.level_testing import LevelTestComplex
-from .complex.level_times import GameStatImpl
+from .complex.level_times import GameStatImpl, SeasonStatImpl
 from .complex.orgs import OrgAdderImpl
 from .complex.player import PlayerPromoterImpl, PlayerMergerImpl
 from .complex.team import TeamCreatorImpl, TeamLeaverImpl, TeamMergerImpl
 from .complex.waiver import WaiverApproverImpl
+from .memory.file_info import FileInfoCache
+from .memory.identity import IdentityCache, IdentityChanges
+from .memory.key_submission import KeySubmissionCache
 from .memory.level_testing import LevelTestingData
+from .memory.running_game import RunningGameCache
 from .rdb import (
     ChatDao,
     UserDao,
@@ -47,6 +58,7 @@ from .rdb import (
 from .rdb.achievement import AchievementDAO
 from .rdb.forum_team import ForumTeamDAO
 from .redis import PollDao, SecureInvite
+from .redis.active_game import ActiveGameChannel
 
 
 class HolderDao:
@@ -55,21 +67,29 @@ class HolderDao:
         session: AsyncSession,
         redis: Redis,
         level_test: LevelTestingData,
+        running_games: RunningGameCache,
+        key_submissions: KeySubmissionCache,
+        file_info_cache: FileInfoCache,
+        identities: IdentityCache,
+        active_game: ActiveGameChannel,
         clock: typing.Callable[[tzinfo], datetime] = datetime.now,
     ) -> None:
         self.session = session
         self.clock = clock
+        self.identity_changes = IdentityChanges(identities)
         self.user = UserDao(self.session, clock=clock)
-        self.chat = ChatDao(self.session, clock=clock)
-        self.file_info = FileInfoDao(self.session, clock=clock)
-        self.game = GameDao(self.session, clock=clock)
-        self.level = LevelDao(self.session, clock=clock)
-        self.level_time = LevelTimeDao(self.session, clock=clock)
+        self.chat = ChatDao(self.session, identities=self.identity_changes, clock=clock)
+        self.file_info = FileInfoDao(self.session, cache=file_info_cache, clock=clock)
+        self.game = GameDao(
+            self.session, running_games=running_games, active_game=active_game, clock=clock
+        )
+        self.level = LevelDao(self.session, running_games=running_games, clock=clock)
+        self.level_time = LevelTimeDao(self.session, key_submissions=key_submissions, clock=clock)
         self.key_time = KeyTimeDao(self.session, clock=clock)
         self.organizer = OrganizerDao(self.session, clock=clock)
-        self.player = PlayerDao(self.session, clock=clock)
+        self.player = PlayerDao(self.session, identities=self.identity_changes, clock=clock)
         self.team_player = TeamPlayerDao(self.session, clock=clock)
-        self.team = TeamDao(self.session, clock=clock)
+        self.team = TeamDao(self.session, identities=self.identity_changes, clock=clock)
         self.waiver = WaiverDao(self.session, clock=clock)
         self.achievement = AchievementDAO(self.session, clock=clock)
         self.forum_user = ForumUserDAO(self.session, clock=clock)
@@ -77,9 +97,17 @@ class HolderDao:
         self.poll = PollDao(redis=redis, clock=clock)
         self.secure_invite = SecureInvite(redis=redis, clock=clock)
         self.level_test = level_test
+        self.running_games = running_games
+        self.key_submissions = key_submissions
+        self.file_info_cache = file_info_cache
+        self.identities = identities
+        self.active_game = active_game
 
     async def commit(self):
         await self.session.commit()
+        self.identity_changes.apply()
+        self.file_info.invalidate_changed()
+        await self.game.publish_active_game_changes()
 
     @property
     def waiver_vote_adder(self) -> WaiverVoteAdder:
@@ -121,6 +149,10 @@ class HolderDao:
     def game_preparer(self) -> GamePreparer:
         return GamePreparerImpl(dao=self)
 
+    @property
+    def files_warm_up(self) -> FilesWarmUpDao:
+        return FilesWarmUpDaoImpl(dao=self)
+
     @property
     def game_starter(self) -> GameStarter:
         return GameStarterImpl(dao=self)
@@ -149,6 +181,10 @@ class HolderDao:
     def game_stat(self) -> GameStatDao:
         return GameStatImpl(dao=self)
 
+    @property
+    def season_stat(self) -> SeasonStatDao:
+        return SeasonStatImpl(dao=self)
+
     @property
     def typed_keys(self) -> TypedKeyGetter:
         return TypedKeyGetterImpl(dao=self)
@@ -0,0 +1,52 @@
+import logging
+import time
+from copy import copy
+from datetime import timedelta
+from typing import Callable
+
+from shvatka.core.models import dto
+
+logger = logging.getLogger(__name__)
+
+
+class ActiveGameCache:
+    """
+    Game which is active now (or it's absence), so checking for active game
+    on every update and every hint doesn't go to db.
+    Other bot and api processes tell about changes of game through redis channel,
+    ttl only limits staleness if such notification was lost.
+    """
+
+    def __init__(
+        self,
+        ttl: timedelta = timedelta(minutes=1),
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl = ttl.total_seconds()
+        self.clock = clock
+        self.version = 0
+        self._game: dto.Game | None = None
+        self._expire_at = float("-inf")
+
+    def is_known(self) -> bool:
+        return self._expire_at >= self.clock()
+
+    def get(self) -> dto.Game | None:
+        # callers can change status or start_at of their copy of game
+        return copy(self._game)
+
+    def put(self, game: dto.Game | None, version: int) -> None:
+        """version have to be taken before loading game from db"""
+        if version != self.version:
+            logger.debug("active game was changed while loading, don't cache it")
+            return
+        self._game = copy(game)
+        self._expire_at = self.clock() + self.ttl
+
+    def invalidate(self) -> None:
+        self.version += 1
+        self._game = None
+        self._expire_at = float("-inf")
+
+    def clear(self) -> None:
+        self.invalidate()
@@ -0,0 +1,47 @@
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Callable
+
+from shvatka.core.models.dto import hints
+
+
+class FileInfoCache:
+    """
+    Recently used file metas by guid, so sending same hint to many teams
+    doesn't look for the same file in db again and again.
+    Entries are expired after ttl, because file_id can be renewed by other bot process.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 4096,
+        ttl: timedelta = timedelta(minutes=10),
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl.total_seconds()
+        self.clock = clock
+        self._files: OrderedDict[str, tuple[float, hints.VerifiableFileMeta]] = OrderedDict()
+
+    def get(self, guid: str) -> hints.VerifiableFileMeta | None:
+        if (entry := self._files.get(guid)) is None:
+            return None
+        expire_at, file_meta = entry
+        if expire_at < self.clock():
+            del self._files[guid]
+            return None
+        self._files.move_to_end(guid)
+        return file_meta
+
+    def put(self, file_meta: hints.VerifiableFileMeta) -> None:
+        self._files[file_meta.guid] = (self.clock() + self.ttl, file_meta)
+        self._files.move_to_end(file_meta.guid)
+        while len(self._files) > self.maxsize:
+            self._files.popitem(last=False)
+
+    def invalidate(self, guid: str) -> None:
+        self._files.pop(guid, None)
+
+    def clear(self) -> None:
+        self._files.clear()
@@ -0,0 +1,160 @@
+import time
+from collections import OrderedDict
+from dataclasses import replace
+from datetime import timedelta
+from typing import Callable, TypeVar, Hashable
+
+from shvatka.core.models import dto
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class IdentityCache:
+    """
+    Last seen telegram users and chats with resolved players and teams,
+    so data loading for every update doesn't go to db while nothing changed.
+    Entries are expired after ttl, because they can be changed by other bot process.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 10_000,
+        ttl: timedelta = timedelta(minutes=5),
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl.total_seconds()
+        self.clock = clock
+        self._users: OrderedDict[int, tuple[float, dto.User]] = OrderedDict()
+        self._chats: OrderedDict[int, tuple[float, dto.Chat]] = OrderedDict()
+        self._players: OrderedDict[int, tuple[float, dto.Player]] = OrderedDict()
+        self._teams: OrderedDict[int, tuple[float, dto.Team | None]] = OrderedDict()
+
+    def get_user(self, tg_id: int) -> dto.User | None:
+        return self._get(self._users, tg_id)
+
+    def get_same_user(self, user: dto.User) -> dto.User | None:
+        """saved user if nothing changed in telegram payload since it was saved"""
+        saved = self.get_user(user.tg_id)
+        if saved is None or replace(user, db_id=saved.db_id) != saved:
+            return None
+        return saved
+
+    def put_user(self, user: dto.User) -> None:
+        self._put(self._users, user.tg_id, user)
+
+    def get_chat(self, tg_id: int) -> dto.Chat | None:
+        return self._get(self._chats, tg_id)
+
+    def get_same_chat(self, chat: dto.Chat) -> dto.Chat | None:
+        """saved chat if nothing changed in telegram payload since it was saved"""
+        saved = self.get_chat(chat.tg_id)
+        if saved is None or _chat_payload(chat) != _chat_payload(saved):
+            return None
+        return saved
+
+    def put_chat(self, chat: dto.Chat) -> None:
+        self._put(self._chats, chat.tg_id, chat)
+
+    def get_player(self, user_id: int) -> dto.Player | None:
+        return self._get(self._players, user_id)
+
+    def put_player(self, user_id: int, player: dto.Player) -> None:
+        self._put(self._players, user_id, player)
+
+    def is_team_known(self, chat_id: int) -> bool:
+        """chat_id is db id of chat. Chat without team is known too"""
+        return self._get(self._teams, chat_id, missing=False) is not False
+
+    def get_team(self, chat_id: int) -> dto.Team | None:
+        return self._get(self._teams, chat_id)
+
+    def put_team(self, chat_id: int, team: dto.Team | None) -> None:
+        self._put(self._teams, chat_id, team)
+
+    def invalidate_chat(self, tg_id: int) -> None:
+        self._chats.pop(tg_id, None)
+        self._teams.clear()
+
+    def invalidate_player(self, player_id: int) -> None:
+        for user_id, (_, player) in list(self._players.items()):
+            if player.id == player_id:
+                del self._players[user_id]
+        # teams have players as captains
+        self._teams.clear()
+
+    def invalidate_user_player(self, user_id: int) -> None:
+        self._players.pop(user_id, None)
+        self._teams.clear()
+
+    def invalidate_teams(self) -> None:
+        self._teams.clear()
+
+    def clear(self) -> None:
+        self._users.clear()
+        self._chats.clear()
+        self._players.clear()
+        self._teams.clear()
+
+    def _get(self, store: OrderedDict[K, tuple[float, V]], key: K, missing=None):
+        if (entry := store.get(key)) is None:
+            return missing
+        expire_at, value = entry
+        if expire_at < self.clock():
+            del store[key]
+            return missing
+        store.move_to_end(key)
+        return value
+
+    def _put(self, store: OrderedDict[K, tuple[float, V]], key: K, value: V) -> None:
+        store[key] = (self.clock() + self.ttl, value)
+        store.move_to_end(key)
+        while len(store) > self.maxsize:
+            store.popitem(last=False)
+
+
+class IdentityChanges:
+    """
+    Invalidations of IdentityCache collected by request dao.
+    They are applied only after commit, otherwise other request
+    can put old data from db to cache again before changes are committed.
+    """
+
+    def __init__(self, cache: IdentityCache) -> None:
+        self.cache = cache
+        self._chats: set[int] = set()
+        self._players: set[int] = set()
+        self._users: set[int] = set()
+        self._teams = False
+
+    def invalidate_chat(self, tg_id: int) -> None:
+        self._chats.add(tg_id)
+
+    def invalidate_player(self, player_id: int) -> None:
+        self._players.add(player_id)
+
+    def invalidate_user_player(self, user_id: int) -> None:
+        self._users.add(user_id)
+
+    def invalidate_teams(self) -> None:
+        self._teams = True
+
+    def apply(self) -> None:
+        for tg_id in self._chats:
+            self.cache.invalidate_chat(tg_id)
+        for player_id in self._players:
+            self.cache.invalidate_player(player_id)
+        for user_id in self._users:
+            self.cache.invalidate_user_player(user_id)
+        if self._teams:
+            self.cache.invalidate_teams()
+        self._chats.clear()
+        self._players.clear()
+        self._users.clear()
+        self._teams = False
+
+
+def _chat_payload(chat: dto.Chat) -> tuple:
+    """only fields which are saved to db"""
+    return chat.tg_id, chat.type, chat.title, chat.username
@@ -0,0 +1,36 @@
+from shvatka.core.models import dto, enums
+
+
+class KeySubmissionCache:
+    """
+    Current level time of every playing team with keys typed on it.
+    It's only a copy of levels_times and log_keys, on miss it is rebuilt from db.
+    """
+
+    def __init__(self) -> None:
+        self._states: dict[tuple[int, int], dto.KeySubmissionState] = {}
+
+    def get(self, game_id: int, team_id: int) -> dto.KeySubmissionState | None:
+        return self._states.get((game_id, team_id))
+
+    def put(self, state: dto.KeySubmissionState) -> None:
+        self._states[(state.level_time.game.id, state.level_time.team.id)] = state
+
+    def add_key(self, level_time: dto.LevelTime, key: str, type_: enums.KeyType) -> None:
+        state = self.get(level_time.game.id, level_time.team.id)
+        if state is None or state.level_time.id != level_time.id:
+            return
+        state.all_typed.add(key)
+        if type_ == enums.KeyType.simple:
+            state.typed_correct.add(key)
+
+    def invalidate(self, game_id: int, team_id: int) -> None:
+        self._states.pop((game_id, team_id), None)
+
+    def invalidate_team(self, team_id: int) -> None:
+        for game_id, team_id_ in list(self._states):
+            if team_id_ == team_id:
+                del self._states[(game_id, team_id_)]
+
+    def clear(self) -> None:
+        self._states.clear()
@@ -0,0 +1,29 @@
+import logging
+
+from shvatka.core.models import dto
+
+logger = logging.getLogger(__name__)
+
+
+class RunningGameCache:
+    """
+    Keeps FullGame of started games in process memory,
+    so key checking and hint sending don't reload all level scenarios from db.
+    """
+
+    def __init__(self) -> None:
+        self._games: dict[int, dto.FullGame] = {}
+
+    def get(self, game_id: int) -> dto.FullGame | None:
+        return self._games.get(game_id)
+
+    def put(self, game: dto.FullGame) -> None:
+        logger.debug("game %s saved to running games cache", game.id)
+        self._games[game.id] = game
+
+    def invalidate(self, game_id: int | None) -> None:
+        if game_id is not None and self._games.pop(game_id, None) is not None:
+            logger.debug("game %s removed from running games cache", game_id)
+
+    def clear(self) -> None:
+        self._games.clear()
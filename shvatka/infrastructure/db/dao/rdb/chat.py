@@ -8,14 +8,23 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from shvatka.core.models import dto
 from shvatka.core.utils import exceptions
 from shvatka.infrastructure.db import models
+from shvatka.infrastructure.db.dao.memory.identity import IdentityChanges
 from .base import BaseDAO
 
 
 class ChatDao(BaseDAO[models.Chat]):
     def __init__(
-        self, session: AsyncSession, clock: typing.Callable[[tzinfo], datetime] = datetime.now
+        self,
+        session: AsyncSession,
+        identities: IdentityChanges,
+        clock: typing.Callable[[tzinfo], datetime] = datetime.now,
     ) -> None:
         super().__init__(models.Chat, session, clock=clock)
+        self.identities = identities
+
+    async def commit(self):
+        await super().commit()
+        self.identities.apply()
 
     async def get_by_tg_id(self, tg_id: int) -> dto.Chat:
         chat = await self._get_by_tg_id(tg_id)
@@ -31,6 +40,7 @@ class ChatDao(BaseDAO[models.Chat]):
             raise exceptions.ChatNotFound(chat_id=tg_id) from e
 
     async def change_team_chat(self, team: dto.Team, chat: dto.Chat) -> None:
+        self.identities.invalidate_teams()
         await self.session.execute(
             update(models.Chat).where(models.Chat.tg_id == team.get_chat_id()).values(team_id=None)
         )
@@ -53,10 +63,12 @@ class ChatDao(BaseDAO[models.Chat]):
                 where=models.Chat.tg_id == chat.tg_id,
             )
             .returning(models.Chat)
+            .execution_options(populate_existing=True)
         )
         return saved_chat.scalar_one().to_dto()
 
     async def update_chat_id(self, chat: dto.Chat, new_id: int):
+        self.identities.invalidate_chat(chat.tg_id)
         chat_db = await self._get_by_tg_id(chat.tg_id)
         chat_db.tg_id = new_id
         self._save(chat_db)
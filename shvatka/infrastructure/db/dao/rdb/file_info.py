@@ -1,6 +1,6 @@
 from datetime import datetime, tzinfo
 import typing
-from typing import Sequence
+from typing import Sequence, Iterable
 
 from sqlalchemy import select, ScalarResult
 from sqlalchemy import update
@@ -12,14 +12,34 @@ from shvatka.core.models import dto
 from shvatka.core.models.dto import hints
 from shvatka.core.utils.exceptions import PermissionsError
 from shvatka.infrastructure.db import models
+from shvatka.infrastructure.db.dao.memory.file_info import FileInfoCache
 from .base import BaseDAO
 
 
 class FileInfoDao(BaseDAO[models.FileInfo]):
     def __init__(
-        self, session: AsyncSession, clock: typing.Callable[[tzinfo], datetime] = datetime.now
+        self,
+        session: AsyncSession,
+        cache: FileInfoCache,
+        clock: typing.Callable[[tzinfo], datetime] = datetime.now,
     ) -> None:
         super().__init__(models.FileInfo, session, clock=clock)
+        self.cache = cache
+        # guids changed in this session, cache is invalidated only after commit
+        self.changed_guids: set[str] = set()
+        self.all_changed = False
+
+    async def commit(self):
+        await super().commit()
+        self.invalidate_changed()
+
+    def invalidate_changed(self) -> None:
+        if self.all_changed:
+            self.cache.clear()
+        for guid in self.changed_guids:
+            self.cache.invalidate(guid)
+        self.changed_guids.clear()
+        self.all_changed = False
 
     async def upsert(self, file: hints.FileMeta, author: dto.Player) -> hints.SavedFileMeta:
         try:
@@ -28,28 +48,66 @@ class FileInfoDao(BaseDAO[models.FileInfo]):
             db_file = models.FileInfo(guid=file.guid, author_id=author.id)
             self._save(db_file)
             await self._flush(db_file)
-        db_file.file_path = file.file_content_link.file_path
-        db_file.original_filename = file.original_filename
-        db_file.extension = file.extension
-        if file.tg_link:
-            db_file.file_id = file.tg_link.file_id
-            db_file.content_type = file.tg_link.content_type.name
-        if file.content_type:
-            db_file.content_type = file.content_type.name
-
+        self.changed_guids.add(file.guid)
+        _fill_file_info(db_file, file)
         return db_file.to_dto(author=author)
 
-    async def check_author_can_own_guid(self, author: dto.Player, guid: str) -> None:
-        try:
-            db_file = await self._get_by_guid(guid)
-            if db_file.author_id != author.id:
-                raise PermissionsError(notify_user="невозможно создать с таким guid")
-        except NoResultFound:
-            return
+    async def upsert_many(
+        self, files: Sequence[hints.FileMeta], author: dto.Player
+    ) -> list[hints.SavedFileMeta]:
+        result: ScalarResult[models.FileInfo] = await self.session.scalars(
+            select(models.FileInfo).where(models.FileInfo.guid.in_([f.guid for f in files]))
+        )
+        existing = {db_file.guid: db_file for db_file in result.all()}
+        db_files = []
+        for file in files:
+            if (db_file := existing.get(file.guid)) is None:
+                db_file = models.FileInfo(guid=file.guid, author_id=author.id)
+                self._save(db_file)
+            self.changed_guids.add(file.guid)
+            _fill_file_info(db_file, file)
+            db_files.append(db_file)
+        await self._flush(*db_files)
+        return [db_file.to_dto(author=author) for db_file in db_files]
+
+    async def check_author_can_own_guids(self, author: dto.Player, guids: Iterable[str]) -> None:
+        result = await self.session.scalars(
+            select(models.FileInfo.guid)
+            .where(
+                models.FileInfo.guid.in_(list(guids)),
+                models.FileInfo.author_id != author.id,
+            )
+            .limit(1)
+        )
+        if result.first() is not None:
+            raise PermissionsError(notify_user="невозможно создать с таким guid")
 
     async def get_by_guid(self, guid: str) -> hints.VerifiableFileMeta:
+        if file_meta := self._get_cached(guid):
+            return file_meta
         db_file = await self._get_by_guid(guid)
-        return db_file.to_short_dto()
+        file_meta = db_file.to_short_dto()
+        self._put_cached(file_meta)
+        return file_meta
+
+    async def get_by_guids(self, guids: Iterable[str]) -> dict[str, hints.VerifiableFileMeta]:
+        result: dict[str, hints.VerifiableFileMeta] = {}
+        missed = set()
+        for guid in guids:
+            if file_meta := self._get_cached(guid):
+                result[guid] = file_meta
+            else:
+                missed.add(guid)
+        if not missed:
+            return result
+        db_files: ScalarResult[models.FileInfo] = await self.session.scalars(
+            select(models.FileInfo).where(models.FileInfo.guid.in_(missed))
+        )
+        for db_file in db_files.all():
+            file_meta = db_file.to_short_dto()
+            self._put_cached(file_meta)
+            result[file_meta.guid] = file_meta
+        return result
 
     async def transfer(self, file_guid: str, new_author: dto.Player):
         await self.session.execute(
@@ -57,6 +115,7 @@ class FileInfoDao(BaseDAO[models.FileInfo]):
             .where(models.FileInfo.guid == file_guid)
             .values(author_id=new_author.id)
         )
+        self.changed_guids.add(file_guid)
 
     async def transfer_all(self, primary: dto.Player, secondary: dto.Player) -> None:
         await self.session.execute(
@@ -64,6 +123,17 @@ class FileInfoDao(BaseDAO[models.FileInfo]):
             .where(models.FileInfo.author_id == secondary.id)
             .values(author_id=primary.id)
         )
+        self.all_changed = True
+
+    def _get_cached(self, guid: str) -> hints.VerifiableFileMeta | None:
+        # uncommitted changes of this session are not in cache yet
+        if self.all_changed or guid in self.changed_guids:
+            return None
+        return self.cache.get(guid)
+
+    def _put_cached(self, file_meta: hints.VerifiableFileMeta) -> None:
+        if not self.all_changed and file_meta.guid not in self.changed_guids:
+            self.cache.put(file_meta)
 
     async def _get_by_guid(self, guid: str) -> models.FileInfo:
         result: ScalarResult[models.FileInfo] = await self.session.scalars(
@@ -75,6 +145,7 @@ class FileInfoDao(BaseDAO[models.FileInfo]):
         await self.session.execute(
             update(models.FileInfo).where(models.FileInfo.guid == guid).values(file_id=file_id)
         )
+        self.changed_guids.add(guid)
 
     async def get_without_file_id(self, limit: int) -> Sequence[hints.SavedFileMeta]:
         result: ScalarResult[models.FileInfo] = await self.session.scalars(
@@ -88,3 +159,14 @@ class FileInfoDao(BaseDAO[models.FileInfo]):
             .limit(limit)
         )
         return [f.to_dto(f.author.to_dto_user_prefetched()) for f in result.all()]
+
+
+def _fill_file_info(db_file: models.FileInfo, file: hints.FileMeta) -> None:
+    db_file.file_path = file.file_content_link.file_path
+    db_file.original_filename = file.original_filename
+    db_file.extension = file.extension
+    if file.tg_link:
+        db_file.file_id = file.tg_link.file_id
+        db_file.content_type = file.tg_link.content_type.name
+    if file.content_type:
+        db_file.content_type = file.content_type.name
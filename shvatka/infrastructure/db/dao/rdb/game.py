@@ -15,14 +15,36 @@ from shvatka.core.models.enums.game_status import ACTIVE_STATUSES
 from shvatka.core.utils.datetime_utils import tz_utc
 from shvatka.core.utils.exceptions import GameHasAnotherAuthor
 from shvatka.infrastructure.db import models
+from shvatka.infrastructure.db.dao.memory.running_game import RunningGameCache
+from shvatka.infrastructure.db.dao.redis.active_game import ActiveGameChannel
 from .base import BaseDAO
 
 
 class GameDao(BaseDAO[models.Game]):
     def __init__(
-        self, session: AsyncSession, clock: typing.Callable[[tzinfo], datetime] = datetime.now
+        self,
+        session: AsyncSession,
+        running_games: RunningGameCache,
+        active_game: ActiveGameChannel,
+        clock: typing.Callable[[tzinfo], datetime] = datetime.now,
     ) -> None:
         super().__init__(models.Game, session, clock=clock)
+        self.running_games = running_games
+        self.active_game = active_game
+        self.active_game_changed = False
+
+    async def commit(self):
+        await super().commit()
+        await self.publish_active_game_changes()
+
+    async def publish_active_game_changes(self) -> None:
+        if self.active_game_changed:
+            self.active_game_changed = False
+            await self.active_game.publish()
+
+    def _change_active_game(self) -> None:
+        self.active_game_changed = True
+        self.active_game.cache.invalidate()
 
     async def upsert_game(
         self,
@@ -67,6 +89,14 @@ class GameDao(BaseDAO[models.Game]):
             levels=[level.to_dto(author) for level in game_db.levels],
         )
 
+    async def get_running(self, id_: int) -> dto.FullGame:
+        if game := self.running_games.get(id_):
+            return game
+        game = await self.get_full(id_)
+        if game.is_started():
+            self.running_games.put(game)
+        return game
+
     async def add_levels(self, game: dto.Game) -> dto.FullGame:
         levels_db: ScalarResult[models.Level] = await self.session.scalars(
             select(models.Level)
@@ -109,6 +139,28 @@ class GameDao(BaseDAO[models.Game]):
         games = result.all()
         return [game.to_dto(author) for game in games]
 
+    async def get_completed_games_started_between(
+        self, started_from: datetime, started_to: datetime
+    ) -> list[dto.Game]:
+        result = await self.session.scalars(
+            select(models.Game)
+            .options(
+                joinedload(models.Game.author).options(
+                    joinedload(models.Player.user),
+                    joinedload(models.Player.forum_user),
+                )
+            )
+            .where(
+                models.Game.status == GameStatus.complete,
+                models.Game.number.is_not(None),
+                models.Game.start_at >= started_from,
+                models.Game.start_at < started_to,
+            )
+            .order_by(models.Game.number, models.Game.start_at)
+        )
+        games: Sequence[models.Game] = result.all()
+        return [game.to_dto(game.author.to_dto_user_prefetched()) for game in games]
+
     async def get_completed_games(self) -> list[dto.Game]:
         result = await self.session.scalars(
             select(models.Game)
@@ -138,8 +190,21 @@ class GameDao(BaseDAO[models.Game]):
             update(models.Game).where(models.Game.id == game.id).values(status=status)
         )
         game.status = status
+        self._change_active_game()
+        if status != GameStatus.started:
+            self.running_games.invalidate(game.id)
 
     async def get_active_game(self) -> dto.Game | None:
+        cache = self.active_game.cache
+        if not self.active_game_changed and cache.is_known():
+            return cache.get()
+        version = cache.version
+        game = await self._get_active_game()
+        if not self.active_game_changed:
+            cache.put(game, version)
+        return game
+
+    async def _get_active_game(self) -> dto.Game | None:
         result = await self.session.scalars(
             select(models.Game)
             .where(models.Game.status.in_(ACTIVE_STATUSES))
@@ -173,16 +238,20 @@ class GameDao(BaseDAO[models.Game]):
             .values(start_at=start_at.astimezone(tz_utc))
         )
         game.start_at = start_at
+        self._change_active_game()
 
     async def cancel_start(self, game: dto.Game):
         await self.session.execute(
             update(models.Game).where(models.Game.id == game.id).values(start_at=None)
         )
+        self._change_active_game()
 
     async def rename_game(self, game: dto.Game, new_name: str):
         await self.session.execute(
             update(models.Game).where(models.Game.id == game.id).values(name=new_name)
         )
+        self.running_games.invalidate(game.id)
+        self._change_active_game()
 
     async def set_started(self, game: dto.Game):
         await self.set_status(game, GameStatus.started)
@@ -199,6 +268,7 @@ class GameDao(BaseDAO[models.Game]):
             .where(models.Game.id == game.id)
             .values(published_channel_id=channel_id)
         )
+        self._change_active_game()
 
     async def get_game_by_name(self, name: str, author: dto.Player) -> dto.Game:
         game = await self._get_game_by_name(name)
@@ -210,6 +280,7 @@ class GameDao(BaseDAO[models.Game]):
         await self.session.execute(
             update(models.Game).where(models.Game.id == game.id).values(author_id=new_author.id)
         )
+        self._change_active_game()
 
     async def get_game_by_number(self, number: int) -> dto.Game:
         result: ScalarResult[models.Game] = await self.session.scalars(
@@ -231,6 +302,7 @@ class GameDao(BaseDAO[models.Game]):
             .where(models.Game.author_id == secondary.id)
             .values(author_id=primary.id)
         )
+        self._change_active_game()
 
     async def is_name_available(self, name: str) -> bool:
         return not bool(await self._get_game_by_name(name))
@@ -240,6 +312,7 @@ class GameDao(BaseDAO[models.Game]):
             update(models.Game).where(models.Game.id == game.id).values(number=number)
         )
         game.number = number
+        self._change_active_game()
 
     async def get_max_number(self) -> int:
         result = await self.session.scalar(select(func.max(models.Game.number)))
@@ -251,11 +324,13 @@ class GameDao(BaseDAO[models.Game]):
             .where(models.Game.id == game.id)
             .values(results_picture_file_id=results_picture_file_id)
         )
+        self._change_active_game()
 
     async def set_keys_url(self, game: dto.Game, url: str):
         await self.session.execute(
             update(models.Game).where(models.Game.id == game.id).values(keys_url=url)
         )
+        self._change_active_game()
 
     async def is_author_game_by_name(self, name: str, author: dto.Player) -> bool:
         result = await self._get_game_by_name(name)
@@ -1,5 +1,6 @@
 from datetime import datetime, tzinfo
 import typing
+from typing import Sequence
 from sqlalchemy import select, ScalarResult
 from sqlalchemy import update
 from sqlalchemy.exc import NoResultFound
@@ -11,14 +12,19 @@ from shvatka.core.models.dto.scn.level import LevelScenario
 from shvatka.core.rules.game import check_game_editable
 from shvatka.core.rules.level import check_can_link_to_game
 from shvatka.infrastructure.db import models
+from shvatka.infrastructure.db.dao.memory.running_game import RunningGameCache
 from .base import BaseDAO
 
 
 class LevelDao(BaseDAO[models.Level]):
     def __init__(
-        self, session: AsyncSession, clock: typing.Callable[[tzinfo], datetime] = datetime.now
+        self,
+        session: AsyncSession,
+        running_games: RunningGameCache,
+        clock: typing.Callable[[tzinfo], datetime] = datetime.now,
     ) -> None:
         super().__init__(models.Level, session, clock=clock)
+        self.running_games = running_games
 
     async def upsert(
         self,
@@ -39,14 +45,49 @@ class LevelDao(BaseDAO[models.Level]):
         else:
             if game_ := level.game:
                 check_game_editable(game_.to_dto(author))
+            self.running_games.invalidate(level.game_id)
         level.scenario = scn
         if game is not None and no_in_game is not None:
             check_can_link_to_game(game, level.to_dto(author), author)
             level.game_id = game.id
             level.number_in_game = no_in_game
+            self.running_games.invalidate(game.id)
         await self._flush(level)
         return level.to_dto(author)
 
+    async def upsert_game_levels(
+        self, author: dto.Player, scenarios: Sequence[LevelScenario], game: dto.Game
+    ) -> list[dto.Level]:
+        result: ScalarResult[models.Level] = await self.session.scalars(
+            select(models.Level)
+            .options(joinedload(models.Level.game))
+            .where(
+                models.Level.name_id.in_([scn.id for scn in scenarios]),
+                models.Level.author_id == author.id,
+            )
+        )
+        existing = {level.name_id: level for level in result.all()}
+        levels = []
+        for no_in_game, scn in enumerate(scenarios):
+            if (level := existing.get(scn.id)) is None:
+                level = models.Level(
+                    author_id=author.id,
+                    name_id=scn.id,
+                )
+                self._save(level)
+            else:
+                if game_ := level.game:
+                    check_game_editable(game_.to_dto(author))
+                self.running_games.invalidate(level.game_id)
+            level.scenario = scn
+            check_can_link_to_game(game, level.to_dto(author), author)
+            level.game_id = game.id
+            level.number_in_game = no_in_game
+            levels.append(level)
+        self.running_games.invalidate(game.id)
+        await self._flush(*levels)
+        return [level.to_dto(author) for level in levels]
+
     async def _get_by_author_and_scn(self, author: dto.Player, scn: LevelScenario) -> models.Level:
         return await self._get_by_author_and_name_id(author, scn.id)
 
@@ -90,6 +131,7 @@ class LevelDao(BaseDAO[models.Level]):
         await self.session.execute(
             update(models.Level).where(models.Level.id == level.db_id).values(game_id=None)
         )
+        self.running_games.invalidate(level.game_id)
 
     async def is_name_id_exist(self, name_id: str, author: dto.Player) -> bool:
         result = await self.session.scalars(
@@ -111,6 +153,7 @@ class LevelDao(BaseDAO[models.Level]):
                 number_in_game=None,
             )
         )
+        self.running_games.invalidate(game.id)
 
     async def link_to_game(self, level: dto.Level, game: dto.Game) -> dto.Level:
         max_level = await self.get_max_level_number(game)
@@ -121,6 +164,7 @@ class LevelDao(BaseDAO[models.Level]):
         )
         level.game_id = game.id
         level.number_in_game = max_level + 1
+        self.running_games.invalidate(game.id)
         return level
 
     async def get_max_level_number(self, game: dto.Game) -> int:
@@ -158,9 +202,11 @@ class LevelDao(BaseDAO[models.Level]):
         )
         for i, lvl in enumerate(lvls.all()):
             lvl.number_in_game = i
+        self.running_games.invalidate(game_id)
 
     async def delete(self, level_id: int) -> None:
         _level = await self._get_by_id(level_id)
+        self.running_games.invalidate(_level.game_id)
         await self.session.delete(_level)
 
     async def transfer(self, level: dto.Level, new_author: dto.Player):
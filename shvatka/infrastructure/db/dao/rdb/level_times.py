@@ -1,21 +1,28 @@
 from datetime import datetime, tzinfo
 import typing
+from typing import Sequence
 
-from sqlalchemy import select, update
+from sqlalchemy import select, update, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
+from sqlalchemy.orm.interfaces import ORMOption
 
-from shvatka.core.models import dto
+from shvatka.core.models import dto, enums
 from shvatka.core.utils.datetime_utils import tz_utc
 from shvatka.infrastructure.db import models
+from shvatka.infrastructure.db.dao.memory.key_submission import KeySubmissionCache
 from .base import BaseDAO
 
 
 class LevelTimeDao(BaseDAO[models.LevelTime]):
     def __init__(
-        self, session: AsyncSession, clock: typing.Callable[[tzinfo], datetime] = datetime.now
+        self,
+        session: AsyncSession,
+        key_submissions: KeySubmissionCache,
+        clock: typing.Callable[[tzinfo], datetime] = datetime.now,
     ) -> None:
         super().__init__(models.LevelTime, session, clock=clock)
+        self.key_submissions = key_submissions
 
     async def set_to_level(
         self,
@@ -34,8 +41,61 @@ class LevelTimeDao(BaseDAO[models.LevelTime]):
         )
         self._save(level_time)
         await self._flush(level_time)
+        self.key_submissions.invalidate(game_id=game.id, team_id=team.id)
         return level_time.to_dto(team=team, game=game)
 
+    async def set_all_to_level(
+        self,
+        teams: Sequence[dto.Team],
+        game: dto.Game,
+        level_number: int,
+        at: datetime | None = None,
+    ) -> list[dto.LevelTime]:
+        if not teams:
+            return []
+        if at is None:
+            at = self.clock(tz_utc)
+        result = await self.session.execute(
+            insert(models.LevelTime)
+            .values(
+                [
+                    dict(game_id=game.id, team_id=team.id, level_number=level_number, start_at=at)
+                    for team in teams
+                ]
+            )
+            .returning(models.LevelTime.team_id, models.LevelTime.id)
+        )
+        ids: dict[int, int] = dict(result.tuples().all())
+        for team in teams:
+            self.key_submissions.invalidate(game_id=game.id, team_id=team.id)
+        return [
+            dto.LevelTime(
+                id=ids[team.id], game=game, team=team, level_number=level_number, start_at=at
+            )
+            for team in teams
+        ]
+
+    async def insert_many(
+        self,
+        game: dto.Game,
+        levels: Sequence[tuple[dto.Team, int, datetime]],
+    ) -> list[dto.LevelTime]:
+        if not levels:
+            return []
+        result = await self.session.scalars(
+            insert(models.LevelTime).returning(models.LevelTime.id, sort_by_parameter_order=True),
+            [
+                dict(game_id=game.id, team_id=team.id, level_number=level_number, start_at=at)
+                for team, level_number, at in levels
+            ],
+        )
+        for team_id in {team.id for team, _, _ in levels}:
+            self.key_submissions.invalidate(game_id=game.id, team_id=team_id)
+        return [
+            dto.LevelTime(id=id_, game=game, team=team, level_number=level_number, start_at=at)
+            for id_, (team, level_number, at) in zip(result.all(), levels, strict=True)
+        ]
+
     async def get_current_level(self, team: dto.Team, game: dto.Game) -> int:
         return (await self.get_current_level_time(team=team, game=game)).level_number
 
@@ -55,20 +115,28 @@ class LevelTimeDao(BaseDAO[models.LevelTime]):
         )
         return result.scalar_one()
 
+    async def is_all_team_finished(self, game: dto.Game, levels_count: int) -> bool:
+        finished = select(models.LevelTime.id).where(
+            models.LevelTime.game_id == game.id,
+            models.LevelTime.team_id == models.Waiver.team_id,
+            models.LevelTime.level_number >= levels_count,
+        )
+        result = await self.session.scalars(
+            select(models.Waiver.team_id)
+            .where(
+                models.Waiver.game_id == game.id,
+                models.Waiver.played == enums.Played.yes,
+                ~finished.exists(),
+            )
+            .limit(1)
+        )
+        return result.first() is None
+
     async def get_game_level_times(self, game: dto.Game) -> list[dto.LevelTime]:
         result = await self.session.scalars(
             select(models.LevelTime)
             .where(models.LevelTime.game_id == game.id)
-            .options(
-                joinedload(models.LevelTime.team)
-                .joinedload(models.Team.captain)
-                .joinedload(models.Player.user),
-                joinedload(models.LevelTime.team)
-                .joinedload(models.Team.captain)
-                .joinedload(models.Player.forum_user),
-                joinedload(models.LevelTime.team).joinedload(models.Team.chat),
-                joinedload(models.LevelTime.team).joinedload(models.Team.forum_team),
-            )
+            .options(*get_level_time_team_options())
             .order_by(
                 models.LevelTime.team_id,
                 models.LevelTime.start_at,
@@ -82,6 +150,30 @@ class LevelTimeDao(BaseDAO[models.LevelTime]):
             for lt in result.all()
         ]
 
+    async def get_games_level_times(
+        self, games: Sequence[dto.Game]
+    ) -> dict[int, dict[dto.Team, list[dto.LevelTime]]]:
+        games_by_id = {game.id: game for game in games}
+        result = await self.session.scalars(
+            select(models.LevelTime)
+            .where(models.LevelTime.game_id.in_(games_by_id))
+            .options(*get_level_time_team_options())
+            .order_by(
+                models.LevelTime.game_id,
+                models.LevelTime.team_id,
+                models.LevelTime.start_at,
+            )
+        )
+        level_times: dict[int, dict[dto.Team, list[dto.LevelTime]]] = {
+            game_id: {} for game_id in games_by_id
+        }
+        for lt in result.all():
+            team = lt.team.to_dto_chat_prefetched()
+            level_times[lt.game_id].setdefault(team, []).append(
+                lt.to_dto(game=games_by_id[lt.game_id], team=team)
+            )
+        return level_times
+
     async def get_game_level_times_by_teams(
         self, game: dto.Game, levels_count: int
     ) -> dict[dto.Team, list[dto.LevelTime]]:
@@ -106,6 +198,37 @@ class LevelTimeDao(BaseDAO[models.LevelTime]):
             )
         return result
 
+    async def get_current_level_times(self, game: dto.Game) -> list[dto.LevelTime]:
+        result = await self.session.scalars(
+            select(models.LevelTime)
+            .where(models.LevelTime.game_id == game.id)
+            .options(*get_level_time_team_options())
+            .distinct(models.LevelTime.team_id)
+            .order_by(
+                models.LevelTime.team_id,
+                models.LevelTime.start_at.desc(),
+            )
+        )
+        return [
+            lt.to_dto(
+                game=game,
+                team=lt.team.to_dto_chat_prefetched(),
+            )
+            for lt in result.all()
+        ]
+
+    async def get_current_level_times_with_hints(
+        self, game: dto.FullGame
+    ) -> list[dto.LevelTimeOnGame]:
+        result = []
+        for lt in await self.get_current_level_times(game):
+            if lt.level_number < len(game.levels):
+                hint = self._get_hint(game, lt)
+            else:
+                hint = None
+            result.append(lt.to_on_game(levels_count=len(game.levels), hint=hint))
+        return result
+
     def _get_hint(self, game: dto.FullGame, level_times: dto.LevelTime) -> dto.SpyHintInfo:
         hint = game.levels[level_times.level_number].get_hint_by_time(
             self.clock(tz_utc) - level_times.start_at
@@ -118,3 +241,17 @@ class LevelTimeDao(BaseDAO[models.LevelTime]):
             .where(models.LevelTime.team_id == secondary.id)
             .values(team_id=primary.id)
         )
+        self.key_submissions.clear()
+
+
+def get_level_time_team_options() -> Sequence[ORMOption]:
+    return (
+        joinedload(models.LevelTime.team)
+        .joinedload(models.Team.captain)
+        .joinedload(models.Player.user),
+        joinedload(models.LevelTime.team)
+        .joinedload(models.Team.captain)
+        .joinedload(models.Player.forum_user),
+        joinedload(models.LevelTime.team).joinedload(models.Team.chat),
+        joinedload(models.LevelTime.team).joinedload(models.Team.forum_team),
+    )
@@ -1,16 +1,22 @@
-from datetime import datetime, tzinfo
+from datetime import datetime, timedelta, tzinfo
 import typing
 from typing import Sequence
 
-from sqlalchemy import select, update, ScalarResult
+from sqlalchemy import select, update, ScalarResult, func, or_
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, aliased
+from sqlalchemy.orm.interfaces import ORMOption
 
 from shvatka.core.models import dto, enums
 from shvatka.core.utils.datetime_utils import tz_utc
 from shvatka.infrastructure.db import models
 from .base import BaseDAO
 
+# key is saved and committed under team lock in milliseconds after its enter_time.
+# Newer keys of running game are held back, so keys with smaller id
+# which are still not committed are not skipped by cursor
+KEYS_PAGE_SAFETY_WINDOW = timedelta(seconds=5)
+
 
 class KeyTimeDao(BaseDAO[models.KeyTime]):
     def __init__(
@@ -34,6 +40,36 @@ class KeyTimeDao(BaseDAO[models.KeyTime]):
         )
         return {key.key_text for key in result.all()}
 
+    async def get_submission_state(self, team: dto.Team, game: dto.Game) -> dto.KeySubmissionState:
+        current = (
+            select(models.LevelTime)
+            .where(
+                models.LevelTime.team_id == team.id,
+                models.LevelTime.game_id == game.id,
+            )
+            .order_by(models.LevelTime.start_at.desc())
+            .limit(1)
+            .subquery()
+        )
+        level_time = aliased(models.LevelTime, current)
+        result = await self.session.execute(
+            select(
+                level_time,
+                func.array_agg(models.KeyTime.key_text).filter(
+                    models.KeyTime.type_ == enums.KeyType.simple
+                ),
+                func.array_agg(models.KeyTime.key_text).filter(models.KeyTime.id.is_not(None)),
+            )
+            .outerjoin(models.KeyTime, models.KeyTime.level_time_id == level_time.id)
+            .group_by(*current.c)
+        )
+        lt, typed_correct, all_typed = result.one()
+        return dto.KeySubmissionState(
+            level_time=lt.to_dto(game=game, team=team),
+            typed_correct=set(typed_correct or ()),
+            all_typed=set(all_typed or ()),
+        )
+
     async def get_team_typed_keys(
         self,
         game: dto.Game,
@@ -102,28 +138,57 @@ class KeyTimeDao(BaseDAO[models.KeyTime]):
         result = await self.session.scalars(
             select(models.KeyTime)
             .where(models.KeyTime.game_id == game.id)
-            .options(
-                joinedload(models.KeyTime.team).options(
-                    joinedload(models.Team.chat),
-                    joinedload(models.Team.forum_team),
-                    joinedload(models.Team.captain).options(
-                        joinedload(models.Player.user), joinedload(models.Player.forum_user)
-                    ),
-                ),
-                joinedload(models.KeyTime.player).options(
-                    joinedload(models.Player.user), joinedload(models.Player.forum_user)
-                ),
-            )
+            .options(*get_key_time_full_load_options())
             .order_by(models.KeyTime.enter_time)
         )
         keys: Sequence[models.KeyTime] = result.all()
-        return [
-            key.to_dto(
-                player=key.player.to_dto_user_prefetched(),
-                team=key.team.to_dto_chat_prefetched(),
+        return [self._to_full_dto(key) for key in keys]
+
+    async def get_typed_keys_page(
+        self,
+        game: dto.Game,
+        since: int | None,
+        limit: int,
+        team_id: int | None = None,
+        level_number: int | None = None,
+    ) -> dto.TypedKeysPage:
+        conditions = [models.KeyTime.game_id == game.id]
+        if since is not None:
+            conditions.append(models.KeyTime.id > since)
+        if team_id is not None:
+            conditions.append(models.KeyTime.team_id == team_id)
+        if level_number is not None:
+            conditions.append(models.KeyTime.level_number == level_number)
+        query = select(models.KeyTime).where(*conditions)
+        if not game.is_complete():
+            committed_before = self.clock(tz_utc) - KEYS_PAGE_SAFETY_WINDOW
+            first_held_back = (
+                select(func.min(models.KeyTime.id))
+                .where(*conditions, models.KeyTime.enter_time >= committed_before)
+                .scalar_subquery()
             )
-            for key in keys
-        ]
+            # page ends before first held back key, cursor never passes it
+            query = query.where(
+                models.KeyTime.enter_time < committed_before,
+                or_(first_held_back.is_(None), models.KeyTime.id < first_held_back),
+            )
+        result = await self.session.scalars(
+            query.options(*get_key_time_full_load_options())
+            .order_by(models.KeyTime.id)
+            .limit(limit)
+        )
+        keys: Sequence[models.KeyTime] = result.all()
+        return dto.TypedKeysPage(
+            keys=[self._to_full_dto(key) for key in keys],
+            cursor=keys[-1].id if keys else since,
+        )
+
+    @staticmethod
+    def _to_full_dto(key: models.KeyTime) -> dto.KeyTime:
+        return key.to_dto(
+            player=key.player.to_dto_user_prefetched(),
+            team=key.team.to_dto_chat_prefetched(),
+        )
 
     async def get_typed_key_grouped(self, game: dto.Game) -> dict[dto.Team, list[dto.KeyTime]]:
         keys = await self.get_typed_keys(game)
@@ -145,3 +210,18 @@ class KeyTimeDao(BaseDAO[models.KeyTime]):
             .where(models.KeyTime.player_id == secondary.id)
             .values(player_id=primary.id)
         )
+
+
+def get_key_time_full_load_options() -> Sequence[ORMOption]:
+    return (
+        joinedload(models.KeyTime.team).options(
+            joinedload(models.Team.chat),
+            joinedload(models.Team.forum_team),
+            joinedload(models.Team.captain).options(
+                joinedload(models.Player.user), joinedload(models.Player.forum_user)
+            ),
+        ),
+        joinedload(models.KeyTime.player).options(
+            joinedload(models.Player.user), joinedload(models.Player.forum_user)
+        ),
+    )
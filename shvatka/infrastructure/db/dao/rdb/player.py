@@ -10,14 +10,23 @@ from sqlalchemy.orm import joinedload, selectinload, contains_eager
 from shvatka.core.models import dto, enums
 from shvatka.core.utils import exceptions
 from shvatka.infrastructure.db import models
+from shvatka.infrastructure.db.dao.memory.identity import IdentityChanges
 from .base import BaseDAO
 
 
 class PlayerDao(BaseDAO[models.Player]):
     def __init__(
-        self, session: AsyncSession, clock: typing.Callable[[tzinfo], datetime] = datetime.now
+        self,
+        session: AsyncSession,
+        identities: IdentityChanges,
+        clock: typing.Callable[[tzinfo], datetime] = datetime.now,
     ) -> None:
         super().__init__(models.Player, session, clock=clock)
+        self.identities = identities
+
+    async def commit(self):
+        await super().commit()
+        self.identities.apply()
 
     async def upsert_player(self, user: dto.User) -> dto.Player:
         try:
@@ -139,8 +148,11 @@ class PlayerDao(BaseDAO[models.Player]):
 
     async def link_user(self, player: dto.Player, user: dto.User) -> None:
         user_db = await self.session.get(models.User, user.db_id)
-        player_db = await self.get_by_id(player.id)
+        player_db = await self._get_by_id(player.id)
         assert user_db is not None
+        # user can be linked to another player before
+        self.identities.invalidate_user_player(user_db.id)
+        self.identities.invalidate_player(player.id)
         user_db.player = player_db
 
     async def upsert_author_dummy(self) -> dto.Player:
@@ -164,6 +176,7 @@ class PlayerDao(BaseDAO[models.Player]):
         return player
 
     async def promote(self, actor: dto.Player, target: dto.Player):
+        self.identities.invalidate_player(target.id)
         target_player = await self._get_by_id(target.id)
         target_player.can_be_author = True
         target_player.promoted_by_id = actor.id
@@ -191,4 +204,5 @@ class PlayerDao(BaseDAO[models.Player]):
         ]
 
     async def delete(self, player: dto.Player) -> None:
+        self.identities.invalidate_player(player.id)
         await self.session.execute(delete(models.Player).where(models.Player.id == player.id))
@@ -12,16 +12,26 @@ from sqlalchemy.orm.interfaces import ORMOption
 from shvatka.core.models import dto
 from shvatka.core.utils.exceptions import TeamError, AnotherTeamInChat
 from shvatka.infrastructure.db import models
+from shvatka.infrastructure.db.dao.memory.identity import IdentityChanges
 from .base import BaseDAO
 
 
 class TeamDao(BaseDAO[models.Team]):
     def __init__(
-        self, session: AsyncSession, clock: typing.Callable[[tzinfo], datetime] = datetime.now
+        self,
+        session: AsyncSession,
+        identities: IdentityChanges,
+        clock: typing.Callable[[tzinfo], datetime] = datetime.now,
     ) -> None:
         super().__init__(models.Team, session, clock=clock)
+        self.identities = identities
+
+    async def commit(self):
+        await super().commit()
+        self.identities.apply()
 
     async def create(self, chat: dto.Chat, captain: dto.Player) -> dto.Team:
+        self.identities.invalidate_teams()
         chat_db = await self.session.get(models.Chat, chat.db_id)
         assert chat_db
         team = models.Team(
@@ -101,11 +111,13 @@ class TeamDao(BaseDAO[models.Team]):
         return team.to_dto_chat_prefetched()
 
     async def rename_team(self, team: dto.Team, new_name: str) -> None:
+        self.identities.invalidate_teams()
         await self.session.execute(
             update(models.Team).where(models.Team.id == team.id).values(name=new_name)
         )
 
     async def change_team_desc(self, team: dto.Team, new_desc: str) -> None:
+        self.identities.invalidate_teams()
         await self.session.execute(
             update(models.Team).where(models.Team.id == team.id).values(description=new_desc)
         )
@@ -168,6 +180,7 @@ class TeamDao(BaseDAO[models.Team]):
         return [game.to_dto(game.author.to_dto_user_prefetched()) for game in games]
 
     async def delete(self, team: dto.Team):
+        self.identities.invalidate_teams()
         team_db = await self._get_by_id(team.id)
         await self.session.delete(team_db)
 
@@ -71,6 +71,7 @@ class UserDao(BaseDAO[User]):
                 index_elements=(User.tg_id,), set_=kwargs, where=User.tg_id == user.tg_id
             )
             .returning(User)
+            .execution_options(populate_existing=True)
         )
         return saved_user.scalar_one().to_dto()
 
@@ -3,6 +3,7 @@ import typing
 from typing import Iterable, Sequence
 
 from sqlalchemy import select, Row, update, ScalarResult
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
@@ -35,6 +36,31 @@ class WaiverDao(BaseDAO[models.Waiver]):
     async def upsert(self, waiver: dto.Waiver):
         await self._upsert(waiver)
 
+    async def upsert_many(self, waivers: Sequence[dto.Waiver]):
+        if not waivers:
+            return
+        stmt = insert(models.Waiver).values(
+            [
+                dict(
+                    player_id=waiver.player.id,
+                    team_id=waiver.team.id,
+                    game_id=waiver.game.id,
+                    played=waiver.played,
+                )
+                for waiver in waivers
+            ]
+        )
+        await self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=(
+                    models.Waiver.game_id,
+                    models.Waiver.team_id,
+                    models.Waiver.player_id,
+                ),
+                set_={"played": stmt.excluded.played},
+            )
+        )
+
     async def _upsert(self, waiver: dto.Waiver) -> models.Waiver:
         if waiver_db := await self.get_or_none(waiver.game, waiver.player, waiver.team):
             waiver_db.played = waiver.played
@@ -146,6 +172,43 @@ class WaiverDao(BaseDAO[models.Waiver]):
             for waiver, team_player in waivers
         ]
 
+    async def get_all_played(self, game: dto.Game) -> dict[dto.Team, list[dto.VotedPlayer]]:
+        result = await self.session.execute(
+            select(models.Waiver, models.TeamPlayer)
+            .options(
+                joinedload(models.Waiver.team).options(
+                    joinedload(models.Team.chat),
+                    joinedload(models.Team.forum_team),
+                    joinedload(models.Team.captain).options(
+                        joinedload(models.Player.user), joinedload(models.Player.forum_user)
+                    ),
+                ),
+                joinedload(models.Waiver.player).options(
+                    joinedload(models.Player.user), joinedload(models.Player.forum_user)
+                ),
+            )
+            .join(models.TeamPlayer, models.Waiver.player_id == models.TeamPlayer.player_id)
+            .where(
+                models.Waiver.game_id == game.id,
+                models.Waiver.played == enums.Played.yes,
+                models.TeamPlayer.date_left.is_(None),
+            )
+            .order_by(models.Waiver.team_id, models.Waiver.id)
+        )
+        waivers: Sequence[Row[tuple[models.Waiver, models.TeamPlayer]]] = result.all()
+        teams: dict[int, dto.Team] = {}
+        played: dict[dto.Team, list[dto.VotedPlayer]] = {}
+        for waiver, team_player in waivers:
+            if waiver.team_id not in teams:
+                teams[waiver.team_id] = waiver.team.to_dto_chat_prefetched()
+            played.setdefault(teams[waiver.team_id], []).append(
+                dto.VotedPlayer(
+                    player=waiver.player.to_dto_user_prefetched(),
+                    pit=team_player.to_dto(),
+                )
+            )
+        return played
+
     async def replace_team_waiver(self, primary: dto.Team, secondary: dto.Team):
         await self.session.execute(
             update(models.Waiver)
@@ -0,0 +1,60 @@
+import asyncio
+import logging
+import uuid
+from contextlib import asynccontextmanager, suppress
+from typing import AsyncIterator
+
+from redis.asyncio.client import Redis
+from redis.exceptions import RedisError
+
+from shvatka.infrastructure.db.dao.memory.active_game import ActiveGameCache
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "active_game:changed"
+RECONNECT_INTERVAL = 1
+
+
+class ActiveGameChannel:
+    """Invalidates ActiveGameCache of every process when active game is changed"""
+
+    def __init__(self, redis: Redis, cache: ActiveGameCache) -> None:
+        self.redis = redis
+        self.cache = cache
+        # own changes are invalidated on publish, echo of them have not to drop cache again
+        self.sender = uuid.uuid4().hex
+
+    async def publish(self) -> None:
+        self.cache.invalidate()
+        await self.redis.publish(CHANNEL, self.sender)
+
+    async def listen(self) -> None:
+        while True:
+            try:
+                async with self.redis.pubsub() as pubsub:
+                    await pubsub.subscribe(CHANNEL)
+                    # changes published while we were not subscribed are lost
+                    self.cache.invalidate()
+                    async for message in pubsub.listen():
+                        if message["type"] != "message":
+                            continue
+                        if _decode(message["data"]) != self.sender:
+                            self.cache.invalidate()
+            except (RedisError, OSError) as e:
+                logger.warning("active game channel is broken, reconnecting", exc_info=e)
+                self.cache.invalidate()
+                await asyncio.sleep(RECONNECT_INTERVAL)
+
+    @asynccontextmanager
+    async def listening(self) -> AsyncIterator["ActiveGameChannel"]:
+        task = asyncio.create_task(self.listen())
+        try:
+            yield self
+        finally:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+
+
+def _decode(data: bytes | str) -> str:
+    return data.decode() if isinstance(data, bytes) else data
@@ -0,0 +1,115 @@
+import asyncio
+import logging
+import typing
+from functools import partial
+from uuid import uuid4
+
+from redis.asyncio.client import Redis
+
+from shvatka.core.models import dto
+from shvatka.core.utils.key_checker_lock import KeyCheckerLock, KeyCheckerFactory
+from shvatka.infrastructure.db.config.models.locker import LockerConfig
+from shvatka.infrastructure.db.dao.memory.key_submission import KeySubmissionCache
+
+logger = logging.getLogger(__name__)
+
+# lock is taken and fencing token is incremented in one step,
+# so every successful acquire gets its own greater token
+ACQUIRE_SCRIPT = """
+if redis.call("set", KEYS[1], ARGV[1], "NX", "PX", ARGV[2]) then
+    return redis.call("incr", KEYS[2])
+end
+return 0
+"""
+# lease can be already expired and lock can be taken by somebody else
+RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class RedisLock(KeyCheckerLock):
+    def __init__(
+        self,
+        redis: Redis,
+        name: str,
+        config: LockerConfig,
+        on_acquire: typing.Callable[[int], None] | None = None,
+        prefix: str = "key_checker",
+    ) -> None:
+        self.redis = redis
+        self.key = f"{prefix}:lock:{name}"
+        self.fence_key = f"{prefix}:fence:{name}"
+        self.lease_ms = int(config.lease.total_seconds() * 1000)
+        self.retry_interval = config.retry_interval.total_seconds()
+        self.on_acquire = on_acquire
+        self.token: str | None = None
+        self.fencing_token: int | None = None
+
+    async def acquire(self):
+        token = uuid4().hex
+        while not (
+            fencing_token := await self.redis.eval(
+                ACQUIRE_SCRIPT, 2, self.key, self.fence_key, token, self.lease_ms
+            )
+        ):
+            await asyncio.sleep(self.retry_interval)
+        self.token = token
+        self.fencing_token = int(fencing_token)
+        if self.on_acquire is not None:
+            self.on_acquire(self.fencing_token)
+
+    async def release(self):
+        if self.token is None:
+            raise RuntimeError(f"lock {self.key} is not acquired")
+        released = await self.redis.eval(RELEASE_SCRIPT, 1, self.key, self.token)
+        if not released:
+            logger.warning(
+                "lease of lock %s with fencing token %s expired before release",
+                self.key,
+                self.fencing_token,
+            )
+        self.token = None
+
+
+class RedisLockFactory(KeyCheckerFactory):
+    """
+    Locks shared between all bot processes connected to one redis.
+    Every lock is a new object, it's state lives in redis.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        config: LockerConfig,
+        key_submissions: KeySubmissionCache,
+    ) -> None:
+        self.redis = redis
+        self.config = config
+        self.key_submissions = key_submissions
+        self.team_fences: dict[int, int] = {}
+
+    def lock_globally(self) -> KeyCheckerLock:
+        return RedisLock(self.redis, "global", self.config)
+
+    def lock_team(self, team: dto.Team) -> KeyCheckerLock:
+        return RedisLock(
+            self.redis,
+            f"team:{team.id}",
+            self.config,
+            on_acquire=partial(self._check_team_fence, team.id),
+        )
+
+    def lock_player(self, player: dto.Player) -> KeyCheckerLock:
+        return RedisLock(self.redis, f"player:{player.id}", self.config)
+
+    def _check_team_fence(self, team_id: int, fencing_token: int) -> None:
+        if self.team_fences.get(team_id) != fencing_token - 1:
+            # team was locked by other process, so it could type keys there
+            self.key_submissions.invalidate_team(team_id)
+        self.team_fences[team_id] = fencing_token
+
+    def clear(self) -> None:
+        self.team_fences.clear()
@@ -10,21 +10,28 @@ logger = logging.getLogger(__name__)
 
 
 class PollDao:
+    """
+    Голоса команды хранятся в одном hash poll:{team_id} (player_id: vote),
+    команды с голосами - в set poll_teams, id сообщений с опросом - в hash msg_poll.
+    """
+
     def __init__(
         self, redis: Redis, clock: typing.Callable[[tzinfo], datetime] = datetime.now
     ) -> None:
         self.prefix = "poll"
-        self.msg_prefix = "msg_poll"
+        self.teams_key = "poll_teams"
+        self.msg_key = "msg_poll"
         self.redis = redis
         self.clock = clock
 
     async def add_player_vote(self, team_id: int, player_id: int, vote_var: str) -> None:
-        key = self._create_key(team_id=team_id, player_id=player_id)
-        await self.redis.set(key, vote_var)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(self._create_key(team_id), str(player_id), vote_var)
+            pipe.sadd(self.teams_key, team_id)
+            await pipe.execute()
 
     async def del_player_vote(self, team_id: int, player_id: int) -> None:
-        key = self._create_key(team_id=team_id, player_id=player_id)
-        await self.redis.delete(key)
+        await self.redis.hdel(self._create_key(team_id), str(player_id))
 
     async def get_dict_player_vote(self, team_id: int) -> dict[int, Played]:
         """
@@ -32,60 +39,50 @@ class PollDao:
         :param team_id:
         :return: словарь в формате player_id:vote
         """
-        return {
-            self.parse_player_id(key=key, team_id=team_id): await self._get_played(key)
-            for key in await self.get_list_of_keys_poll(team_id=team_id)
-        }
-
-    async def _get_played(self, key: str) -> Played:
-        value = await self._get(key)
-        assert value is not None
-        return Played[value]
+        votes = await self.redis.hgetall(self._create_key(team_id))
+        return {int(player_id): Played[vote.decode()] for player_id, vote in votes.items()}
 
     async def save_poll_msg_id(self, chat_id: int, game_id: int, msg_id: int) -> None:
-        key = self._create_msg_prefix(chat_id, game_id)
-        await self.redis.set(key, msg_id)
+        await self.redis.hset(self.msg_key, self._create_msg_field(chat_id, game_id), msg_id)
 
     async def get_poll_msg_id(self, chat_id: int, game_id: int) -> int | None:
-        key = self._create_msg_prefix(chat_id, game_id)
-        msg_id = await self._get(key)
+        msg_id = await self.redis.hget(self.msg_key, self._create_msg_field(chat_id, game_id))
         return None if msg_id is None else int(msg_id)
 
-    def _create_key(self, team_id: int, player_id: int) -> str:
-        return f"{self.prefix}:{team_id}:{player_id}"
-
-    def _create_msg_prefix(self, chat_id: int, game_id: int) -> str:
-        return f"{self.msg_prefix}:{chat_id}:{game_id}"
+    def _create_key(self, team_id: int) -> str:
+        return f"{self.prefix}:{team_id}"
 
-    async def get_list_of_keys_poll(self, team_id: int) -> list[str]:
-        """
+    def _create_msg_field(self, chat_id: int, game_id: int) -> str:
+        return f"{chat_id}:{game_id}"
 
-        :param team_id:
-        :return: список ключей для команды team_id в формате prefix:team_id:player_id
-        """
-        rez = await self.redis.keys(f"{self.prefix}:{team_id}:*", encoding="utf-8")
-        return rez
+    async def delete_all(self) -> None:
+        teams = await self.redis.smembers(self.teams_key)
+        keys = [self._create_key(int(team_id)) for team_id in teams]
+        deleted = await self.redis.unlink(*keys, self.teams_key, self.msg_key)
+        if not deleted:
+            return logger.warning("pool-keys to delete not found")
+        logger.warning("polls of teams %s were deleted", ", ".join(sorted(keys)))
 
-    def parse_player_id(self, key: str, team_id: int) -> int:
+    async def migrate_legacy_keys(self, batch_size: int = 1000) -> int:
         """
+        Переносит голоса из ключей poll:{team_id}:{player_id}
+        и id сообщений из ключей msg_poll:{chat_id}:{game_id} в hash-и.
 
-        :param key: ключ в формате prefix:team_id:player_id
-        :param team_id:
-        :return: player_id
+        :return: сколько ключей перенесено
         """
-        player_id = key[len(f"{self.prefix}:{team_id}:") :]
-        return int(player_id)
-
-    async def delete_all(self) -> None:
-        keys: list = await self.redis.keys(f"{self.prefix}:*")
-        keys.extend(await self.redis.keys(f"{self.msg_prefix}:*"))
-        if len(keys) == 0:
-            return logger.warning("pool-keys to delete not found")
-        logger.warning("Next keys was deleted %s", ", ".join([key.decode() for key in keys]))
-        await self.redis.delete(*keys)
-
-    async def _get(self, key: str, encoding: str = "utf-8") -> str | None:
-        value = await self.redis.get(key)
-        if value is None:
-            return None
-        return value.decode(encoding)
+        migrated = 0
+        async for key in self.redis.scan_iter(match=f"{self.prefix}:*:*", count=batch_size):
+            _, team_id, player_id = key.decode().split(":")
+            vote = await self.redis.get(key)
+            if vote is not None:
+                await self.add_player_vote(int(team_id), int(player_id), vote.decode())
+            await self.redis.unlink(key)
+            migrated += 1
+        async for key in self.redis.scan_iter(match=f"{self.msg_key}:*:*", count=batch_size):
+            _, chat_id, game_id = key.decode().split(":")
+            msg_id = await self.redis.get(key)
+            if msg_id is not None:
+                await self.save_poll_msg_id(int(chat_id), int(game_id), int(msg_id))
+            await self.redis.unlink(key)
+            migrated += 1
+        return migrated
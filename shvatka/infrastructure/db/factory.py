@@ -11,8 +11,11 @@ from sqlalchemy.ext.asyncio import (
 
 from shvatka.core.utils.key_checker_lock import KeyCheckerFactory
 from shvatka.infrastructure.db.config.models.db import DBConfig, RedisConfig
+from shvatka.infrastructure.db.config.models.locker import LockerConfig, LockerType
+from shvatka.infrastructure.db.dao.memory.key_submission import KeySubmissionCache
 from shvatka.infrastructure.db.dao.memory.level_testing import LevelTestingData
 from shvatka.infrastructure.db.dao.memory.locker import MemoryLockFactory
+from shvatka.infrastructure.db.dao.redis.locker import RedisLockFactory
 
 logger = logging.getLogger(__name__)
 
@@ -33,8 +36,17 @@ def create_session_maker(engine: AsyncEngine) -> async_sessionmaker[AsyncSession
     return pool
 
 
-def create_lock_factory() -> KeyCheckerFactory:
-    return MemoryLockFactory()
+def create_lock_factory(
+    config: LockerConfig, redis: Redis, key_submissions: KeySubmissionCache
+) -> KeyCheckerFactory:
+    logger.info("creating key checker locks for type %s", config.type_)
+    match config.type_:
+        case LockerType.memory:
+            return MemoryLockFactory()
+        case LockerType.redis:
+            return RedisLockFactory(redis=redis, config=config, key_submissions=key_submissions)
+        case _:
+            raise NotImplementedError
 
 
 def create_redis(config: RedisConfig) -> Redis:
@@ -0,0 +1,27 @@
+"""level times current index
+
+Revision ID: 241c520b9d28
+Revises: f3157300bc04
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "241c520b9d28"
+down_revision = "f3157300bc04"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix__levels_times__game_id_team_id_start_at",
+        "levels_times",
+        ["game_id", "team_id", "start_at"],
+    )
+
+
+def downgrade():
+    op.drop_index("ix__levels_times__game_id_team_id_start_at", table_name="levels_times")
@@ -0,0 +1,32 @@
+"""level scenario hash
+
+Revision ID: 5d2e8c71a4f6
+Revises: 241c520b9d28
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "5d2e8c71a4f6"
+down_revision = "241c520b9d28"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("levels", sa.Column("scenario_hash", sa.Text(), nullable=True))
+    # hash is only a version of content, it is recalculated by app on next level update
+    op.execute(
+        """
+        UPDATE levels
+        SET scenario_hash = encode(sha256(convert_to(scenario::text, 'UTF8')), 'hex')
+        """
+    )
+    op.alter_column("levels", "scenario_hash", nullable=False)
+
+
+def downgrade():
+    op.drop_column("levels", "scenario_hash")
@@ -0,0 +1,23 @@
+"""log keys game id index
+
+Revision ID: 8b1f4d26c9e3
+Revises: 5d2e8c71a4f6
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "8b1f4d26c9e3"
+down_revision = "5d2e8c71a4f6"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix__log_keys__game_id_id", "log_keys", ["game_id", "id"])
+
+
+def downgrade():
+    op.drop_index("ix__log_keys__game_id_id", table_name="log_keys")
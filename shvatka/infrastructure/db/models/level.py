@@ -1,5 +1,8 @@
+import hashlib
+import json
 import logging
 import typing
+from collections import OrderedDict
 from typing import Any
 
 from adaptix import Retort
@@ -48,6 +51,52 @@ class ScenarioField(TypeDecorator):
         return self.retort.load(value, scn.LevelScenario)
 
 
+class ScenarioCache:
+    """
+    Разобранные сценарии уровней по (id уровня, хеш содержимого),
+    чтобы неизменённый сценарий загружался из jsonb один раз за процесс.
+    """
+
+    def __init__(self, retort: Retort, maxsize: int = 2048) -> None:
+        self.retort = retort
+        self.maxsize = maxsize
+        self._scenarios: OrderedDict[tuple[int, str], scn.LevelScenario] = OrderedDict()
+
+    def load(
+        self, level_id: int | None, scenario_hash: str, raw: dict[str, Any]
+    ) -> scn.LevelScenario:
+        if level_id is None:
+            return self.retort.load(raw, scn.LevelScenario)
+        key = (level_id, scenario_hash)
+        if (scenario := self._scenarios.get(key)) is not None:
+            self._scenarios.move_to_end(key)
+            return scenario
+        scenario = self.retort.load(raw, scn.LevelScenario)
+        self._scenarios[key] = scenario
+        while len(self._scenarios) > self.maxsize:
+            self._scenarios.popitem(last=False)
+        return scenario
+
+    def dump(self, scenario: scn.LevelScenario) -> tuple[dict[str, Any], str]:
+        try:
+            dumped = self.retort.dump(scenario, scn.LevelScenario)
+        except Exception as e:
+            logger.exception("can't dump level scenario", exc_info=e)
+            raise
+        return dumped, calculate_scenario_hash(dumped)
+
+    def clear(self) -> None:
+        self._scenarios.clear()
+
+
+def calculate_scenario_hash(dumped: dict[str, Any]) -> str:
+    content = json.dumps(dumped, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+scenarios_cache = ScenarioCache(ScenarioField.retort)
+
+
 class Level(Base):
     __tablename__ = "levels"
     __mapper_args__ = {"eager_defaults": True}
@@ -66,10 +115,24 @@ class Level(Base):
         back_populates="my_levels",
     )
     number_in_game = mapped_column(Integer, nullable=True)
-    scenario: Mapped[scn.LevelScenario] = mapped_column(ScenarioField)
+    scenario_data: Mapped[dict[str, Any]] = mapped_column("scenario", JSONB)
+    scenario_hash: Mapped[str] = mapped_column(Text)
 
     __table_args__ = (UniqueConstraint("author_id", "name_id"),)
 
+    @property
+    def scenario(self) -> scn.LevelScenario:
+        parsed: tuple[str, scn.LevelScenario] | None = self.__dict__.get("_parsed_scenario")
+        if parsed is None or parsed[0] != self.scenario_hash:
+            scenario = scenarios_cache.load(self.id, self.scenario_hash, self.scenario_data)
+            parsed = self._parsed_scenario = (self.scenario_hash, scenario)
+        return parsed[1]
+
+    @scenario.setter
+    def scenario(self, value: scn.LevelScenario) -> None:
+        self.scenario_data, self.scenario_hash = scenarios_cache.dump(value)
+        self._parsed_scenario = (self.scenario_hash, value)
+
     def to_dto(self, author: dto.Player) -> dto.Level:
         return dto.Level(
             db_id=self.id,
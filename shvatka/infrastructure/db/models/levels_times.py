@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Integer, ForeignKey, DateTime, func
+from sqlalchemy import Integer, ForeignKey, DateTime, func, Index
 from sqlalchemy.orm import relationship, mapped_column, Mapped
 
 from shvatka.core.models import dto
@@ -11,6 +11,9 @@ from shvatka.infrastructure.db.models import Base
 class LevelTime(Base):
     __tablename__ = "levels_times"
     __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        Index("ix__levels_times__game_id_team_id_start_at", "game_id", "team_id", "start_at"),
+    )
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     game_id: Mapped[int] = mapped_column(ForeignKey("games.id"), nullable=False)
     game = relationship(
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Integer, ForeignKey, Text, Boolean, DateTime, func
+from sqlalchemy import Integer, ForeignKey, Text, Boolean, DateTime, func, Index
 from sqlalchemy.orm import relationship, mapped_column, Mapped
 
 from shvatka.core.models import dto, enums
@@ -11,6 +11,7 @@ from shvatka.infrastructure.db.models import Base
 class KeyTime(Base):
     __tablename__ = "log_keys"
     __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (Index("ix__log_keys__game_id_id", "game_id", "id"),)
     id = mapped_column(Integer, primary_key=True)
     player_id = mapped_column(ForeignKey("players.id"), nullable=False)
     player = relationship(
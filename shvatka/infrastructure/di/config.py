@@ -4,6 +4,7 @@ from shvatka.common import FileStorageConfig, Paths, Config
 from shvatka.common.config.models.main import WebConfig
 from shvatka.common.config.parser.paths import common_get_paths
 from shvatka.infrastructure.db.config.models.db import RedisConfig, DBConfig
+from shvatka.infrastructure.db.config.models.locker import LockerConfig
 from shvatka.infrastructure.db.config.models.storage import StorageConfig
 from shvatka.tgbot.config.models.bot import BotConfig, TgClientConfig
 from shvatka.tgbot.config.models.main import TgBotConfig
@@ -41,6 +42,10 @@ class ConfigProvider(Provider):
     def get_bot_storage_config(self, config: TgBotConfig) -> StorageConfig:
         return config.storage
 
+    @provide
+    def get_locker_config(self, config: TgBotConfig) -> LockerConfig:
+        return config.locker
+
     @provide
     def get_tg_client_config(self, config: TgBotConfig) -> TgClientConfig:
         return config.tg_client
@@ -6,7 +6,13 @@ from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession, AsyncEngine
 
 from shvatka.infrastructure.db.config.models.db import DBConfig, RedisConfig
 from shvatka.infrastructure.db.dao.holder import HolderDao
+from shvatka.infrastructure.db.dao.memory.active_game import ActiveGameCache
+from shvatka.infrastructure.db.dao.memory.file_info import FileInfoCache
+from shvatka.infrastructure.db.dao.memory.identity import IdentityCache
+from shvatka.infrastructure.db.dao.memory.key_submission import KeySubmissionCache
 from shvatka.infrastructure.db.dao.memory.level_testing import LevelTestingData
+from shvatka.infrastructure.db.dao.memory.running_game import RunningGameCache
+from shvatka.infrastructure.db.dao.redis.active_game import ActiveGameChannel
 from shvatka.infrastructure.db.factory import create_engine, create_session_maker, create_redis
 
 
@@ -16,6 +22,11 @@ class DbProvider(Provider):
     def __init__(self):
         super().__init__()
         self.level_test = LevelTestingData()
+        self.running_games = RunningGameCache()
+        self.key_submissions = KeySubmissionCache()
+        self.file_info_cache = FileInfoCache()
+        self.identities = IdentityCache()
+        self.active_game = ActiveGameCache()
 
     @provide
     async def get_engine(self, db_config: DBConfig) -> AsyncIterable[AsyncEngine]:
@@ -38,13 +49,50 @@ class DbProvider(Provider):
     def get_level_test_data(self) -> LevelTestingData:
         return self.level_test
 
+    @provide
+    def get_running_games(self) -> RunningGameCache:
+        return self.running_games
+
+    @provide
+    def get_key_submissions(self) -> KeySubmissionCache:
+        return self.key_submissions
+
+    @provide
+    def get_file_info_cache(self) -> FileInfoCache:
+        return self.file_info_cache
+
+    @provide
+    def get_identities(self) -> IdentityCache:
+        return self.identities
+
+    @provide
+    def get_active_game(self) -> ActiveGameCache:
+        return self.active_game
+
 
 class DAOProvider(Provider):
     @provide(scope=Scope.REQUEST)
     async def get_dao(
-        self, session: AsyncSession, redis: Redis, level_test: LevelTestingData
+        self,
+        session: AsyncSession,
+        redis: Redis,
+        level_test: LevelTestingData,
+        running_games: RunningGameCache,
+        key_submissions: KeySubmissionCache,
+        file_info_cache: FileInfoCache,
+        identities: IdentityCache,
+        active_game: ActiveGameChannel,
     ) -> HolderDao:
-        return HolderDao(session=session, redis=redis, level_test=level_test)
+        return HolderDao(
+            session=session,
+            redis=redis,
+            level_test=level_test,
+            running_games=running_games,
+            key_submissions=key_submissions,
+            file_info_cache=file_info_cache,
+            identities=identities,
+            active_game=active_game,
+        )
 
 
 class RedisProvider(Provider):
@@ -54,3 +102,10 @@ class RedisProvider(Provider):
     async def get_redis(self, config: RedisConfig) -> AsyncIterable[Redis]:
         async with create_redis(config) as redis:
             yield redis
+
+    @provide
+    async def get_active_game_channel(
+        self, redis: Redis, cache: ActiveGameCache
+    ) -> AsyncIterable[ActiveGameChannel]:
+        async with ActiveGameChannel(redis, cache).listening() as channel:
+            yield channel
@@ -4,6 +4,7 @@ from shvatka.core.games.interactors import (
     GameFileReaderInteractor,
     GamePlayReaderInteractor,
     GameKeysReaderInteractor,
+    GameKeysPageReaderInteractor,
     GameStatReaderInteractor,
 )
 from shvatka.core.games.adapters import (
@@ -26,6 +27,7 @@ class GamePlayProvider(Provider):
         return GameKeysReaderImpl(dao)
 
     get_game_keys_interactor = provide(GameKeysReaderInteractor)
+    get_game_keys_page_interactor = provide(GameKeysPageReaderInteractor)
 
     @provide
     def get_game_state(self, dao: HolderDao) -> GameStatReader:
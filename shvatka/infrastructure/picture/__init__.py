@@ -1,4 +1,5 @@
 from .picture import paint_it
+from .renderer import ChartRenderer, create_chart_renderer
 from .results_painter import ResultsPainter
 
-__all__ = ["paint_it", "ResultsPainter"]
+__all__ = ["paint_it", "ChartRenderer", "create_chart_renderer", "ResultsPainter"]
@@ -3,10 +3,11 @@ import pprint
 from datetime import datetime, timedelta
 from io import BytesIO
 from itertools import pairwise
+from pathlib import Path
 from typing import NamedTuple, BinaryIO
 
 import matplotlib.dates as mdates
-from matplotlib import pyplot as plt
+from matplotlib.figure import Figure
 from matplotlib.ticker import MultipleLocator
 
 from shvatka.common.data_examples import game_stat_example, game_example
@@ -21,35 +22,61 @@ class PlotData(NamedTuple):
     ordinate: list[float]
 
 
+class ChartData(NamedTuple):
+    """everything needed for painting, small and picklable to send it to other process"""
+
+    title: str
+    levels_count: int
+    start_at: datetime
+    lines: dict[str, PlotData]
+
+
 def paint_it(stat: dto.GameStat, game: dto.FullGame) -> BinaryIO:
+    return BytesIO(render(prepare(stat, game)))
+
+
+def prepare(stat: dto.GameStat, game: dto.FullGame) -> ChartData:
+    assert game.start_at
     converted = convert(stat, game)
     logger.debug("converted \n%s\nto\n%s\n", pprint.pformat(stat), pprint.pformat(converted))
-    plot_it(converted, game)
+    return ChartData(
+        title=game.name,
+        levels_count=len(game.levels),
+        start_at=game.start_at,
+        lines=converted,
+    )
+
+
+def render(data: ChartData) -> bytes:
+    # pyplot keeps global state, so only object-oriented api is used here
+    fig = Figure()
+    plot_it(data, fig)
     result = BytesIO()
-    plt.savefig(result, format="png")
-    plt.close()
-    result.seek(0)
-    return result
+    fig.savefig(result, format="png")
+    return result.getvalue()
 
 
-def plot_it(converted: dict[str, PlotData], game: dto.FullGame):
-    fig, ax = plt.subplots()
-    for team, data in converted.items():
-        plt.plot(*data, label=team)  # type: ignore[arg-type]
+def plot_it(data: ChartData, fig: Figure) -> None:
+    ax = fig.subplots()
+    for team, plot_data in data.lines.items():
+        ax.plot(*plot_data, label=team)  # type: ignore[arg-type]
     ax.legend()
-    plt.grid()
-    plt.ylim([1, len(game.levels) + 1])
-    plt.xlim(
-        game.start_at,
-        max([x for plotdata in converted.values() for x in plotdata.abscissa])
-        + timedelta(minutes=5),
+    ax.grid()
+    ax.set_ylim(1, data.levels_count + 1)
+    last_at = max(
+        [x for plot_data in data.lines.values() for x in plot_data.abscissa],
+        default=data.start_at,
+    )
+    ax.set_xlim(
+        mdates.date2num(data.start_at),
+        mdates.date2num(last_at + timedelta(minutes=5)),
     )
-    plt.xticks(rotation="vertical")
+    ax.tick_params(axis="x", labelrotation=90)
     ax.yaxis.set_major_locator(MultipleLocator(1))
     ax.set_ylabel("Уровень")
     ax.set_xlabel("Время")
     ax.xaxis.set_major_formatter(mdates.DateFormatter("%H:%M", tz=tz_game))
-    ax.set_title(game.name)
+    ax.set_title(data.title)
 
 
 def convert(stat: dto.GameStat, game: dto.FullGame) -> dict[str, PlotData]:
@@ -103,5 +130,4 @@ def add_next(
 
 
 if __name__ == "__main__":
-    plot_it(convert(game_stat_example, game_example), game_example)
-    plt.show()
+    Path("results.png").write_bytes(render(prepare(game_stat_example, game_example)))
@@ -0,0 +1,64 @@
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+from shvatka.core.models import dto
+from shvatka.infrastructure.picture.picture import ChartData, prepare, render
+
+logger = logging.getLogger(__name__)
+
+ChartKey = tuple[int, str]
+
+
+class ChartRenderer:
+    """
+    Paints results charts in other processes, so painting doesn't block event loop.
+    Png is cached by game and hash of stat, concurrent requests of same chart
+    wait for one painting.
+    """
+
+    def __init__(self, executor: Executor, maxsize: int = 64) -> None:
+        self.executor = executor
+        self.maxsize = maxsize
+        self._cache: OrderedDict[ChartKey, bytes] = OrderedDict()
+        self._rendering: dict[ChartKey, asyncio.Future[bytes]] = {}
+
+    async def render(self, stat: dto.GameStat, game: dto.FullGame) -> bytes:
+        data = prepare(stat, game)
+        key = (game.id, get_hash(data))
+        if (png := self._cache.get(key)) is not None:
+            self._cache.move_to_end(key)
+            return png
+        if key not in self._rendering:
+            self._rendering[key] = asyncio.ensure_future(self._render(key, data))
+        # one of waiters can be cancelled, but painting is needed for others
+        return await asyncio.shield(self._rendering[key])
+
+    async def _render(self, key: ChartKey, data: ChartData) -> bytes:
+        loop = asyncio.get_running_loop()
+        try:
+            png = await loop.run_in_executor(self.executor, render, data)
+        finally:
+            del self._rendering[key]
+        self._cache[key] = png
+        while len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+        return png
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def get_hash(data: ChartData) -> str:
+    return hashlib.sha256(repr(data).encode()).hexdigest()
+
+
+def create_chart_renderer(workers: int = 2) -> ChartRenderer:
+    # fork of process with running event loop and threads is not safe
+    executor = ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    )
+    return ChartRenderer(executor)
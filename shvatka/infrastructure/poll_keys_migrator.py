@@ -0,0 +1,34 @@
+import asyncio
+import logging
+
+from dishka import make_async_container
+from redis.asyncio import Redis
+
+from shvatka.common import setup_logging
+from shvatka.common.config.parser.paths import common_get_paths
+from shvatka.infrastructure.db.dao import PollDao
+from shvatka.infrastructure.di import get_providers
+
+logger = logging.getLogger(__name__)
+
+
+async def main():
+    paths = common_get_paths("BOT_PATH")
+
+    setup_logging(paths)
+    dishka = make_async_container(
+        *get_providers("BOT_PATH"),
+    )
+    try:
+        migrated = await PollDao(redis=await dishka.get(Redis)).migrate_legacy_keys()
+        logger.info("migrated %s poll keys", migrated)
+    finally:
+        await dishka.close()
+
+
+def run():
+    asyncio.run(main())
+
+
+if __name__ == "__main__":
+    run()
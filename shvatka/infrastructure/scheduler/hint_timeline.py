@@ -0,0 +1,250 @@
+import asyncio
+import json
+import logging
+from contextlib import asynccontextmanager, suppress
+from datetime import datetime, timedelta, tzinfo
+from typing import AsyncIterator, Awaitable, Callable, NamedTuple
+from uuid import uuid4
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from shvatka.core.utils.datetime_utils import tz_utc
+
+logger = logging.getLogger(__name__)
+
+HINTS_KEY = "SH.hint_timeline"
+POLL_INTERVAL = 1.0
+RECONNECT_INTERVAL = 5.0
+RETRY_DELAY = timedelta(seconds=10)
+HEARTBEAT_TTL = timedelta(seconds=30)
+SHUTDOWN_TIMEOUT = 30.0
+MAX_BATCHES_IN_FLIGHT = 8
+
+# due hints are moved to processing set of worker in one step,
+# so they are not lost if worker dies before handler is finished
+CLAIM_SCRIPT = """
+local due = redis.call("zrangebyscore", KEYS[1], "-inf", ARGV[1], "WITHSCORES")
+for i = 1, #due, 2 do
+    redis.call("zadd", KEYS[2], due[i + 1], due[i])
+end
+redis.call("zremrangebyscore", KEYS[1], "-inf", ARGV[1])
+return due
+"""
+# processing set of alive worker must not be touched
+REQUEUE_SCRIPT = """
+if redis.call("exists", KEYS[3]) == 1 then
+    return 0
+end
+local claimed = redis.call("zrange", KEYS[1], 0, -1, "WITHSCORES")
+for i = 1, #claimed, 2 do
+    redis.call("zadd", KEYS[2], claimed[i + 1], claimed[i])
+end
+redis.call("del", KEYS[1])
+return #claimed / 2
+"""
+
+
+class TimelineHint(NamedTuple):
+    game_id: int
+    level_id: int
+    team_id: int
+    hint_number: int
+    lt_id: int
+
+    def dump(self) -> str:
+        return json.dumps(self)
+
+    @classmethod
+    def load(cls, raw: bytes | str) -> "TimelineHint":
+        return cls(*json.loads(raw))
+
+
+HintsHandler = Callable[[list[TimelineHint]], Awaitable[None]]
+
+
+class HintTimeline:
+    """
+    Запланированные подсказки всех команд в одном sorted set Redis (score - время отправки).
+    Один цикл просыпается к ближайшей подсказке и отдаёт обработчику сразу все наступившие.
+    Подсказки могут добавлять и другие процессы, поэтому set перечитывается
+    не реже чем раз в poll_interval.
+
+    Каждая пачка обрабатывается в отдельной задаче (не больше max_batches одновременно),
+    так что медленная пачка не задерживает следующие.
+    Наступившие подсказки переносятся в processing set воркера и удаляются
+    только после обработки. Processing set-ы воркеров без heartbeat
+    (упавших) возвращаются в очередь при старте и периодически.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        handler: HintsHandler,
+        key: str = HINTS_KEY,
+        poll_interval: float = POLL_INTERVAL,
+        clock: Callable[[tzinfo], datetime] = datetime.now,
+        worker_id: str | None = None,
+        retry_delay: timedelta = RETRY_DELAY,
+        heartbeat_ttl: timedelta = HEARTBEAT_TTL,
+        shutdown_timeout: float = SHUTDOWN_TIMEOUT,
+        max_batches: int = MAX_BATCHES_IN_FLIGHT,
+    ) -> None:
+        self.redis = redis
+        self.handler = handler
+        self.key = key
+        self.poll_interval = poll_interval
+        self.clock = clock
+        self.worker_id = worker_id or uuid4().hex
+        self.retry_delay = retry_delay
+        self.heartbeat_ttl = heartbeat_ttl
+        self.shutdown_timeout = shutdown_timeout
+        self.processing_key = self._processing_key(self.worker_id)
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._slots = asyncio.Semaphore(max_batches)
+        self._handling: set[asyncio.Task[None]] = set()
+
+    async def add(self, hint: TimelineHint, run_at: datetime) -> None:
+        await self.redis.zadd(self.key, {hint.dump(): run_at.timestamp()})
+        self._wakeup.set()
+
+    async def pop_due(self) -> list[TimelineHint]:
+        """claim due hints, they have to be acked or released after handling"""
+        now = self.clock(tz_utc).timestamp()
+        due = await self.redis.eval(CLAIM_SCRIPT, 2, self.key, self.processing_key, now)
+        return [TimelineHint.load(raw) for raw in due[::2]]
+
+    async def ack(self, hints: list[TimelineHint]) -> None:
+        if hints:
+            await self.redis.zrem(self.processing_key, *(hint.dump() for hint in hints))
+
+    async def release(self, hints: list[TimelineHint], run_at: datetime) -> None:
+        if not hints:
+            return
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.zadd(self.key, {hint.dump(): run_at.timestamp() for hint in hints})
+            pipe.zrem(self.processing_key, *(hint.dump() for hint in hints))
+            await pipe.execute()
+
+    async def requeue_abandoned(self) -> int:
+        """return to timeline hints claimed by dead workers"""
+        requeued = 0
+        async for raw_key in self.redis.scan_iter(match=self._processing_key("*")):
+            key = raw_key.decode()
+            worker_id = key.removeprefix(self._processing_key(""))
+            if worker_id == self.worker_id:
+                continue
+            requeued += await self.redis.eval(
+                REQUEUE_SCRIPT, 3, key, self.key, self._heartbeat_key(worker_id)
+            )
+        if requeued:
+            logger.warning("%s hints of dead workers returned to timeline", requeued)
+            self._wakeup.set()
+        return requeued
+
+    async def heartbeat(self) -> None:
+        await self.redis.set(
+            self._heartbeat_key(self.worker_id),
+            1,
+            px=int(self.heartbeat_ttl.total_seconds() * 1000),
+        )
+
+    async def wait_due(self) -> None:
+        self._wakeup.clear()
+        first = await self.redis.zrange(self.key, 0, 0, withscores=True)
+        delay = self.poll_interval
+        if first:
+            delay = min(delay, first[0][1] - self.clock(tz_utc).timestamp())
+        if delay <= 0:
+            return
+        with suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(self._wakeup.wait(), delay)
+
+    async def handle(self, due: list[TimelineHint]) -> None:
+        try:
+            await self.handler(due)
+        except Exception as e:
+            logger.error("batch of %s hints failed, will be retried", len(due), exc_info=e)
+            await self.release(due, self.clock(tz_utc) + self.retry_delay)
+        else:
+            await self.ack(due)
+
+    async def run(self) -> None:
+        while not self._stopping:
+            try:
+                await self.wait_due()
+                if self._stopping:
+                    return
+                await self._slots.acquire()
+                try:
+                    due = await self.pop_due()
+                except BaseException:
+                    self._slots.release()
+                    raise
+                if due:
+                    self._dispatch(due)
+                else:
+                    self._slots.release()
+            except (RedisError, OSError) as e:
+                logger.warning("hint timeline is broken, reconnecting", exc_info=e)
+                await asyncio.sleep(RECONNECT_INTERVAL)
+
+    def _dispatch(self, due: list[TimelineHint]) -> None:
+        task = asyncio.create_task(self.handle(due))
+        self._handling.add(task)
+        task.add_done_callback(self._handled)
+
+    def _handled(self, task: asyncio.Task[None]) -> None:
+        self._handling.discard(task)
+        self._slots.release()
+        if not task.cancelled() and (e := task.exception()) is not None:
+            # hints stay in processing set and are requeued after restart
+            logger.warning("can't ack or release handled hints", exc_info=e)
+
+    async def _finish(self, task: asyncio.Task[None]) -> None:
+        await task
+        while self._handling:
+            await asyncio.wait(self._handling)
+
+    async def keep_alive(self) -> None:
+        interval = self.heartbeat_ttl.total_seconds() / 3
+        while True:
+            try:
+                await self.heartbeat()
+                await self.requeue_abandoned()
+            except (RedisError, OSError) as e:
+                logger.warning("can't refresh hint timeline heartbeat", exc_info=e)
+            await asyncio.sleep(interval)
+
+    @asynccontextmanager
+    async def running(self) -> AsyncIterator["HintTimeline"]:
+        self._stopping = False
+        await self.heartbeat()
+        await self.requeue_abandoned()
+        keep_alive = asyncio.create_task(self.keep_alive())
+        task = asyncio.create_task(self.run())
+        try:
+            yield self
+        finally:
+            # in-flight batches are finished, claimed hints are requeued by others otherwise
+            self._stopping = True
+            self._wakeup.set()
+            try:
+                await asyncio.wait_for(asyncio.shield(self._finish(task)), self.shutdown_timeout)
+            except TimeoutError:
+                task.cancel()
+                for handling in self._handling:
+                    handling.cancel()
+                await asyncio.gather(task, *self._handling, return_exceptions=True)
+            keep_alive.cancel()
+            with suppress(asyncio.CancelledError):
+                await keep_alive
+            with suppress(RedisError, OSError):
+                await self.redis.delete(self._heartbeat_key(self.worker_id))
+
+    def _processing_key(self, worker_id: str) -> str:
+        return f"{self.key}:processing:{worker_id}"
+
+    def _heartbeat_key(self, worker_id: str) -> str:
+        return f"{self.key}:worker:{worker_id}"
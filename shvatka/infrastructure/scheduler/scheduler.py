@@ -1,4 +1,5 @@
 import logging
+from contextlib import AsyncExitStack
 from datetime import datetime
 
 from apscheduler.executors.asyncio import AsyncIOExecutor
@@ -11,7 +12,10 @@ from shvatka.core.interfaces.scheduler import Scheduler, LevelTestScheduler
 from shvatka.core.models import dto
 from shvatka.core.utils.datetime_utils import tz_utc
 from shvatka.infrastructure.db.config.models.db import RedisConfig
+from shvatka.infrastructure.db.factory import create_redis
 from shvatka.infrastructure.scheduler.context import ScheduledContextHolder
+from shvatka.infrastructure.scheduler.hint_timeline import HintTimeline, TimelineHint
+from shvatka.infrastructure.scheduler.wrappers import send_hints_wrapper
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +42,9 @@ class ApScheduler(Scheduler, LevelTestScheduler):
             job_defaults=job_defaults,
             executors={"default": self.executor},
         )
+        self.redis = create_redis(redis_config)
+        self.hint_timeline = HintTimeline(self.redis, send_hints_wrapper)
+        self.exit_stack = AsyncExitStack()
 
     async def plain_prepare(self, game: dto.Game):
         self.scheduler.add_job(
@@ -49,6 +56,15 @@ class ApScheduler(Scheduler, LevelTestScheduler):
             id=_prepare_game_key(game),
             name="plaint_prepare_game",
         )
+        self.scheduler.add_job(
+            func="shvatka.infrastructure.scheduler.wrappers:warm_up_files_wrapper",
+            kwargs={"game_id": game.id, "author_id": game.author.id},
+            trigger="date",
+            run_date=game.files_warm_up_at.astimezone(tz=tz_utc),
+            timezone=tz_utc,
+            id=_warm_up_files_key(game),
+            name="warm_up_files",
+        )
 
     async def plain_start(self, game: dto.Game):
         assert game.start_at
@@ -72,6 +88,15 @@ class ApScheduler(Scheduler, LevelTestScheduler):
                 game.id,
                 exc_info=e,
             )
+        try:
+            self.scheduler.remove_job(job_id=_warm_up_files_key(game))
+        except JobLookupError as e:
+            logger.error(
+                "can't remove job %s for warming up files of game %s",
+                _warm_up_files_key(game),
+                game.id,
+                exc_info=e,
+            )
         try:
             self.scheduler.remove_job(job_id=_start_game_key(game))
         except JobLookupError as e:
@@ -87,18 +112,16 @@ class ApScheduler(Scheduler, LevelTestScheduler):
         lt_id: int,
         run_at: datetime,
     ):
-        self.scheduler.add_job(
-            func="shvatka.infrastructure.scheduler.wrappers:send_hint_wrapper",
-            kwargs={
-                "level_id": level.db_id,
-                "team_id": team.id,
-                "hint_number": hint_number,
-                "lt_id": lt_id,
-            },
-            trigger="date",
-            run_date=run_at,
-            timezone=tz_utc,
-            name="plain_hint",
+        assert level.game_id is not None
+        await self.hint_timeline.add(
+            TimelineHint(
+                game_id=level.game_id,
+                level_id=level.db_id,
+                team_id=team.id,
+                hint_number=hint_number,
+                lt_id=lt_id,
+            ),
+            run_at=run_at,
         )
 
     async def plain_test_hint(
@@ -123,8 +146,11 @@ class ApScheduler(Scheduler, LevelTestScheduler):
 
     async def start(self):
         self.scheduler.start()
+        await self.exit_stack.enter_async_context(self.hint_timeline.running())
 
     async def close(self):
+        await self.exit_stack.aclose()
+        await self.redis.aclose()
         self.scheduler.shutdown()
         self.executor.shutdown()
         self.job_store.shutdown()
@@ -134,5 +160,9 @@ def _prepare_game_key(game: dto.Game) -> str:
     return f"game-{game.id}-prepare"
 
 
+def _warm_up_files_key(game: dto.Game) -> str:
+    return f"game-{game.id}-warm-up-files"
+
+
 def _start_game_key(game: dto.Game) -> str:
     return f"game-{game.id}-start"
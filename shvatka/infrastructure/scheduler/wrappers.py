@@ -1,16 +1,28 @@
+import logging
+
 from dishka.integrations.base import FromDishka
 
-from shvatka.core.views.game import GameViewPreparer, GameView, GameLogWriter
+from shvatka.core.interfaces.clients.file_storage import FileGateway
+from shvatka.core.views.game import GameViewPreparer, GameView, GameLogWriter, OrgNotifier
 from shvatka.core.views.level import LevelView
 from shvatka.infrastructure.db.dao.holder import HolderDao
 from shvatka.infrastructure.scheduler.context import inject
+from shvatka.infrastructure.scheduler.hint_timeline import TimelineHint
 from shvatka.core.interfaces.scheduler import LevelTestScheduler, Scheduler
 from shvatka.core.models import dto
-from shvatka.core.services.game_play import prepare_game, start_game, send_hint
+from shvatka.core.services.game_play import (
+    prepare_game,
+    start_game,
+    send_hint,
+    send_hints,
+    warm_up_files,
+)
 from shvatka.core.services.level_testing import send_testing_level_hint
 from shvatka.core.services.organizers import get_by_player
 from shvatka.tgbot.views.bot_alert import BotAlert
 
+logger = logging.getLogger(__name__)
+
 
 @inject
 async def prepare_game_wrapper(
@@ -28,6 +40,29 @@ async def prepare_game_wrapper(
     )
 
 
+@inject
+async def warm_up_files_wrapper(
+    game_id: int,
+    author_id: int,
+    dao: FromDishka[HolderDao],
+    file_gateway: FromDishka[FileGateway],
+    org_notifier: FromDishka[OrgNotifier],
+    alerter: FromDishka[BotAlert],
+) -> None:
+    try:
+        game = await dao.game.get_full(game_id)
+        assert author_id == game.author.id
+        await warm_up_files(
+            game=game,
+            dao=dao.files_warm_up,
+            file_gateway=file_gateway,
+            org_notifier=org_notifier,
+        )
+    except Exception as e:
+        await alerter.alert(f"files of game {game_id} not warmed up because of {e!s}")
+        raise
+
+
 @inject
 async def start_game_wrapper(
     game_id: int,
@@ -65,10 +100,12 @@ async def send_hint_wrapper(
     alerter: FromDishka[BotAlert],
 ):
     try:
-        level = await dao.level.get_by_id(level_id)
-        team = await dao.team.get_by_id(team_id)
         game = await dao.game.get_active_game()
         assert game is not None
+        level = (await dao.game.get_running(game.id)).get_level_by_db_id(level_id)
+        if level is None:
+            level = await dao.level.get_by_id(level_id)
+        team = await dao.team.get_by_id(team_id)
 
         await send_hint(
             level=level,
@@ -85,6 +122,52 @@ async def send_hint_wrapper(
         raise
 
 
+@inject
+async def send_hints_wrapper(
+    due: list[TimelineHint],
+    dao: FromDishka[HolderDao],
+    game_view: FromDishka[GameView],
+    scheduler: FromDishka[Scheduler],
+    alerter: FromDishka[BotAlert],
+):
+    try:
+        game = await dao.game.get_active_game()
+        if game is None:
+            logger.warning("skip %s hints, there is no active game", len(due))
+            return
+        if skipped := [hint for hint in due if hint.game_id != game.id]:
+            logger.warning("skip %s hints of not active games", len(skipped))
+        running = await dao.game.get_running(game.id)
+        scheduled = []
+        for hint in due:
+            if hint.game_id != game.id:
+                continue
+            level = running.get_level_by_db_id(hint.level_id)
+            if level is None:
+                level = await dao.level.get_by_id(hint.level_id)
+            scheduled.append(
+                dto.ScheduledHint(
+                    level=level,
+                    team_id=hint.team_id,
+                    hint_number=hint.hint_number,
+                    lt_id=hint.lt_id,
+                )
+            )
+        await send_hints(
+            scheduled=scheduled,
+            game=game,
+            dao=dao.level_time,
+            view=game_view,
+            scheduler=scheduler,
+        )
+    except ExceptionGroup as e:
+        # other hints of batch are already sent, so batch must not be retried
+        await alerter.alert(f"{len(e.exceptions)} hints not sent because of {e.exceptions[0]!s}")
+    except Exception as e:
+        await alerter.alert(f"{len(due)} hints not sent because of {e!s}, will be retried")
+        raise
+
+
 @inject
 async def send_hint_for_testing_wrapper(
     level_id: int,
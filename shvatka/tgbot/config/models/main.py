@@ -3,6 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 
 from shvatka.common.config.models.main import Config
+from shvatka.infrastructure.db.config.models.locker import LockerConfig
 from shvatka.infrastructure.db.config.models.storage import StorageConfig
 from shvatka.tgbot.config.models.bot import BotConfig, TgClientConfig
 
@@ -12,6 +13,7 @@ class TgBotConfig(Config):
     bot: BotConfig
     storage: StorageConfig
     tg_client: TgClientConfig
+    locker: LockerConfig
 
     @classmethod
     def from_base(
@@ -20,6 +22,7 @@ class TgBotConfig(Config):
         bot: BotConfig,
         storage: StorageConfig,
         tg_client: TgClientConfig,
+        locker: LockerConfig,
     ):
         return cls(
             paths=base.paths,
@@ -28,6 +31,7 @@ class TgBotConfig(Config):
             bot=bot,
             storage=storage,
             tg_client=tg_client,
+            locker=locker,
             file_storage_config=base.file_storage_config,
             app=base.app,
             web=base.web,
@@ -3,6 +3,7 @@ from dataclass_factory import Factory, Schema, NameStyle
 from shvatka.common.config.models.paths import Paths
 from shvatka.common.config.parser.config_file_reader import read_config
 from shvatka.common.config.parser.main import load_config as load_common_config
+from shvatka.infrastructure.db.config.parser.locker import load_locker_config
 from shvatka.infrastructure.db.config.parser.storage import load_storage_config
 from shvatka.tgbot.config.models.bot import TgClientConfig, BotConfig
 from shvatka.tgbot.config.models.main import TgBotConfig
@@ -18,4 +19,5 @@ def load_config(paths: Paths) -> TgBotConfig:
         bot=bot_config,
         storage=load_storage_config(config_dct["storage"]),
         tg_client=TgClientConfig(bot_token=bot_config.token),
+        locker=load_locker_config(config_dct.get("locker")),
     )
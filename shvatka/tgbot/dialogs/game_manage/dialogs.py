@@ -44,6 +44,7 @@ from .handlers import (
     show_my_game_orgs,
     show_my_zip_scn,
     get_excel_results_handler,
+    get_season_excel_results_handler,
     to_publish_game_forum,
     complete_game_handler,
 )
@@ -101,6 +102,11 @@ games = Dialog(
             id="game_zip_scn",
             on_click=show_zip_scn,
         ),
+        Button(
+            Const("📶Игры сезона таблицей"),
+            id="season_as_excel",
+            on_click=get_season_excel_results_handler,
+        ),
         SwitchTo(
             Const("Сценарий игры в tg"),
             id="game_scn_channel",
@@ -1,10 +1,11 @@
 import asyncio
+import tempfile
 from datetime import date, datetime, time
 from io import BytesIO
 from typing import Any
 
 from adaptix import Retort
-from aiogram.types import CallbackQuery, Message, BufferedInputFile
+from aiogram.types import CallbackQuery, Message, BufferedInputFile, FSInputFile
 from aiogram_dialog import DialogManager
 from aiogram_dialog.widgets.kbd import Button
 
@@ -12,9 +13,14 @@ from shvatka.core.interfaces.clients.file_storage import FileGateway
 from shvatka.core.interfaces.scheduler import Scheduler
 from shvatka.core.models import dto
 from shvatka.core.services import game
-from shvatka.core.services.game import rename_game, get_game, get_full_game, complete_game
-from shvatka.core.services.game_stat import get_game_stat
-from shvatka.core.services.scenario.scn_zip import pack_scn
+from shvatka.core.services.game import (
+    rename_game,
+    get_game,
+    get_full_game,
+    complete_game,
+)
+from shvatka.core.services.game_stat import get_game_stat, get_season_stat
+from shvatka.core.services.scenario.scn_zip import write_package
 from shvatka.core.utils.datetime_utils import TIME_FORMAT, tz_game
 from shvatka.core.views.game import GameLogWriter, GameLogEvent, GameLogType
 from shvatka.infrastructure.crawler.game_scn.uploader.forum_scenario_uploader import upload
@@ -22,7 +28,7 @@ from shvatka.infrastructure.crawler.game_scn.uploader.game_mapper import map_gam
 from shvatka.infrastructure.db.dao.holder import HolderDao
 from shvatka.tgbot import states
 from shvatka.tgbot.views.jinja_filters import datetime_filter
-from shvatka.tgbot.views.results.level_times import export_results
+from shvatka.tgbot.views.results.level_times import export_results, export_season_results
 
 
 async def select_my_game(c: CallbackQuery, widget: Any, manager: DialogManager, item_id: str):
@@ -82,10 +88,13 @@ async def common_show_zip(c: CallbackQuery, game_id: int, manager: DialogManager
     dao: HolderDao = manager.middleware_data["dao"]
     retort: Retort = manager.middleware_data["retort"]
     file_gateway: FileGateway = manager.middleware_data["file_gateway"]
-    game_ = await game.get_game_package(game_id, player, dao.game_packager, retort, file_gateway)
-    zip_ = pack_scn(game_)
+    package = await game.get_game_package(game_id, player, dao.game_packager, retort)
     assert isinstance(c.message, Message)
-    await c.message.answer_document(BufferedInputFile(file=zip_.read(), filename="scenario.zip"))
+    # zip is written to disk and uploaded from there, so files contents don't stay in memory
+    with tempfile.NamedTemporaryFile(suffix=".zip") as zip_:
+        await write_package(package, zip_, file_gateway)
+        zip_.flush()
+        await c.message.answer_document(FSInputFile(zip_.name, filename="scenario.zip"))
 
 
 async def rename_game_handler(m: Message, dialog: Any, dialog_manager: DialogManager):
@@ -204,11 +213,28 @@ async def get_excel_results_handler(c: CallbackQuery, widget: Button, manager: D
     full_game = await get_full_game(id_=game_id, author=author, dao=dao.game)
     game_stat = await get_game_stat(game=full_game, player=author, dao=dao.game_stat)
     file = BytesIO()
-    export_results(game=full_game, game_stat=game_stat, file=file)
-    file.seek(0)
+    await asyncio.to_thread(export_results, game=full_game, game_stat=game_stat, file=file)
     assert isinstance(c.message, Message)
     await c.message.answer_document(
-        document=BufferedInputFile(file=file.read(), filename=f"{full_game.name}.xlsx"),
+        document=BufferedInputFile(file=file.getvalue(), filename=f"{full_game.name}.xlsx"),
+    )
+    file.close()
+
+
+async def get_season_excel_results_handler(
+    c: CallbackQuery, widget: Button, manager: DialogManager
+):
+    await c.answer()
+    dao: HolderDao = manager.middleware_data["dao"]
+    game_ = await get_game(manager.dialog_data["game_id"], dao=dao.game)
+    results = await get_season_stat(game_, dao.season_stat)
+    file = BytesIO()
+    await asyncio.to_thread(export_season_results, results, file)
+    assert isinstance(c.message, Message)
+    assert game_.start_at is not None
+    season = game_.start_at.astimezone(tz_game).year
+    await c.message.answer_document(
+        document=BufferedInputFile(file=file.getvalue(), filename=f"results_{season}.xlsx"),
     )
     file.close()
 
@@ -30,7 +30,7 @@ async def check_key_handler(
     org_notifier: FromDishka[OrgNotifier],
     game_log: FromDishka[GameLogWriter],
 ):
-    full_game = await dao.game.get_full(game.id)
+    full_game = await dao.game.get_running(game.id)
     key_processor = KeyProcessor(dao=dao.game_player, game=full_game, locker=locker)
     await check_key(
         key=key,
@@ -1,5 +1,5 @@
 import logging
-from typing import AsyncIterable
+from typing import AsyncIterable, Iterable
 
 from aiogram import Dispatcher, Bot
 from aiogram.fsm.storage.base import BaseStorage, BaseEventIsolation
@@ -16,13 +16,16 @@ from shvatka.core.interfaces.clients.file_storage import FileStorage
 from shvatka.core.utils.key_checker_lock import KeyCheckerFactory
 from shvatka.core.views.game import GameLogWriter, GameView, GameViewPreparer, OrgNotifier
 from shvatka.core.views.level import LevelView
+from shvatka.infrastructure.db.config.models.locker import LockerConfig
 from shvatka.infrastructure.db.config.models.storage import StorageConfig, StorageType
 from shvatka.infrastructure.db.dao.holder import HolderDao
+from shvatka.infrastructure.db.dao.memory.key_submission import KeySubmissionCache
 from shvatka.infrastructure.db.factory import (
     create_redis,
     create_lock_factory,
 )
 from shvatka.infrastructure.di import get_providers
+from shvatka.infrastructure.picture import ChartRenderer, create_chart_renderer
 from shvatka.infrastructure.scheduler.factory import SchedulerProvider
 from shvatka.tgbot.config.models.bot import BotConfig, TgClientConfig
 from shvatka.tgbot.handlers import setup_handlers
@@ -33,6 +36,7 @@ from shvatka.tgbot.views.game import GameBotLog, BotView, BotOrgNotifier
 from shvatka.tgbot.views.hint_factory.hint_content_resolver import HintContentResolver
 from shvatka.tgbot.views.hint_sender import HintSender
 from shvatka.tgbot.views.level_testing import LevelBotView
+from shvatka.tgbot.views.send_limiter import SendLimiter
 
 logger = logging.getLogger(__name__)
 
@@ -75,8 +79,10 @@ class LockProvider(Provider):
     scope = Scope.APP
 
     @provide
-    def get_lock_factory(self) -> KeyCheckerFactory:
-        return create_lock_factory()
+    def get_lock_factory(
+        self, config: LockerConfig, redis: Redis, key_submissions: KeySubmissionCache
+    ) -> KeyCheckerFactory:
+        return create_lock_factory(config=config, redis=redis, key_submissions=key_submissions)
 
 
 class DpProvider(Provider):
@@ -148,6 +154,16 @@ class GameToolsProvider(Provider):
     def get_org_notifier(self, bot: Bot) -> OrgNotifier:
         return BotOrgNotifier(bot=bot)
 
+    @provide(scope=Scope.APP)
+    def get_send_limiter(self) -> SendLimiter:
+        return SendLimiter()
+
+    @provide(scope=Scope.APP)
+    def get_chart_renderer(self) -> Iterable[ChartRenderer]:
+        renderer = create_chart_renderer()
+        yield renderer
+        renderer.shutdown()
+
     get_hint_sender = provide(HintSender, scope=Scope.REQUEST)
     get_bot_game_view = provide(
         BotView, scope=Scope.REQUEST, provides=AnyOf[GameView, GameViewPreparer]
@@ -24,11 +24,15 @@ class LoadDataMiddleware(BaseMiddleware):
         holder_dao = data["dao"]
         if isinstance(event, DialogUpdate):
             if user_tg := data.get("event_from_user", None):
-                user = await holder_dao.user.get_by_tg_id(user_tg.id)
+                user = holder_dao.identities.get_user(user_tg.id)
+                if user is None:
+                    user = await holder_dao.user.get_by_tg_id(user_tg.id)
             else:
                 user = None
             if chat_tg := data.get("event_chat", None):
-                chat = await holder_dao.chat.get_by_tg_id(chat_tg.id)
+                chat = holder_dao.identities.get_chat(chat_tg.id)
+                if chat is None:
+                    chat = await holder_dao.chat.get_by_tg_id(chat_tg.id)
             else:
                 chat = None
         else:
@@ -47,23 +51,43 @@ async def save_user(data: MiddlewareData, holder_dao: HolderDao) -> dto.User | N
     user = data.get("event_from_user", None)
     if not user:
         return None
-    return await upsert_user(dto.User.from_aiogram(user), holder_dao.user)
+    actual = dto.User.from_aiogram(user)
+    if saved := holder_dao.identities.get_same_user(actual):
+        return saved
+    saved = await upsert_user(actual, holder_dao.user)
+    holder_dao.identities.put_user(saved)
+    return saved
 
 
 async def save_player(user: dto.User | None, holder_dao: HolderDao) -> dto.Player | None:
     if not user:
         return None
-    return await upsert_player(user, holder_dao.player)
+    assert user.db_id is not None
+    if player := holder_dao.identities.get_player(user.db_id):
+        return player
+    player = await upsert_player(user, holder_dao.player)
+    holder_dao.identities.put_player(user.db_id, player)
+    return player
 
 
 async def save_chat(data: MiddlewareData, holder_dao: HolderDao) -> dto.Chat | None:
     chat = data.get("event_chat", None)
     if not chat:
         return None
-    return await upsert_chat(dto.Chat.from_aiogram(chat), holder_dao.chat)
+    actual = dto.Chat.from_aiogram(chat)
+    if saved := holder_dao.identities.get_same_chat(actual):
+        return saved
+    saved = await upsert_chat(actual, holder_dao.chat)
+    holder_dao.identities.put_chat(saved)
+    return saved
 
 
 async def load_team(chat: dto.Chat | None, holder_dao: HolderDao) -> dto.Team | None:
     if not chat:
         return None
-    return await get_by_chat(chat, holder_dao.team)
+    assert chat.db_id is not None
+    if holder_dao.identities.is_team_known(chat.db_id):
+        return holder_dao.identities.get_team(chat.db_id)
+    team = await get_by_chat(chat, holder_dao.team)
+    holder_dao.identities.put_team(chat.db_id, team)
+    return team
@@ -12,7 +12,7 @@ from shvatka.core.utils.key_checker_lock import KeyCheckerFactory
 from shvatka.core.views.game import GameLogWriter
 from shvatka.core.views.level import LevelView
 from shvatka.infrastructure.db.dao.holder import HolderDao
-from shvatka.infrastructure.picture.results_painter import ResultsPainter
+from shvatka.infrastructure.picture import ResultsPainter, ChartRenderer
 from shvatka.tgbot.config.models.bot import BotConfig
 from shvatka.tgbot.config.models.main import TgBotConfig
 from shvatka.tgbot.username_resolver.user_getter import UserGetter
@@ -62,6 +62,7 @@ class InitMiddleware(BaseMiddleware):
             data["bot"],
             holder_dao,
             data["config"].log_chat,
+            await dishka.get(ChartRenderer),
         )
         result = await handler(event, data)
         return result
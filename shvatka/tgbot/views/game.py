@@ -23,6 +23,7 @@ from shvatka.core.views.game import (
     LevelUp,
     NewOrg,
     LevelTestCompleted,
+    FilesWarmedUp,
     GameLogEvent,
     GameLogType,
 )
@@ -88,6 +89,7 @@ class BotView(GameViewPreparer, GameView):
 
     async def send_puzzle(self, team: dto.Team, level: dto.Level) -> None:
         assert level.number_in_game is not None
+        await self.hint_sender.resolver.prefetch(level.get_guids())
         await self.hint_sender.send_hints(
             chat_id=team.get_chat_id(),
             hint_containers=level.get_hint(0).hint,
@@ -217,6 +219,13 @@ class BotOrgNotifier(OrgNotifier):
                         continue
                     with suppress(TelegramAPIError):
                         await self.level_test_completed(cast(LevelTestCompleted, event), org)
+            case FilesWarmedUp():
+                for org in event.orgs_list:
+                    if org.player.get_chat_id() is None:
+                        logger.warning("player %s have no user chat_id", org.player)
+                        continue
+                    with suppress(TelegramAPIError):
+                        await self.files_warmed_up(cast(FilesWarmedUp, event), org)
 
     async def notify_level_up(self, level_up: LevelUp, org: dto.Organizer):
         assert level_up.new_level.number_in_game is not None
@@ -244,3 +253,15 @@ class BotOrgNotifier(OrgNotifier):
             f"{event.result.td.seconds % 60} c.\n"
             f"{hd.pre(hd.quote(results))}",
         )
+
+    async def files_warmed_up(self, event: FilesWarmedUp, org: dto.Organizer):
+        text = (
+            f"Файлы игры {hd.quote(event.game.name)} проверены перед стартом.\n"
+            f"Всего файлов: {event.checked}, "
+            f"заново загружено в телеграм: {len(event.renewed)}."
+        )
+        if event.failed:
+            text += "\nНе удалось подготовить файлы:\n" + "\n".join(
+                hd.code(guid) for guid in event.failed
+            )
+        await self.bot.send_message(chat_id=org.player.get_chat_id(), text=text)
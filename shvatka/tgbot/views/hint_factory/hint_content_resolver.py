@@ -1,6 +1,6 @@
 import typing
 from io import BytesIO
-from typing import BinaryIO
+from typing import BinaryIO, Iterable
 
 from shvatka.core.interfaces.clients.file_storage import FileStorage
 from shvatka.core.models.dto.hints import (
@@ -49,6 +49,10 @@ class HintContentResolver:
         self.dao = dao
         self.storage = file_storage
 
+    async def prefetch(self, guids: Iterable[str]) -> None:
+        """load file metas of many hints by one query, so resolving them will not go to db"""
+        await self.dao.get_by_guids(guids)
+
     async def resolve_link(self, hint: BaseHint) -> BaseHintLinkView:
         match hint:
             case TextHint(text=text):
@@ -1,4 +1,3 @@
-import asyncio
 import logging
 from datetime import timedelta
 from functools import partial
@@ -11,6 +10,7 @@ from aiogram.types import Message
 from shvatka.core.models import enums
 from shvatka.core.models.dto import hints
 from shvatka.tgbot.views.hint_factory.hint_content_resolver import HintContentResolver
+from shvatka.tgbot.views.send_limiter import SendLimiter, CHAT_INTERVAL
 
 logger = logging.getLogger(__name__)
 METHODS: dict[enums.HintType, Callable[..., Awaitable[Message]]] = {
@@ -30,11 +30,10 @@ METHODS: dict[enums.HintType, Callable[..., Awaitable[Message]]] = {
 
 
 class HintSender:
-    SLEEP: timedelta = timedelta(seconds=1)
-
-    def __init__(self, bot: Bot, resolver: HintContentResolver) -> None:
+    def __init__(self, bot: Bot, resolver: HintContentResolver, limiter: SendLimiter) -> None:
         self.bot = bot
         self.resolver = resolver
+        self.limiter = limiter
         self.methods: dict[enums.HintType, Callable[..., Awaitable[Message]]] = {
             t: partial(m, bot) for t, m in METHODS.items()
         }
@@ -46,37 +45,38 @@ class HintSender:
         method = self.method(enums.HintType[hint_container.type])
         hint_link = await self.resolver.resolve_link(hint_container)
         try:
-            return await method(chat_id=chat_id, **hint_link.kwargs())
+            return await self.limiter.send(
+                chat_id, partial(method, chat_id=chat_id, **hint_link.kwargs())
+            )
         except TelegramAPIError:
             logger.warning("cant send hint by file_id %s", hint_link)
             hint_content = await self.resolver.resolve_content(hint_container)
-            return await method(chat_id=chat_id, **hint_content.kwargs())
+            return await self.limiter.send(
+                chat_id, partial(method, chat_id=chat_id, **hint_content.kwargs())
+            )
 
     async def send_hints(
         self,
         chat_id: int,
         hint_containers: Iterable[hints.BaseHint],
         caption: str | None = None,
-        sleep: int | None = None,
     ):
         """
-        sending caption if exist and all hint parts in chat with chat_id
+        sending caption if exist and all hint parts in chat with chat_id.
+        Pauses between parts are made by limiter
         :param chat_id:
         :param hint_containers:
         :param caption: this text may send before hints
-        :param sleep:  time to sleep inter sending parts (default 1 sec)
         :return:
         """
-        if sleep is None:
-            sleep = self.SLEEP.seconds
         if caption is not None:
-            await self.bot.send_message(chat_id=chat_id, text=caption)
-            await asyncio.sleep(sleep)
+            await self.limiter.send(
+                chat_id, partial(self.bot.send_message, chat_id=chat_id, text=caption)
+            )
         for hint_container in hint_containers:
             await self.send_hint(hint_container, chat_id)
-            await asyncio.sleep(sleep)
 
     @classmethod
     def get_approximate_time(cls, hints: Collection[hints.BaseHint]) -> timedelta:
         approximate_io_time = timedelta(milliseconds=100)
-        return len(hints) * cls.SLEEP + len(hints) * approximate_io_time
+        return len(hints) * CHAT_INTERVAL + len(hints) * approximate_io_time
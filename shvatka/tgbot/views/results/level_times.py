@@ -1,29 +1,18 @@
+import re
 import typing
 from dataclasses import dataclass
 from datetime import datetime, time, timedelta
-from typing import Any  # noqa: F401
 
 from openpyxl import Workbook
-from openpyxl.worksheet.worksheet import Worksheet
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.utils import get_column_letter
+from openpyxl.worksheet._write_only import WriteOnlyWorksheet
 
 from shvatka.core.models import dto
 from shvatka.core.utils.datetime_utils import trim_tz
 from shvatka.core.utils.exceptions import GameNotFinished
 
 
-@dataclass
-class CellAddress:
-    column: int
-    row: int
-
-    def shift(self, plus_rows=0, plus_columns=0):
-        return {"row": self.row + plus_rows, "column": self.column + plus_columns}
-
-
-FIRST_TEAM_NAME = CellAddress(1, 3)
-GAME_NAME = CellAddress(1, 1)
-
-
 class LevelTime(typing.NamedTuple):
     level: int
     time: datetime
@@ -46,15 +35,35 @@ class Results:
 
 
 DATETIME_EXCEL_FORMAT = "HH:MM:SS"
+MIN_COLUMN_WIDTH = 2
+SHEET_TITLE_MAX_LENGTH = 31
+SHEET_TITLE_FORBIDDEN = re.compile(r"[\\/*?:\[\]]")
+Row = list[typing.Any]
+
+
+TeamsLevelTimes = typing.Mapping[dto.Team, typing.Sequence[dto.LevelTime]]
 
 
 def export_results(game: dto.FullGame, game_stat: dto.GameStat, file: typing.Any):
-    return export_results_internal(game, to_results(game_stat), file)
+    return export_results_internal(game, to_results(game_stat.level_times), file)
+
+
+def export_season_results(
+    games: typing.Iterable[tuple[dto.Game, TeamsLevelTimes]], file: typing.Any
+):
+    """every game is exported in own sheet of one workbook"""
+    wb = Workbook(write_only=True)
+    titles: set[str] = set()
+    for game, level_times in games:
+        write_results(wb, game, to_results(level_times), titles)
+    if not titles:
+        wb.create_sheet()
+    wb.save(file)
 
 
-def to_results(game_stat: dto.GameStat) -> Results:
+def to_results(level_times: TeamsLevelTimes) -> Results:
     result = []
-    for team, lts in game_stat.level_times.items():
+    for team, lts in level_times.items():
         levels_times = [LevelTime(lt.level_number, trim_tz(lt.start_at)) for lt in lts]
         levels_timedelta = []
         for previous, current in zip(levels_times[:-1], levels_times[1:]):  # type: LevelTime, LevelTime
@@ -65,45 +74,67 @@ def to_results(game_stat: dto.GameStat) -> Results:
 
 
 def export_results_internal(game: dto.FullGame, results: Results, file: typing.Any):
-    if not (game.is_complete() or game.is_finished()):
-        raise GameNotFinished
-    wb = Workbook()
-    ws = typing.cast(Worksheet, wb.active)
-    ws.cell(**GAME_NAME.shift()).value = game.name
-    i = 0
-    for i, team_level_times in enumerate(results.data):
-        cell = ws.cell(**FIRST_TEAM_NAME.shift(i, 0))
-        cell.value = team_level_times.team.name
-
-        for j, level_time in enumerate(team_level_times.levels_times, 1):
-            if i == 0:
-                ws.cell(**FIRST_TEAM_NAME.shift(-1, j)).value = level_time.level
-
-            cell = ws.cell(**FIRST_TEAM_NAME.shift(i, j))
-            cell.value = level_time.time
-            cell.number_format = DATETIME_EXCEL_FORMAT
-    second_part_start = i + 3
-
-    for i, team_level_times in enumerate(results.data, second_part_start):
-        cell = ws.cell(**FIRST_TEAM_NAME.shift(i, 0))
-        cell.value = team_level_times.team.name
-
-        for j, level_td in enumerate(team_level_times.levels_timedelta, 1):
-            if i == second_part_start:
-                ws.cell(**FIRST_TEAM_NAME.shift(second_part_start - 1, j)).value = level_td.level
-
-            cell = ws.cell(**FIRST_TEAM_NAME.shift(i, j))
-            cell.value = as_time(level_td.td)
-            cell.number_format = DATETIME_EXCEL_FORMAT
-
-    resize_columns(ws)
+    # write-only workbook streams rows to file instead of keeping all cells in memory
+    wb = Workbook(write_only=True)
+    write_results(wb, game, results, set())
     wb.save(file)
 
 
-def resize_columns(worksheet: Worksheet):
-    for col in worksheet.columns:  # type: Any  # =(
-        new_len = max([2, *[len(str(cell.value or "")) for cell in col]])
-        worksheet.column_dimensions[col[0].column_letter].width = new_len
+def write_results(wb: Workbook, game: dto.Game, results: Results, titles: set[str]):
+    if not (game.is_complete() or game.is_finished()):
+        raise GameNotFinished
+    rows = list(iter_rows(game, results))
+    ws = wb.create_sheet(get_sheet_title(game, titles))
+    # in write-only mode columns can't be resized after rows are written
+    for i, width in enumerate(get_columns_widths(rows), 1):
+        ws.column_dimensions[get_column_letter(i)].width = width
+    for row in rows:
+        ws.append([to_cell(ws, value) for value in row])
+
+
+def iter_rows(game: dto.Game, results: Results) -> typing.Iterator[Row]:
+    yield [game.name]
+    if not results.data:
+        return
+    yield [None, *(lt.level for lt in results.data[0].levels_times)]
+    for team_level_times in results.data:
+        yield [team_level_times.team.name, *(lt.time for lt in team_level_times.levels_times)]
+    yield []
+    yield [None, *(td.level for td in results.data[0].levels_timedelta)]
+    for team_level_times in results.data:
+        yield [
+            team_level_times.team.name,
+            *(as_time(td.td) for td in team_level_times.levels_timedelta),
+        ]
+
+
+def get_columns_widths(rows: typing.Iterable[Row]) -> list[int]:
+    widths: list[int] = []
+    for row in rows:
+        widths.extend([MIN_COLUMN_WIDTH] * (len(row) - len(widths)))
+        for i, value in enumerate(row):
+            widths[i] = max(widths[i], len(str(value or "")))
+    return widths
+
+
+def to_cell(ws: WriteOnlyWorksheet, value: typing.Any) -> typing.Any:
+    if not isinstance(value, datetime | time):
+        return value
+    cell = WriteOnlyCell(ws, value=value)
+    cell.number_format = DATETIME_EXCEL_FORMAT
+    return cell
+
+
+def get_sheet_title(game: dto.Game, titles: set[str]) -> str:
+    base = SHEET_TITLE_FORBIDDEN.sub("_", game.name)[:SHEET_TITLE_MAX_LENGTH] or "game"
+    title = base
+    number = 1
+    while title.lower() in titles:
+        number += 1
+        suffix = f" ({number})"
+        title = base[: SHEET_TITLE_MAX_LENGTH - len(suffix)] + suffix
+    titles.add(title.lower())
+    return title
 
 
 def as_time(td: timedelta) -> time:
@@ -61,11 +61,12 @@ class GamePublisher:
 
     async def publish_results(self):
         file = BytesIO()
-        export_results(game=self.game, game_stat=self.game_stat, file=file)
-        file.seek(0)
+        await asyncio.to_thread(
+            export_results, game=self.game, game_stat=self.game_stat, file=file
+        )
         msg = await self.bot.send_document(
             chat_id=self.channel_id,
-            document=BufferedInputFile(file=file.read(), filename=f"{self.game.name}.xlsx"),
+            document=BufferedInputFile(file=file.getvalue(), filename=f"{self.game.name}.xlsx"),
         )
         file.close()
         return msg.message_id
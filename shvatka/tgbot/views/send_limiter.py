@@ -0,0 +1,106 @@
+import asyncio
+import logging
+import time
+from datetime import timedelta
+from typing import Awaitable, Callable, TypeVar
+
+from aiogram.exceptions import TelegramRetryAfter
+
+logger = logging.getLogger(__name__)
+T = TypeVar("T")
+
+# https://core.telegram.org/bots/faq#my-bot-is-hitting-limits-how-do-i-avoid-this
+GLOBAL_RATE = 30
+"""messages per second for all chats"""
+CHAT_INTERVAL = timedelta(seconds=1)
+"""telegram doesn't like more than one message per second in one chat"""
+GROUP_RATE_PER_MINUTE = 20
+"""messages per minute in one group"""
+
+
+class TokenBucket:
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = capacity
+        self.updated_at = clock()
+
+    def reserve(self) -> float:
+        """take token and return how long to wait before it can be used"""
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+    async def acquire(self) -> None:
+        if wait := self.reserve():
+            await asyncio.sleep(wait)
+
+
+class SendLimiter:
+    """
+    Paces messages sending by telegram limits, so a lot of chats
+    can receive their messages concurrently without flood errors.
+    One instance must be shared by all senders of bot.
+    """
+
+    def __init__(
+        self,
+        global_rate: float = GLOBAL_RATE,
+        chat_interval: timedelta = CHAT_INTERVAL,
+        chat_burst: int = 3,
+        group_rate_per_minute: float = GROUP_RATE_PER_MINUTE,
+        max_retries: int = 5,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.clock = clock
+        self.global_bucket = TokenBucket(global_rate, global_rate, clock)
+        self.chat_rate = 1 / chat_interval.total_seconds()
+        self.chat_burst = chat_burst
+        self.group_rate = group_rate_per_minute / 60
+        self.group_burst = group_rate_per_minute
+        self.max_retries = max_retries
+        self.chat_buckets: dict[int, TokenBucket] = {}
+        self.group_buckets: dict[int, TokenBucket] = {}
+
+    async def send(self, chat_id: int, method: Callable[[], Awaitable[T]]) -> T:
+        for _ in range(self.max_retries):
+            await self._acquire(chat_id)
+            try:
+                return await method()
+            except TelegramRetryAfter as e:
+                logger.warning("flood control in chat %s, retry after %s", chat_id, e.retry_after)
+                await asyncio.sleep(e.retry_after)
+        await self._acquire(chat_id)
+        return await method()
+
+    async def _acquire(self, chat_id: int) -> None:
+        # chat limits are reserved before waiting for global one,
+        # so messages of one chat keep their order
+        wait = self._chat_bucket(chat_id).reserve()
+        if chat_id < 0:
+            wait = max(wait, self._group_bucket(chat_id).reserve())
+        if wait:
+            await asyncio.sleep(wait)
+        await self.global_bucket.acquire()
+
+    def _chat_bucket(self, chat_id: int) -> TokenBucket:
+        if chat_id not in self.chat_buckets:
+            self.chat_buckets[chat_id] = TokenBucket(self.chat_rate, self.chat_burst, self.clock)
+        return self.chat_buckets[chat_id]
+
+    def _group_bucket(self, chat_id: int) -> TokenBucket:
+        if chat_id not in self.group_buckets:
+            self.group_buckets[chat_id] = TokenBucket(
+                self.group_rate, self.group_burst, self.clock
+            )
+        return self.group_buckets[chat_id]
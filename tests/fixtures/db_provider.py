@@ -12,7 +12,12 @@ from shvatka.common import Config
 from shvatka.infrastructure.db.config.models.db import RedisConfig
 from shvatka.infrastructure.db.config.models.db import DBConfig as TrueConfig
 from shvatka.infrastructure.db.dao.holder import HolderDao
+from shvatka.infrastructure.db.dao.memory.file_info import FileInfoCache
+from shvatka.infrastructure.db.dao.memory.identity import IdentityCache
+from shvatka.infrastructure.db.dao.redis.active_game import ActiveGameChannel
+from shvatka.infrastructure.db.dao.memory.key_submission import KeySubmissionCache
 from shvatka.infrastructure.db.dao.memory.level_testing import LevelTestingData
+from shvatka.infrastructure.db.dao.memory.running_game import RunningGameCache
 from tests.mocks.config import DBConfig
 from tests.mocks.datetime_mock import ClockMock
 
@@ -58,6 +63,21 @@ class TestDbProvider(Provider):
         session: AsyncSession,
         redis: Redis,
         level_test: LevelTestingData,
+        running_games: RunningGameCache,
+        key_submissions: KeySubmissionCache,
+        file_info_cache: FileInfoCache,
+        identities: IdentityCache,
+        active_game: ActiveGameChannel,
         clock: ClockMock,
     ) -> HolderDao:
-        return HolderDao(session=session, redis=redis, level_test=level_test, clock=clock)
+        return HolderDao(
+            session=session,
+            redis=redis,
+            level_test=level_test,
+            running_games=running_games,
+            key_submissions=key_submissions,
+            file_info_cache=file_info_cache,
+            identities=identities,
+            active_game=active_game,
+            clock=clock,
+        )
@@ -212,7 +212,6 @@ async def set_game_started(
 ) -> dto.FullGame:
     await dao.game.set_started(game)
     await dao.game.set_start_at(game, datetime.now(tz=tz_utc))
-    for team in teams:
-        await dao.level_time.set_to_level(team=team, game=game, level_number=0)
+    await dao.level_time.set_all_to_level(teams=teams, game=game, level_number=0)
     await dao.commit()
     return game
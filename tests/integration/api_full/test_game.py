@@ -96,6 +96,29 @@ async def test_game_file(
     )
     assert resp.is_success
     assert resp.read() == b"123"
+    assert resp.headers["accept-ranges"] == "bytes"
+
+
+@pytest.mark.asyncio
+async def test_game_file_range(
+    finished_game: dto.FullGame,
+    dao: HolderDao,
+    client: AsyncClient,
+    auth: AuthProperties,
+    user: dto.User,
+):
+    token = auth.create_user_token(user)
+    await dao.game.set_completed(finished_game)
+    await dao.game.set_number(finished_game, 1)
+    await dao.commit()
+    resp = await client.get(
+        f"/games/{finished_game.id}/files/{GUID}",
+        cookies={"Authorization": "Bearer " + token.access_token},
+        headers={"Range": "bytes=1-"},
+    )
+    assert resp.status_code == 206
+    assert resp.read() == b"23"
+    assert resp.headers["content-range"] == "bytes 1-2/3"
 
 
 @pytest.mark.asyncio
@@ -132,3 +155,36 @@ async def test_game_file_game_not_completed(
         cookies={"Authorization": "Bearer " + token.access_token},
     )
     assert resp.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_game_keys_log(
+    finished_game: dto.FullGame,
+    dao: HolderDao,
+    client: AsyncClient,
+    auth: AuthProperties,
+    user: dto.User,
+):
+    token = auth.create_user_token(user)
+    await dao.game.set_completed(finished_game)
+    await dao.game.set_number(finished_game, 1)
+    await dao.commit()
+    cookies = {"Authorization": "Bearer " + token.access_token}
+    resp = await client.get(
+        f"/games/{finished_game.id}/keys/log", params={"limit": 5}, cookies=cookies
+    )
+    assert resp.is_success
+    first = resp.json()
+    assert len(first["content"]) == 5
+
+    resp = await client.get(
+        f"/games/{finished_game.id}/keys/log",
+        params={"since": first["cursor"], "limit": 5},
+        cookies=cookies,
+    )
+    assert resp.is_success
+    second = resp.json()
+    assert len(second["content"]) == 3
+    assert second["cursor"] > first["cursor"]
+    all_keys = await dao.key_time.get_typed_keys(finished_game)
+    assert [k["text"] for k in first["content"] + second["content"]] == [k.text for k in all_keys]
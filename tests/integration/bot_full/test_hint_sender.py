@@ -36,6 +36,7 @@ from shvatka.core.models.dto.hints import (
 from shvatka.infrastructure.db.dao.holder import HolderDao
 from shvatka.tgbot.views.hint_factory.hint_content_resolver import HintContentResolver
 from shvatka.tgbot.views.hint_sender import HintSender
+from shvatka.tgbot.views.send_limiter import SendLimiter
 from tests.fixtures.file_storage import FILE_ID, CHAT_ID, FILE_META
 from tests.fixtures.scn_fixtures import GUID
 
@@ -58,7 +59,9 @@ PARAMETERS = [
 async def hint_sender(dao: HolderDao, file_storage: FileStorage):
     bot = MockedBot()
     return HintSender(
-        bot=bot, resolver=HintContentResolver(dao=dao.file_info, file_storage=file_storage)
+        bot=bot,
+        resolver=HintContentResolver(dao=dao.file_info, file_storage=file_storage),
+        limiter=SendLimiter(),
     )
 
 
@@ -8,6 +8,7 @@ from alembic.command import upgrade
 from alembic.config import Config as AlembicConfig
 from dataclass_factory import Factory
 from dishka import make_async_container, AsyncContainer, Provider, Scope
+from sqlalchemy.ext.asyncio import AsyncEngine
 from telegraph.aio import Telegraph
 
 from shvatka.api.dependencies import AuthProvider, ApiConfigProvider, PlayerProvider, TeamProvider
@@ -20,6 +21,7 @@ from shvatka.core.views.game import GameLogWriter
 from shvatka.infrastructure.db.config.models.db import DBConfig
 from shvatka.infrastructure.db.dao.holder import HolderDao
 from shvatka.infrastructure.db.dao.memory.level_testing import LevelTestingData
+from shvatka.infrastructure.db.models.level import scenarios_cache
 from shvatka.infrastructure.di import (
     ConfigProvider,
     DbProvider,
@@ -132,8 +134,15 @@ async def clear_data(dao: HolderDao):
     await dao.chat.delete_all()
     await dao.team.delete_all()
     await dao.user.delete_all()
+    await dao.forum_user.delete_all()
     await dao.player.delete_all()
     await dao.commit()
+    dao.running_games.clear()
+    scenarios_cache.clear()
+    dao.key_submissions.clear()
+    dao.file_info_cache.clear()
+    dao.identities.clear()
+    dao.active_game.cache.clear()
 
 
 @pytest_asyncio.fixture(scope="session")
@@ -220,3 +229,8 @@ def clean_up_memory(file_storage: MemoryFileStorage):
 @pytest_asyncio.fixture
 async def clock(dishka: AsyncContainer) -> ClockMock:
     return await dishka.get(ClockMock)
+
+
+@pytest_asyncio.fixture(scope="session")
+async def engine(dishka: AsyncContainer) -> AsyncEngine:
+    return await dishka.get(AsyncEngine)
@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+from dishka import AsyncContainer
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from shvatka.core.models import dto
+from shvatka.core.models.enums import GameStatus
+from shvatka.core.services.game import get_active, start_waivers
+from shvatka.infrastructure.db.dao.holder import HolderDao
+from shvatka.infrastructure.db.dao.memory.active_game import ActiveGameCache
+from shvatka.infrastructure.db.dao.redis.active_game import ActiveGameChannel
+from tests.utils.query_count import count_queries
+
+
+@pytest.mark.asyncio
+async def test_active_game_cached(
+    game: dto.FullGame, author: dto.Player, dao: HolderDao, engine: AsyncEngine
+):
+    assert await get_active(dao.game) is None
+    await start_waivers(game, author, dao.game)
+
+    with count_queries(engine) as queries:
+        first = await get_active(dao.game)
+        second = await get_active(dao.game)
+    assert len(queries.statements) == 1
+    assert first is not None
+    assert first.id == game.id
+    assert first == second
+
+
+@pytest.mark.asyncio
+async def test_not_committed_change_not_cached(
+    game: dto.FullGame, dao: HolderDao, check_dao: HolderDao
+):
+    await dao.game.set_status(game, GameStatus.getting_waivers)
+    assert (await get_active(dao.game)).id == game.id
+    assert await get_active(check_dao.game) is None
+
+    await dao.commit()
+    assert (await get_active(check_dao.game)).id == game.id
+
+
+@pytest.mark.asyncio
+async def test_other_process_change_invalidate_cache(dishka: AsyncContainer):
+    redis = await dishka.get(Redis)
+    cache = ActiveGameCache()
+    other_process_cache = ActiveGameCache()
+    channel = ActiveGameChannel(redis, cache)
+    async with ActiveGameChannel(redis, other_process_cache).listening():
+        await asyncio.sleep(0.1)  # wait for subscription
+        other_process_cache.put(None, other_process_cache.version)
+        assert other_process_cache.is_known()
+
+        await channel.publish()
+        for _ in range(100):
+            if not other_process_cache.is_known():
+                break
+            await asyncio.sleep(0.01)
+        assert not other_process_cache.is_known()
+
+
+@pytest.mark.asyncio
+async def test_own_change_not_invalidate_cache_again(dishka: AsyncContainer):
+    redis = await dishka.get(Redis)
+    cache = ActiveGameCache()
+    channel = ActiveGameChannel(redis, cache)
+    async with channel.listening():
+        await asyncio.sleep(0.1)  # wait for subscription
+        await channel.publish()
+        cache.put(None, cache.version)
+        await asyncio.sleep(0.1)  # wait for echo of own change
+        assert cache.is_known()
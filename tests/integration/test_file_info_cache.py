@@ -0,0 +1,54 @@
+from dataclasses import replace
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from shvatka.core.models import dto
+from shvatka.infrastructure.db.dao.holder import HolderDao
+from tests.fixtures.file_storage import FILE_META
+from tests.utils.query_count import count_queries
+
+
+@pytest.mark.asyncio
+async def test_get_by_guids_one_query(harry: dto.Player, dao: HolderDao, engine: AsyncEngine):
+    guids = [f"{FILE_META.guid}-{i}" for i in range(5)]
+    for guid in guids:
+        await dao.file_info.upsert(replace(FILE_META, guid=guid), harry)
+    await dao.commit()
+
+    with count_queries(engine) as prefetch:
+        files = await dao.file_info.get_by_guids([*guids, "not-exists"])
+    with count_queries(engine) as resolve:
+        for guid in guids:
+            assert (await dao.file_info.get_by_guid(guid)).guid == guid
+
+    assert set(files) == set(guids)
+    assert prefetch.count == 1
+    assert resolve.count == 0
+
+
+@pytest.mark.asyncio
+async def test_update_file_id_invalidates(harry: dto.Player, dao: HolderDao):
+    await dao.file_info.upsert(FILE_META, harry)
+    await dao.commit()
+    assert (await dao.file_info.get_by_guid(FILE_META.guid)).tg_link.file_id == "98765"
+
+    await dao.file_info.update_file_id(FILE_META.guid, "12345")
+    await dao.commit()
+    assert (await dao.file_info.get_by_guid(FILE_META.guid)).tg_link.file_id == "12345"
+
+
+@pytest.mark.asyncio
+async def test_cache_invalidated_after_commit(harry: dto.Player, dao: HolderDao):
+    await dao.file_info.upsert(FILE_META, harry)
+    await dao.commit()
+    await dao.file_info.get_by_guid(FILE_META.guid)
+
+    await dao.file_info.update_file_id(FILE_META.guid, "12345")
+    # other requests see committed file_id until commit
+    assert dao.file_info_cache.get(FILE_META.guid).tg_link.file_id == "98765"
+    assert (await dao.file_info.get_by_guid(FILE_META.guid)).tg_link.file_id == "12345"
+    assert dao.file_info_cache.get(FILE_META.guid).tg_link.file_id == "98765"
+
+    await dao.commit()
+    assert dao.file_info_cache.get(FILE_META.guid) is None
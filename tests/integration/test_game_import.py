@@ -0,0 +1,89 @@
+from copy import deepcopy
+from io import BytesIO
+
+import pytest
+from adaptix import Retort
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from shvatka.core.interfaces.clients.file_storage import FileGateway
+from shvatka.core.models import dto
+from shvatka.core.models.dto.scn.game import RawGameScenario
+from shvatka.core.services.game import upsert_game
+from shvatka.infrastructure.db.dao.holder import HolderDao
+from tests.utils.query_count import count_queries
+
+
+def make_scn(
+    template: RawGameScenario, file_template: RawGameScenario, name: str, count: int
+) -> RawGameScenario:
+    scn = deepcopy(template.scn)
+    scn["name"] = name
+    level_template = scn["levels"][0]
+    scn["levels"] = []
+    for i in range(count):
+        level = deepcopy(level_template)
+        level["id"] = f"{name}_{i}"
+        scn["levels"].append(level)
+    file_meta_template = file_template.scn["files"][0]
+    scn["files"] = []
+    contents = {}
+    for i in range(count):
+        file_meta = deepcopy(file_meta_template)
+        file_meta["guid"] = f"{name}-file-{i}"
+        scn["files"].append(file_meta)
+        contents[file_meta["guid"]] = BytesIO(f"content {i}".encode())
+    return RawGameScenario(scn=scn, files=contents)
+
+
+@pytest.mark.asyncio
+async def test_upsert_game_queries_not_depend_on_size(
+    three_lvl_scn: RawGameScenario,
+    complex_scn: RawGameScenario,
+    author: dto.Player,
+    dao: HolderDao,
+    retort: Retort,
+    file_gateway: FileGateway,
+    engine: AsyncEngine,
+):
+    small = make_scn(three_lvl_scn, complex_scn, "small", 3)
+    with count_queries(engine) as small_queries:
+        await upsert_game(small, author, dao.game_upserter, retort, file_gateway)
+
+    big = make_scn(three_lvl_scn, complex_scn, "big", 40)
+    with count_queries(engine) as big_queries:
+        game = await upsert_game(big, author, dao.game_upserter, retort, file_gateway)
+
+    assert len(big_queries.selects) == len(small_queries.selects)
+    assert len(big_queries.inserts) == len(small_queries.inserts)
+    assert [level.name_id for level in game.levels] == [f"big_{i}" for i in range(40)]
+    saved = await dao.file_info.get_by_guids([f"big-file-{i}" for i in range(40)])
+    assert len(saved) == 40
+
+
+@pytest.mark.asyncio
+async def test_reupsert_game_keeps_levels(
+    three_lvl_scn: RawGameScenario,
+    complex_scn: RawGameScenario,
+    author: dto.Player,
+    dao: HolderDao,
+    retort: Retort,
+    file_gateway: FileGateway,
+):
+    first = await upsert_game(
+        make_scn(three_lvl_scn, complex_scn, "game", 5),
+        author,
+        dao.game_upserter,
+        retort,
+        file_gateway,
+    )
+    changed = make_scn(three_lvl_scn, complex_scn, "game", 5)
+    changed.scn["levels"] = list(reversed(changed.scn["levels"]))[:4]
+    second = await upsert_game(changed, author, dao.game_upserter, retort, file_gateway)
+
+    assert second.id == first.id
+    assert [level.name_id for level in second.levels] == [f"game_{i}" for i in (4, 3, 2, 1)]
+    assert [level.db_id for level in second.levels] == [
+        level.db_id for level in reversed(first.levels[1:])
+    ]
+    numbers = {lvl.name_id: lvl.number_in_game for lvl in await dao.level.get_all_my(author)}
+    assert numbers == {"game_0": None, "game_1": 3, "game_2": 2, "game_3": 1, "game_4": 0}
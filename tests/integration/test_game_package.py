@@ -0,0 +1,149 @@
+import asyncio
+import threading
+from io import BytesIO
+from typing import AsyncIterator, cast
+from zipfile import ZipFile
+
+import pytest
+import yaml
+from adaptix import Retort
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from shvatka.core.interfaces.clients.file_storage import FileGateway, FileReader
+from shvatka.core.models import dto
+from shvatka.core.models.dto import hints, scn
+from shvatka.core.services.game import get_game_package
+from shvatka.core.services.scenario.scn_zip import write_package, SCN_FILENAME, RESULTS_FILENAME
+from shvatka.infrastructure.clients.file_storage import MemoryFileReader
+from shvatka.infrastructure.db.dao.holder import HolderDao
+from tests.mocks.file_gateway import FileGatewayMock
+from tests.utils.query_count import count_queries
+
+
+@pytest.mark.asyncio
+async def test_write_game_package(
+    game: dto.FullGame,
+    author: dto.Player,
+    dao: HolderDao,
+    retort: Retort,
+    file_gateway: FileGateway,
+    engine: AsyncEngine,
+):
+    dao.file_info_cache.clear()
+    with count_queries(engine) as queries:
+        package = await get_game_package(game.id, author, dao.game_packager, retort)
+    assert len([q for q in queries.selects if "files_info" in q]) == 1
+    assert {f.guid for f in package.files} == set(game.get_guids())
+
+    output = BytesIO()
+    await write_package(package, output, file_gateway, concurrency=2)
+
+    output.seek(0)
+    with ZipFile(output) as zip_:
+        scenario = yaml.safe_load(zip_.read(SCN_FILENAME))
+        assert scenario["name"] == game.name
+        assert [f["guid"] for f in scenario["files"]] == [f.guid for f in package.files]
+        assert zip_.read(RESULTS_FILENAME) == b"null"
+        for file_meta in package.files:
+            reader = await file_gateway.open(file_meta)
+            expected = b"".join([chunk async for chunk in reader.iter_chunks()])
+            assert zip_.read(file_meta.guid) == expected
+
+
+class SlowFileGateway(FileGatewayMock):
+    def __init__(self) -> None:
+        super().__init__()
+        self.opened = 0
+        self.max_opened = 0
+
+    async def open(self, file_meta: hints.FileMeta) -> FileReader:
+        self.opened += 1
+        self.max_opened = max(self.max_opened, self.opened)
+        await asyncio.sleep(0.01)
+        return ClosingReader(self, file_meta.guid.encode() * 10_000)
+
+
+class ClosingReader(MemoryFileReader):
+    def __init__(self, gateway: SlowFileGateway, content: bytes) -> None:
+        super().__init__(content, chunk_size=1000)
+        self.gateway = gateway
+
+    async def iter_chunks(self, start: int = 0, stop: int | None = None) -> AsyncIterator[bytes]:
+        async for chunk in super().iter_chunks(start, stop):
+            yield chunk
+        self.gateway.opened -= 1
+
+
+@pytest.mark.asyncio
+async def test_package_files_concurrency_bounded():
+    gateway = SlowFileGateway()
+    files = [cast(hints.FileMeta, FakeFileMeta(f"file-{i}")) for i in range(10)]
+    output = BytesIO()
+    await write_package(scn.GamePackage(scn={}, files=files), output, gateway, concurrency=3)
+
+    assert gateway.max_opened == 3
+    output.seek(0)
+    with ZipFile(output) as zip_:
+        for file_meta in files:
+            assert zip_.read(file_meta.guid) == file_meta.guid.encode() * 10_000
+
+
+class FakeFileMeta:
+    def __init__(self, guid: str) -> None:
+        self.guid = guid
+
+
+class ThreadRecordingOutput(BytesIO):
+    def __init__(self) -> None:
+        super().__init__()
+        self.threads: set[int] = set()
+
+    def write(self, data, /) -> int:
+        self.threads.add(threading.get_ident())
+        return super().write(data)
+
+
+@pytest.mark.asyncio
+async def test_package_written_in_worker_thread():
+    files = [cast(hints.FileMeta, FakeFileMeta(f"file-{i}")) for i in range(3)]
+    output = ThreadRecordingOutput()
+    await write_package(scn.GamePackage(scn={}, files=files), output, SlowFileGateway())
+
+    assert output.threads
+    assert threading.get_ident() not in output.threads
+
+
+class BrokenFileGateway(SlowFileGateway):
+    async def open(self, file_meta: hints.FileMeta) -> FileReader:
+        if file_meta.guid == "file-2":
+            raise FileNotFoundError(file_meta.guid)
+        return await super().open(file_meta)
+
+
+@pytest.mark.asyncio
+async def test_package_reading_error_raised():
+    files = [cast(hints.FileMeta, FakeFileMeta(f"file-{i}")) for i in range(5)]
+    with pytest.raises(FileNotFoundError):
+        await asyncio.wait_for(
+            write_package(scn.GamePackage(scn={}, files=files), BytesIO(), BrokenFileGateway()),
+            5,
+        )
+
+
+class FullDiskOutput(BytesIO):
+    def write(self, data, /) -> int:
+        if self.tell() > 500:
+            raise OSError("no space left on device")
+        return super().write(data)
+
+
+@pytest.mark.asyncio
+async def test_package_writing_error_raised():
+    files = [cast(hints.FileMeta, FakeFileMeta(f"file-{i}")) for i in range(5)]
+    with pytest.raises(OSError, match="no space left"):
+        await asyncio.wait_for(
+            write_package(
+                scn.GamePackage(scn={}, files=files), FullDiskOutput(), SlowFileGateway()
+            ),
+            5,
+        )
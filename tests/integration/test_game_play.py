@@ -1,14 +1,16 @@
+import asyncio
 from contextlib import suppress
 from datetime import datetime, timedelta
 
 import pytest
 from dishka import AsyncContainer
+from sqlalchemy.ext.asyncio import AsyncEngine
 
 from shvatka.core.games.interactors import GamePlayReaderInteractor
 from shvatka.core.models import dto, enums
 from shvatka.core.models.dto import hints
 from shvatka.core.models.enums import GameStatus
-from shvatka.core.services.game_play import start_game, send_hint, check_key
+from shvatka.core.services.game_play import start_game, send_hint, send_hints, check_key
 from shvatka.core.services.game_stat import get_typed_keys
 from shvatka.core.services.key import KeyProcessor
 from shvatka.core.services.organizers import get_orgs
@@ -27,6 +29,7 @@ from tests.mocks.game_log import GameLogWriterMock
 from tests.mocks.game_view import GameViewMock
 from tests.mocks.org_notifier import OrgNotifierMock
 from tests.mocks.scheduler_mock import SchedulerMock
+from tests.utils.query_count import count_queries
 from tests.utils.time_key import assert_time_key
 
 
@@ -162,6 +165,111 @@ async def test_bonus_hint_key(
     )
 
 
+@pytest.mark.asyncio
+async def test_send_hints_batch(
+    dao: HolderDao,
+    scheduler: SchedulerMock,
+    gryffindor: dto.Team,
+    slytherin: dto.Team,
+    started_game: dto.FullGame,
+    engine: AsyncEngine,
+):
+    game = started_game
+    level = game.levels[0]
+    gryffindor_lt = await dao.level_time.get_current_level_time(gryffindor, game)
+    slytherin_lt = await dao.level_time.get_current_level_time(slytherin, game)
+    dummy_view = GameViewMock()
+
+    with count_queries(engine) as queries:
+        await send_hints(
+            scheduled=[
+                dto.ScheduledHint(
+                    level=level, team_id=gryffindor.id, hint_number=1, lt_id=gryffindor_lt.id
+                ),
+                dto.ScheduledHint(
+                    level=level, team_id=slytherin.id, hint_number=1, lt_id=slytherin_lt.id
+                ),
+                # slytherin was on this level earlier
+                dto.ScheduledHint(level=level, team_id=slytherin.id, hint_number=2, lt_id=-1),
+            ],
+            game=game,
+            dao=dao.level_time,
+            view=dummy_view,
+            scheduler=scheduler,
+        )
+
+    assert queries.count == 1
+    assert sorted((team.id, number) for team, number, _ in dummy_view.send_hint_calls) == sorted(
+        [(gryffindor.id, 1), (slytherin.id, 1)]
+    )
+    dummy_view.send_hint_calls.clear()
+    scheduler.assert_only_one_hint_for_team(level, gryffindor, 2)
+    scheduler.assert_only_one_hint_for_team(level, slytherin, 2)
+    scheduler.assert_no_unchecked()
+    dummy_view.assert_no_unchecked()
+
+
+class BlockingGameViewMock(GameViewMock):
+    def __init__(self, blocked: dto.Team) -> None:
+        super().__init__()
+        self.blocked = blocked
+        self.unblock = asyncio.Event()
+
+    async def send_hint(self, team: dto.Team, hint_number: int, level: dto.Level) -> None:
+        if team == self.blocked:
+            await self.unblock.wait()
+        await super().send_hint(team, hint_number, level)
+
+
+@pytest.mark.asyncio
+async def test_send_hints_slow_team_not_blocks_others(
+    dao: HolderDao,
+    gryffindor: dto.Team,
+    slytherin: dto.Team,
+    started_game: dto.FullGame,
+):
+    game = started_game
+    level = game.levels[0]
+    gryffindor_lt = await dao.level_time.get_current_level_time(gryffindor, game)
+    slytherin_lt = await dao.level_time.get_current_level_time(slytherin, game)
+    view = BlockingGameViewMock(blocked=gryffindor)
+    scheduler = SchedulerMock()
+
+    sending = asyncio.create_task(
+        send_hints(
+            scheduled=[
+                dto.ScheduledHint(
+                    level=level, team_id=gryffindor.id, hint_number=1, lt_id=gryffindor_lt.id
+                ),
+                dto.ScheduledHint(
+                    level=level, team_id=gryffindor.id, hint_number=2, lt_id=gryffindor_lt.id
+                ),
+                dto.ScheduledHint(
+                    level=level, team_id=slytherin.id, hint_number=1, lt_id=slytherin_lt.id
+                ),
+            ],
+            game=game,
+            dao=dao.level_time,
+            view=view,
+            scheduler=scheduler,
+        )
+    )
+    for _ in range(100):
+        if view.send_hint_calls:
+            break
+        await asyncio.sleep(0.01)
+    assert [(team.id, number) for team, number, _ in view.send_hint_calls] == [(slytherin.id, 1)]
+    assert not sending.done()
+
+    view.unblock.set()
+    await asyncio.wait_for(sending, 5)
+    assert [(team.id, number) for team, number, _ in view.send_hint_calls] == [
+        (slytherin.id, 1),
+        (gryffindor.id, 1),
+        (gryffindor.id, 2),
+    ]
+
+
 @pytest.mark.asyncio
 async def test_game_play(
     dao: HolderDao,
@@ -498,3 +606,23 @@ async def test_get_current_hints(
         await join_team(ron, gryffindor, harry, dao.team_player)
     with pytest.raises(exceptions.WaiverError):
         await interactor(ron._user)
+
+
+@pytest.mark.asyncio
+async def test_is_all_team_finished(
+    gryffindor: dto.Team,
+    slytherin: dto.Team,
+    started_game: dto.FullGame,
+    dao: HolderDao,
+    engine: AsyncEngine,
+):
+    game = started_game
+    assert not await dao.game_player.is_all_team_finished(game)
+
+    await dao.level_time.set_to_level(gryffindor, game, len(game.levels))
+    assert not await dao.game_player.is_all_team_finished(game)
+
+    await dao.level_time.set_to_level(slytherin, game, len(game.levels))
+    with count_queries(engine) as queries:
+        assert await dao.game_player.is_all_team_finished(game)
+    assert queries.count == 1
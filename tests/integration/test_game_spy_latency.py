@@ -0,0 +1,78 @@
+import logging
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from shvatka.core.models import dto
+from shvatka.core.models.enums.chat_type import ChatType
+from shvatka.core.services.chat import upsert_chat
+from shvatka.core.services.game_stat import get_game_spy, get_game_stat
+from shvatka.core.services.team import create_team
+from shvatka.core.utils.datetime_utils import tz_utc
+from shvatka.infrastructure.db.dao.holder import HolderDao
+from tests.fixtures.player import create_player, promote
+from tests.mocks.game_log import GameLogWriterMock
+from tests.utils.query_count import count_queries
+
+logger = logging.getLogger(__name__)
+
+TEAMS_COUNT = 50
+LEVELS_COUNT = 30
+
+
+async def create_teams(dao: HolderDao) -> list[dto.Team]:
+    teams = []
+    for i in range(TEAMS_COUNT):
+        captain = await create_player(
+            dto.User(tg_id=20_000 + i, username=f"captain_{i}", first_name=f"Captain {i}"), dao
+        )
+        await promote(captain, dao)
+        chat = await upsert_chat(
+            dto.Chat(tg_id=-20_000 - i, type=ChatType.supergroup, title=f"team {i}"), dao.chat
+        )
+        teams.append(await create_team(chat, captain, dao.team_creator, GameLogWriterMock()))
+    return teams
+
+
+@pytest.mark.asyncio
+async def test_game_spy_latency(
+    game: dto.FullGame, author: dto.Player, dao: HolderDao, engine: AsyncEngine
+):
+    teams = await create_teams(dao)
+    start_at = datetime.now(tz=tz_utc) - timedelta(hours=LEVELS_COUNT)
+    for level_number in range(LEVELS_COUNT):
+        # every next team is one level behind
+        await dao.level_time.set_all_to_level(
+            teams[: TEAMS_COUNT - level_number],
+            game,
+            level_number,
+            at=start_at + timedelta(hours=level_number),
+        )
+    await dao.commit()
+
+    started_at = time.perf_counter()
+    stat = await get_game_stat(game, author, dao.game_stat)
+    full_stat_latency = time.perf_counter() - started_at
+
+    with count_queries(engine) as queries:
+        started_at = time.perf_counter()
+        spy = await get_game_spy(game, author, dao.game_stat)
+    spy_latency = time.perf_counter() - started_at
+    logger.info(
+        "spy for %s teams on %s levels: %.1f ms, full stat: %.1f ms",
+        TEAMS_COUNT,
+        LEVELS_COUNT,
+        spy_latency * 1000,
+        full_stat_latency * 1000,
+    )
+
+    assert len(spy) == TEAMS_COUNT
+    assert len([q for q in queries.selects if "levels_times" in q]) == 1
+    assert {lt.team: lt.level_number for lt in spy} == {
+        team: lts[-1].level_number for team, lts in stat.level_times.items()
+    }
+    for i, team in enumerate(teams):
+        current = next(lt for lt in spy if lt.team == team)
+        assert current.level_number == min(LEVELS_COUNT - 1, TEAMS_COUNT - 1 - i)
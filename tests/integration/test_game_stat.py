@@ -1,13 +1,25 @@
+from dataclasses import replace
 from datetime import timedelta, datetime
 from itertools import pairwise
 
 import pytest
+from dishka import AsyncContainer
+from sqlalchemy.ext.asyncio import AsyncEngine
 
-from shvatka.core.models import dto
-from shvatka.core.services.game_stat import get_game_stat, get_typed_keys, get_game_spy
+from shvatka.core.models import dto, enums
+from shvatka.core.models.enums import GameStatus
+from shvatka.core.services.game_stat import (
+    get_game_stat,
+    get_typed_keys,
+    get_game_spy,
+    get_typed_keys_page,
+    get_season_stat,
+)
 from shvatka.core.utils.datetime_utils import tz_utc
+from shvatka.infrastructure.db.dao.complex.key_log import GameKeysReaderImpl
 from shvatka.infrastructure.db.dao.holder import HolderDao
 from tests.mocks.datetime_mock import ClockMock
+from tests.utils.query_count import count_queries
 
 
 @pytest.mark.asyncio
@@ -20,6 +32,32 @@ async def test_game_level_times(finished_game: dto.FullGame, dao: HolderDao):
             assert prev.level_number <= curr.level_number
 
 
+@pytest.mark.asyncio
+async def test_season_level_times(
+    finished_game: dto.FullGame, dao: HolderDao, engine: AsyncEngine
+):
+    await dao.game.set_completed(finished_game)
+    await dao.game.set_number(finished_game, 1)
+    await dao.commit()
+    game_stat = await get_game_stat(finished_game, finished_game.author, dao.game_stat)
+
+    with count_queries(engine) as queries:
+        season = await get_season_stat(finished_game, dao.season_stat)
+    assert len(queries.selects) == 2
+    assert [game.id for game, _ in season] == [finished_game.id]
+    _, level_times = season[0]
+    assert {
+        team: [(lt.level_number, lt.start_at) for lt in lts] for team, lts in level_times.items()
+    } == {
+        team: [(lt.level_number, lt.start_at) for lt in lts]
+        for team, lts in game_stat.level_times.items()
+    }
+
+    assert finished_game.start_at is not None
+    next_year = replace(finished_game, start_at=finished_game.start_at + timedelta(days=366))
+    assert await get_season_stat(next_year, dao.season_stat) == []
+
+
 @pytest.mark.asyncio
 async def test_game_log_keys(
     finished_game: dto.FullGame, gryffindor: dto.Team, slytherin: dto.Team, dao: HolderDao
@@ -31,6 +69,110 @@ async def test_game_log_keys(
     assert 3 == len(actual[slytherin])
 
 
+@pytest.mark.asyncio
+async def test_game_log_keys_pages(
+    finished_game: dto.FullGame, gryffindor: dto.Team, dao: HolderDao
+):
+    reader = GameKeysReaderImpl(dao)
+    finished_game = replace(finished_game, status=GameStatus.complete)
+    all_keys = await dao.key_time.get_typed_keys(finished_game)
+    pages = []
+    cursor = None
+    while True:
+        page = await get_typed_keys_page(
+            finished_game, finished_game.author, reader, since=cursor, limit=3
+        )
+        if not page.keys:
+            assert page.cursor == cursor
+            break
+        pages.append(page.keys)
+        cursor = page.cursor
+    assert [len(keys) for keys in pages] == [3, 3, 2]
+    assert [key for keys in pages for key in keys] == all_keys
+
+    team_page = await get_typed_keys_page(
+        finished_game, finished_game.author, reader, team_id=gryffindor.id, level_number=0
+    )
+    assert team_page.keys == [
+        key for key in all_keys if key.team == gryffindor and key.level_number == 0
+    ]
+    assert team_page.keys
+
+
+async def save_key(
+    dao: HolderDao,
+    game: dto.Game,
+    team: dto.Team,
+    player: dto.Player,
+    key: str,
+    at: datetime | None = None,
+) -> None:
+    await dao.key_time.save_key(
+        key=key,
+        team=team,
+        level_time=await dao.level_time.get_current_level_time(team, game),
+        game=game,
+        player=player,
+        type_=enums.KeyType.wrong,
+        is_duplicate=False,
+        at=at,
+    )
+    await dao.session.flush()
+
+
+@pytest.mark.asyncio
+async def test_game_log_keys_page_not_skip_uncommitted(
+    started_game: dto.FullGame,
+    gryffindor: dto.Team,
+    slytherin: dto.Team,
+    harry: dto.Player,
+    draco: dto.Player,
+    dao: HolderDao,
+    dishka: AsyncContainer,
+    clock: ClockMock,
+):
+    async with dishka() as first_request, dishka() as second_request:
+        first = await first_request.get(HolderDao)
+        second = await second_request.get(HolderDao)
+        await save_key(first, started_game, gryffindor, harry, "SHFIRST")
+        await save_key(second, started_game, slytherin, draco, "SHSECOND")
+        await second.commit()
+        # second key got greater id but is committed while first is not
+
+        clock.clear()
+        page = await dao.key_time.get_typed_keys_page(started_game, since=None, limit=10)
+        assert page.keys == []
+        assert page.cursor is None
+
+        await first.commit()
+    clock.add_mock(tz=tz_utc, result=datetime.now(tz=tz_utc) + timedelta(minutes=1))
+    page = await dao.key_time.get_typed_keys_page(started_game, since=None, limit=10)
+    assert [key.text for key in page.keys] == ["SHFIRST", "SHSECOND"]
+
+
+@pytest.mark.asyncio
+async def test_game_log_keys_page_ends_before_fresh_key(
+    started_game: dto.FullGame,
+    gryffindor: dto.Team,
+    harry: dto.Player,
+    dao: HolderDao,
+    clock: ClockMock,
+):
+    long_ago = datetime.now(tz=tz_utc) - timedelta(minutes=1)
+    await save_key(dao, started_game, gryffindor, harry, "SHOLD", at=long_ago)
+    await save_key(dao, started_game, gryffindor, harry, "SHFRESH")
+    await save_key(dao, started_game, gryffindor, harry, "SHLATE", at=long_ago)
+    await dao.commit()
+
+    clock.clear()
+    page = await dao.key_time.get_typed_keys_page(started_game, since=None, limit=10)
+    assert [key.text for key in page.keys] == ["SHOLD"]
+
+    clock.add_mock(tz=tz_utc, result=datetime.now(tz=tz_utc) + timedelta(minutes=1))
+    page = await dao.key_time.get_typed_keys_page(started_game, since=page.cursor, limit=10)
+    assert [key.text for key in page.keys] == ["SHFRESH", "SHLATE"]
+
+
 @pytest.mark.asyncio
 async def test_game_spy_started(started_game: dto.FullGame, dao: HolderDao, clock: ClockMock):
     assert started_game.start_at is not None
@@ -82,12 +224,11 @@ async def test_game_spy_with_second_level_first_and_last_hint(
     await dao.level_time.set_to_level(team=slytherin, game=started_game, level_number=1)
     await dao.commit()
     clock.clear()
-    clock.add_mock(tz=tz_utc, result=datetime.now(tz_utc) + timedelta(seconds=10))
+    # hint is calculated only for current level of every team
     clock.add_mock(tz=tz_utc, result=datetime.now(tz_utc) + timedelta(minutes=1))
-    clock.add_mock(tz=tz_utc, result=datetime.now(tz_utc) + timedelta(seconds=10))
     clock.add_mock(tz=tz_utc, result=datetime.now(tz_utc) + timedelta(minutes=5))
     game_stat = await get_game_spy(started_game, started_game.author, dao.game_stat)
-    assert len(clock.calls) == 4
+    assert len(clock.calls) == 2
     assert len(game_stat) == 2
     assert game_stat[1].hint.number == 3
     assert game_stat[1].hint.time == 5
@@ -0,0 +1,165 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from dishka import AsyncContainer
+from redis.asyncio import Redis
+
+from shvatka.core.utils.datetime_utils import tz_utc
+from shvatka.infrastructure.scheduler.hint_timeline import HintTimeline, TimelineHint
+
+
+class BatchesCollector:
+    def __init__(self) -> None:
+        self.batches: list[list[TimelineHint]] = []
+        self.received = asyncio.Event()
+
+    async def __call__(self, hints: list[TimelineHint]) -> None:
+        self.batches.append(hints)
+        self.received.set()
+
+    async def wait(self) -> list[TimelineHint]:
+        await asyncio.wait_for(self.received.wait(), 5)
+        self.received.clear()
+        return self.batches[-1]
+
+
+def make_hint(team_id: int) -> TimelineHint:
+    return TimelineHint(game_id=1, level_id=2, team_id=team_id, hint_number=1, lt_id=team_id)
+
+
+@pytest.mark.asyncio
+async def test_due_hints_in_one_batch(dishka: AsyncContainer):
+    redis = await dishka.get(Redis)
+    collector = BatchesCollector()
+    timeline = HintTimeline(redis, collector, key=f"test.{uuid.uuid4().hex}", poll_interval=10)
+    now = datetime.now(tz=tz_utc)
+    async with timeline.running():
+        for team_id in range(40):
+            await timeline.add(make_hint(team_id), now + timedelta(milliseconds=200))
+        await timeline.add(make_hint(100), now + timedelta(milliseconds=500))
+
+        first = await collector.wait()
+        assert sorted(hint.team_id for hint in first) == list(range(40))
+        assert await collector.wait() == [make_hint(100)]
+    assert len(collector.batches) == 2
+    assert await redis.zcard(timeline.key) == 0
+
+
+@pytest.mark.asyncio
+async def test_pending_hints_survive_restart(dishka: AsyncContainer):
+    redis = await dishka.get(Redis)
+    key = f"test.{uuid.uuid4().hex}"
+    run_at = datetime.now(tz=tz_utc) + timedelta(milliseconds=300)
+    collector = BatchesCollector()
+    async with HintTimeline(redis, collector, key=key).running() as timeline:
+        await timeline.add(make_hint(1), run_at)
+    assert collector.batches == []
+
+    async with HintTimeline(redis, collector, key=key).running():
+        assert await collector.wait() == [make_hint(1)]
+
+
+@pytest.mark.asyncio
+async def test_same_hint_planned_once(dishka: AsyncContainer):
+    redis = await dishka.get(Redis)
+    timeline = HintTimeline(redis, BatchesCollector(), key=f"test.{uuid.uuid4().hex}")
+    past = datetime.now(tz=tz_utc) - timedelta(seconds=1)
+    await timeline.add(make_hint(1), past)
+    await timeline.add(make_hint(1), past)
+    await timeline.add(make_hint(2), past + timedelta(hours=1))
+
+    assert await timeline.pop_due() == [make_hint(1)]
+    assert await timeline.pop_due() == []
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_retried(dishka: AsyncContainer):
+    redis = await dishka.get(Redis)
+    collector = BatchesCollector()
+    calls = 0
+
+    async def fail_once(hints: list[TimelineHint]) -> None:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise RuntimeError("no connection to db")
+        await collector(hints)
+
+    timeline = HintTimeline(
+        redis,
+        fail_once,
+        key=f"test.{uuid.uuid4().hex}",
+        poll_interval=0.05,
+        retry_delay=timedelta(milliseconds=100),
+    )
+    async with timeline.running():
+        await timeline.add(make_hint(1), datetime.now(tz=tz_utc))
+        assert await collector.wait() == [make_hint(1)]
+    assert calls == 2
+    assert await redis.zcard(timeline.key) == 0
+    assert await redis.zcard(timeline.processing_key) == 0
+
+
+@pytest.mark.asyncio
+async def test_hints_of_dead_worker_requeued(dishka: AsyncContainer):
+    redis = await dishka.get(Redis)
+    key = f"test.{uuid.uuid4().hex}"
+    collector = BatchesCollector()
+    dead = HintTimeline(redis, collector, key=key, worker_id="dead")
+    await dead.add(make_hint(1), datetime.now(tz=tz_utc) - timedelta(seconds=1))
+    assert await dead.pop_due() == [make_hint(1)]
+    # worker died before handler finished, hint is neither sent nor acked
+
+    alive = HintTimeline(redis, collector, key=key, worker_id="alive")
+    await alive.heartbeat()
+    await alive.add(make_hint(2), datetime.now(tz=tz_utc) - timedelta(seconds=1))
+    assert await alive.pop_due() == [make_hint(2)]
+
+    async with HintTimeline(redis, collector, key=key).running():
+        assert await collector.wait() == [make_hint(1)]
+    assert await redis.zcard(dead.processing_key) == 0
+    assert await redis.zcard(alive.processing_key) == 1
+
+
+@pytest.mark.asyncio
+async def test_shutdown_waits_in_flight_batch(dishka: AsyncContainer):
+    redis = await dishka.get(Redis)
+    started = asyncio.Event()
+    handled: list[TimelineHint] = []
+
+    async def slow_handler(hints: list[TimelineHint]) -> None:
+        started.set()
+        await asyncio.sleep(0.3)
+        handled.extend(hints)
+
+    timeline = HintTimeline(redis, slow_handler, key=f"test.{uuid.uuid4().hex}")
+    async with timeline.running():
+        await timeline.add(make_hint(1), datetime.now(tz=tz_utc))
+        await asyncio.wait_for(started.wait(), 5)
+    assert handled == [make_hint(1)]
+    assert await redis.zcard(timeline.key) == 0
+    assert await redis.zcard(timeline.processing_key) == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_batch_not_delays_next(dishka: AsyncContainer):
+    redis = await dishka.get(Redis)
+    release = asyncio.Event()
+    collector = BatchesCollector()
+
+    async def handler(hints: list[TimelineHint]) -> None:
+        if hints == [make_hint(1)]:
+            await release.wait()
+        await collector(hints)
+
+    timeline = HintTimeline(redis, handler, key=f"test.{uuid.uuid4().hex}")
+    now = datetime.now(tz=tz_utc)
+    async with timeline.running():
+        await timeline.add(make_hint(1), now)
+        await timeline.add(make_hint(2), now + timedelta(milliseconds=300))
+        assert await collector.wait() == [make_hint(2)]
+        release.set()
+        assert await collector.wait() == [make_hint(1)]
+    assert await redis.zcard(timeline.processing_key) == 0
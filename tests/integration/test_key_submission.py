@@ -0,0 +1,117 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from shvatka.core.models import dto, enums
+from shvatka.core.services.key import KeyProcessor
+from shvatka.core.utils.key_checker_lock import KeyCheckerFactory
+from shvatka.infrastructure.db.dao.holder import HolderDao
+from tests.utils.query_count import count_queries
+
+
+@pytest.mark.asyncio
+async def test_submission_state(
+    harry: dto.Player,
+    gryffindor: dto.Team,
+    slytherin: dto.Team,
+    started_game: dto.FullGame,
+    dao: HolderDao,
+    locker: KeyCheckerFactory,
+):
+    game = started_game
+    state = await dao.game_player.get_key_submission_state(gryffindor, game)
+    assert state.level_time.level_number == 0
+    assert state.typed_correct == set()
+    assert state.all_typed == set()
+
+    key_processor = KeyProcessor(dao=dao.game_player, game=game, locker=locker)
+    await key_processor.submit_key(key="SHWRONG", player=harry, team=gryffindor)
+    await key_processor.submit_key(key="SH123", player=harry, team=gryffindor)
+    await key_processor.submit_key(key="SH123", player=harry, team=gryffindor)
+
+    state = await dao.game_player.get_key_submission_state(gryffindor, game)
+    assert state.level_time == await dao.game_player.get_current_level_time(gryffindor, game)
+    assert state.typed_correct == {"SH123"}
+    assert state.all_typed == {"SH123", "SHWRONG"}
+
+    other_state = await dao.game_player.get_key_submission_state(slytherin, game)
+    assert other_state.all_typed == set()
+
+
+@pytest.mark.asyncio
+async def test_submit_key_round_trips(
+    harry: dto.Player,
+    gryffindor: dto.Team,
+    started_game: dto.FullGame,
+    dao: HolderDao,
+    locker: KeyCheckerFactory,
+    engine: AsyncEngine,
+):
+    game = started_game
+    key_processor = KeyProcessor(dao=dao.game_player, game=game, locker=locker)
+    await key_processor.submit_key(key="SHWRONG", player=harry, team=gryffindor)
+
+    with count_queries(engine) as legacy:
+        level_time = await dao.game_player.get_current_level_time(gryffindor, game)
+        await dao.game_player.get_current_level(gryffindor, game)
+        await dao.game_player.get_correct_typed_keys(level_time, game, gryffindor)
+        await dao.game_player.get_team_typed_keys(game, gryffindor, level_time)
+    with count_queries(engine) as submission:
+        await key_processor.submit_key(key="SHWRONG2", player=harry, team=gryffindor)
+    dao.key_submissions.clear()
+    with count_queries(engine) as cold_submission:
+        await key_processor.submit_key(key="SHWRONG3", player=harry, team=gryffindor)
+
+    assert len(legacy.selects) == 5
+    assert len(submission.selects) == 0
+    assert submission.count == 1  # only key insert
+    assert len(cold_submission.selects) == 1
+    assert cold_submission.count == 2  # state select and key insert
+
+
+@pytest.mark.asyncio
+async def test_submission_state_follows_level_up(
+    harry: dto.Player,
+    gryffindor: dto.Team,
+    started_game: dto.FullGame,
+    dao: HolderDao,
+    locker: KeyCheckerFactory,
+):
+    game = started_game
+    key_processor = KeyProcessor(dao=dao.game_player, game=game, locker=locker)
+    await key_processor.submit_key(key="SH123", player=harry, team=gryffindor)
+    state = dao.key_submissions.get(game_id=game.id, team_id=gryffindor.id)
+    assert state is not None
+    assert state.typed_correct == {"SH123"}
+
+    await key_processor.submit_key(key="SH321", player=harry, team=gryffindor)
+    assert dao.key_submissions.get(game_id=game.id, team_id=gryffindor.id) is None
+
+    state = await dao.game_player.get_key_submission_state(gryffindor, game)
+    assert state.level_time.level_number == 1
+    assert state.all_typed == set()
+
+
+@pytest.mark.asyncio
+async def test_not_committed_key_not_in_submission_state(
+    harry: dto.Player,
+    gryffindor: dto.Team,
+    started_game: dto.FullGame,
+    dao: HolderDao,
+):
+    game = started_game
+    game_player = dao.game_player
+    state = await game_player.get_key_submission_state(gryffindor, game)
+    await game_player.save_key(
+        key="SHWRONG",
+        team=gryffindor,
+        level_time=state.level_time,
+        game=game,
+        player=harry,
+        type_=enums.KeyType.wrong,
+        is_duplicate=False,
+    )
+    assert state.all_typed == set()
+
+    await game_player.commit()
+    assert state.all_typed == {"SHWRONG"}
+    assert state.typed_correct == set()
@@ -0,0 +1,81 @@
+import logging
+import time
+
+import pytest
+from dishka import AsyncContainer
+
+from shvatka.core.models import dto
+from shvatka.core.models.dto import scn, hints, action
+from shvatka.infrastructure.db.dao.holder import HolderDao
+from shvatka.infrastructure.db.models.level import scenarios_cache
+
+logger = logging.getLogger(__name__)
+
+LEVELS_COUNT = 40
+
+
+def create_level_scn(number: int) -> scn.LevelScenario:
+    return scn.LevelScenario.legacy_factory(
+        id=f"level_{number}",
+        time_hints=scn.HintsList(
+            [
+                hints.TimeHint(time=i * 10, hint=[hints.TextHint(f"level {number} hint {i}")])
+                for i in range(10)
+            ]
+        ),
+        keys={f"SH{number}X{i}" for i in range(20)},
+        bonus_keys={action.BonusKey(f"SHB{number}X{i}", 1) for i in range(10)},
+    )
+
+
+async def load_game(dishka: AsyncContainer, game_id: int) -> tuple[dto.FullGame, float]:
+    async with dishka() as request_container:
+        dao = await request_container.get(HolderDao)
+        started_at = time.perf_counter()
+        game = await dao.game.get_full(game_id)
+        return game, time.perf_counter() - started_at
+
+
+@pytest.mark.asyncio
+async def test_scenarios_deserialized_once(
+    game: dto.FullGame, author: dto.Player, dao: HolderDao, dishka: AsyncContainer
+):
+    scenarios = [create_level_scn(i) for i in range(LEVELS_COUNT)]
+    await dao.level.upsert_game_levels(author, scenarios, game)
+    await dao.commit()
+    scenarios_cache.clear()
+
+    cold, cold_time = await load_game(dishka, game.id)
+    warm, warm_time = await load_game(dishka, game.id)
+    logger.info(
+        "%s levels loaded in %.1f ms, from cache in %.1f ms",
+        LEVELS_COUNT,
+        cold_time * 1000,
+        warm_time * 1000,
+    )
+
+    loaded = {level.name_id: level.scenario for level in cold.levels}
+    assert [loaded[s.id] for s in scenarios] == scenarios
+    assert all(w.scenario is c.scenario for w, c in zip(warm.levels, cold.levels, strict=True))
+
+
+@pytest.mark.asyncio
+async def test_changed_scenario_deserialized_again(
+    game: dto.FullGame, author: dto.Player, dao: HolderDao, dishka: AsyncContainer
+):
+    level = game.levels[0]
+    old, _ = await load_game(dishka, game.id)
+
+    changed = scn.LevelScenario.legacy_factory(
+        id=level.name_id,
+        time_hints=level.scenario.time_hints,
+        keys={"SHNEWKEY"},
+    )
+    await dao.level.upsert(author, changed, game, 0)
+    await dao.commit()
+
+    new, _ = await load_game(dishka, game.id)
+    assert old.levels[0].scenario is not new.levels[0].scenario
+    assert new.levels[0].scenario == changed
+    assert new.levels[0].get_keys() == {"SHNEWKEY"}
+    assert new.levels[1].scenario is old.levels[1].scenario
@@ -0,0 +1,86 @@
+from typing import Any
+
+import pytest
+from aiogram.types import Update
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from shvatka.core.models import dto
+from shvatka.core.services.player import get_full_team_player
+from shvatka.core.services.team import rename_team
+from shvatka.infrastructure.db.dao.holder import HolderDao
+from shvatka.tgbot.middlewares.data_load_middleware import LoadDataMiddleware
+from tests.fixtures.chat_constants import create_tg_chat
+from tests.fixtures.user_constants import create_tg_user, HARRY_FIRST_NAME, HARRI_TG_ID
+from tests.utils.query_count import count_queries
+
+
+async def load_data(dao: HolderDao, **data: Any) -> dict[str, Any]:
+    async def handler(_: Any, data_: dict[str, Any]) -> dict[str, Any]:
+        return data_
+
+    return await LoadDataMiddleware()(handler, Update(update_id=1), {"dao": dao, **data})  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_private_message_cached(dao: HolderDao, engine: AsyncEngine):
+    tg_user = create_tg_user()
+    await load_data(dao, event_from_user=tg_user, event_chat=create_tg_chat(id_=HARRI_TG_ID))
+
+    with count_queries(engine) as queries:
+        data = await load_data(
+            dao, event_from_user=tg_user, event_chat=create_tg_chat(id_=HARRI_TG_ID)
+        )
+    assert data["user"].tg_id == tg_user.id
+    assert data["player"] is not None
+    assert data["team"] is None
+    assert queries.statements == []
+
+
+@pytest.mark.asyncio
+async def test_team_chat_message_cached(
+    dao: HolderDao, engine: AsyncEngine, harry: dto.Player, gryffindor: dto.Team
+):
+    await load_data(dao, event_from_user=create_tg_user(), event_chat=create_tg_chat())
+
+    with count_queries(engine) as queries:
+        data = await load_data(dao, event_from_user=create_tg_user(), event_chat=create_tg_chat())
+    assert data["player"].id == harry.id
+    assert data["team"].id == gryffindor.id
+    assert queries.statements == []
+
+
+@pytest.mark.asyncio
+async def test_changed_user_saved(dao: HolderDao, engine: AsyncEngine):
+    await load_data(dao, event_from_user=create_tg_user())
+
+    with count_queries(engine) as queries:
+        data = await load_data(dao, event_from_user=create_tg_user(username="the_chosen_one"))
+    assert len(queries.inserts) == 1
+    assert data["user"].username == "the_chosen_one"
+    assert data["user"].first_name == HARRY_FIRST_NAME
+    assert (await dao.user.get_by_tg_id(HARRI_TG_ID)).username == "the_chosen_one"
+
+
+@pytest.mark.asyncio
+async def test_renamed_team_not_cached(dao: HolderDao, harry: dto.Player, gryffindor: dto.Team):
+    await load_data(dao, event_from_user=create_tg_user(), event_chat=create_tg_chat())
+    captain = await get_full_team_player(player=harry, team=gryffindor, dao=dao.team_player)
+    await rename_team(gryffindor, captain, "Dumbledore's army", dao.team)
+
+    data = await load_data(dao, event_from_user=create_tg_user(), event_chat=create_tg_chat())
+    assert data["team"].name == "Dumbledore's army"
+
+
+@pytest.mark.asyncio
+async def test_linked_user_cache_invalidated_after_commit(dao: HolderDao, harry: dto.Player):
+    await load_data(dao, event_from_user=create_tg_user())
+    dummy = await dao.player.upsert_author_dummy()
+
+    harry_user = await dao.user.get_by_tg_id(HARRI_TG_ID)
+    await dao.player.link_user(dummy, harry_user)
+    assert harry_user.db_id is not None
+    assert dao.identities.get_player(harry_user.db_id).id == harry.id
+
+    await dao.commit()
+    data = await load_data(dao, event_from_user=create_tg_user())
+    assert data["player"].id == dummy.id
@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from shvatka.core.models import dto, enums
+from shvatka.core.models.dto import export_stat
+from shvatka.core.utils.datetime_utils import tz_utc
+from shvatka.infrastructure.crawler.game_scn.loader.load_scns import ResultsLoader
+from shvatka.infrastructure.db import models
+from shvatka.infrastructure.db.dao.holder import HolderDao
+from tests.utils.query_count import count_queries
+
+START_AT = datetime(2013, 3, 2, 20, tzinfo=tz_utc)
+
+
+def make_player(name: str) -> export_stat.Player:
+    return export_stat.Player(forum_name=name, identity=export_stat.PlayerIdentity.forum_name)
+
+
+def make_team_results(
+    players: list[str], levels_count: int, keys_per_level: int
+) -> tuple[list[export_stat.LevelTime], list[export_stat.Key]]:
+    levels = [
+        export_stat.LevelTime(number=number, at=START_AT + timedelta(hours=number))
+        for number in range(1, levels_count + 1)
+    ]
+    keys = [
+        export_stat.Key(
+            level=number,
+            player=make_player(players[i % len(players)]),
+            at=START_AT + timedelta(hours=number, minutes=i),
+            value=f"SH{number}{i}",
+        )
+        for number in range(1, levels_count + 1)
+        for i in range(keys_per_level)
+    ]
+    return levels, keys
+
+
+@pytest.mark.asyncio
+async def test_set_results_in_batches(
+    game: dto.FullGame,
+    gryffindor: dto.Team,
+    slytherin: dto.Team,
+    dao: HolderDao,
+    engine: AsyncEngine,
+):
+    gryffindor_levels, gryffindor_keys = make_team_results(["Hermione", "Ron"], 3, 10)
+    slytherin_levels, slytherin_keys = make_team_results(["Draco"], 2, 10)
+    results = export_stat.GameStat(
+        id=42,
+        start_at=START_AT,
+        results={gryffindor.name: gryffindor_levels, slytherin.name: slytherin_levels},
+        keys={gryffindor.name: gryffindor_keys, slytherin.name: slytherin_keys},
+        team_identity=export_stat.TeamIdentity.bomzheg_engine_name,
+    )
+
+    with count_queries(engine) as queries:
+        await ResultsLoader(dao).set_results(game, results)
+        await dao.commit()
+
+    assert len([q for q in queries.inserts if "INTO levels_times" in q]) == 1
+    assert len([q for q in queries.inserts if "INTO waivers" in q]) == 1
+    assert len([q for q in queries.inserts if "INTO log_keys" in q]) == 1
+    assert queries.count < len(gryffindor_keys) + len(slytherin_keys)
+
+    keys = await dao.key_time.get_typed_keys(game)
+    assert len(keys) == 50
+    linked = await dao.session.execute(
+        select(models.KeyTime.team_id, models.LevelTime.team_id, models.LevelTime.level_number)
+        .join(models.LevelTime, models.KeyTime.level_time_id == models.LevelTime.id)
+        .where(models.KeyTime.game_id == game.id)
+    )
+    assert set(linked.tuples()) == {
+        (gryffindor.id, gryffindor.id, 1),
+        (gryffindor.id, gryffindor.id, 2),
+        (gryffindor.id, gryffindor.id, 3),
+        (slytherin.id, slytherin.id, 1),
+        (slytherin.id, slytherin.id, 2),
+    }
+    assert {
+        (w.team.id, w.player.get_forum_name()) for w in await dao.waiver.get_all_by_game(game)
+    } == {
+        (gryffindor.id, "Hermione"),
+        (gryffindor.id, "Ron"),
+        (slytherin.id, "Draco"),
+    }
+    correct = [key for key in keys if key.type_ == enums.KeyType.simple]
+    assert len(correct) == 5
@@ -0,0 +1,48 @@
+import pytest
+
+from shvatka.core.models.enums import Played
+from shvatka.infrastructure.db.dao.holder import HolderDao
+
+
+@pytest.mark.asyncio
+async def test_team_votes(dao: HolderDao):
+    await dao.poll.add_player_vote(1, 10, Played.yes.name)
+    await dao.poll.add_player_vote(1, 11, Played.no.name)
+    await dao.poll.add_player_vote(2, 20, Played.think.name)
+    await dao.poll.add_player_vote(1, 11, Played.yes.name)
+    await dao.poll.del_player_vote(1, 10)
+
+    assert await dao.poll.get_dict_player_vote(1) == {11: Played.yes}
+    assert await dao.poll.get_dict_player_vote(2) == {20: Played.think}
+    assert await dao.poll.get_dict_player_vote(3) == {}
+
+
+@pytest.mark.asyncio
+async def test_delete_all(dao: HolderDao):
+    await dao.poll.add_player_vote(1, 10, Played.yes.name)
+    await dao.poll.add_player_vote(2, 20, Played.yes.name)
+    await dao.poll.save_poll_msg_id(chat_id=-100, game_id=1, msg_id=42)
+    assert await dao.poll.get_poll_msg_id(chat_id=-100, game_id=1) == 42
+
+    await dao.poll.delete_all()
+
+    assert await dao.poll.get_dict_player_vote(1) == {}
+    assert await dao.poll.get_dict_player_vote(2) == {}
+    assert await dao.poll.get_poll_msg_id(chat_id=-100, game_id=1) is None
+    assert await dao.poll.redis.keys("poll*") == []
+
+
+@pytest.mark.asyncio
+async def test_migrate_legacy_keys(dao: HolderDao):
+    await dao.poll.redis.set("poll:1:10", Played.yes.name)
+    await dao.poll.redis.set("poll:1:11", Played.no.name)
+    await dao.poll.redis.set("poll:2:20", Played.think.name)
+    await dao.poll.redis.set("msg_poll:-100:1", 42)
+
+    assert await dao.poll.migrate_legacy_keys() == 4
+
+    assert await dao.poll.get_dict_player_vote(1) == {10: Played.yes, 11: Played.no}
+    assert await dao.poll.get_dict_player_vote(2) == {20: Played.think}
+    assert await dao.poll.get_poll_msg_id(chat_id=-100, game_id=1) == 42
+    assert await dao.poll.redis.keys("poll:*:*") == []
+    assert await dao.poll.migrate_legacy_keys() == 0
@@ -0,0 +1,139 @@
+import asyncio
+import multiprocessing
+from datetime import timedelta, datetime
+
+import pytest
+import pytest_asyncio
+from dishka import AsyncContainer
+from redis.asyncio import Redis
+
+from shvatka.core.models import dto
+from shvatka.core.utils.datetime_utils import tz_utc
+from shvatka.infrastructure.db.config.models.db import RedisConfig
+from shvatka.infrastructure.db.config.models.locker import LockerConfig, LockerType
+from shvatka.infrastructure.db.dao.memory.key_submission import KeySubmissionCache
+from shvatka.infrastructure.db.dao.redis.locker import RedisLockFactory, RedisLock
+from shvatka.infrastructure.db.factory import create_redis
+
+LEVELS_COUNT = 20
+PROCESSES_COUNT = 4
+LEVEL_KEY = "test_locker:level"
+LEVEL_UPS_KEY = "test_locker:level_ups"
+CONFIG = LockerConfig(
+    type_=LockerType.redis,
+    lease=timedelta(seconds=10),
+    retry_interval=timedelta(milliseconds=2),
+)
+
+
+def team(id_: int) -> dto.Team:
+    return dto.Team(id_, *[None] * 5)
+
+
+@pytest_asyncio.fixture
+async def redis(dishka: AsyncContainer):
+    redis_ = await dishka.get(Redis)
+    yield redis_
+    await redis_.delete(LEVEL_KEY, LEVEL_UPS_KEY, *await redis_.keys("key_checker:*"))
+
+
+@pytest.mark.asyncio
+async def test_team_lock_exclusive(redis: Redis):
+    locker = RedisLockFactory(redis, CONFIG, KeySubmissionCache())
+    lock1 = locker(team(1))
+    lock2 = locker(team(1))
+    await lock1.acquire()
+    waiter = asyncio.create_task(lock2.acquire())
+    await asyncio.sleep(0.05)
+    assert not waiter.done()
+
+    async with locker(team(2)):
+        pass
+    await lock1.release()
+    await asyncio.wait_for(waiter, timeout=1)
+    await lock2.release()
+
+
+@pytest.mark.asyncio
+async def test_expired_lease_not_release_other_holder(redis: Redis):
+    config = LockerConfig(
+        type_=LockerType.redis,
+        lease=timedelta(milliseconds=50),
+        retry_interval=timedelta(milliseconds=2),
+    )
+    lock1 = RedisLock(redis, "team:1", config)
+    lock2 = RedisLock(redis, "team:1", config)
+    await lock1.acquire()
+    await asyncio.wait_for(lock2.acquire(), timeout=1)
+    assert lock1.fencing_token is not None
+    assert lock2.fencing_token == lock1.fencing_token + 1
+
+    await lock1.release()
+    assert await redis.get(lock2.key) == lock2.token.encode()
+    await lock2.release()
+    assert await redis.get(lock2.key) is None
+
+
+@pytest.mark.asyncio
+async def test_other_process_lock_invalidate_cache(redis: Redis):
+    gryffindor = team(1)
+    state = dto.KeySubmissionState(
+        level_time=dto.LevelTime(
+            id=1,
+            team=gryffindor,
+            game=dto.Game(1, *[None] * 7),
+            level_number=0,
+            start_at=datetime.now(tz=tz_utc),
+        ),
+        typed_correct=set(),
+        all_typed=set(),
+    )
+    cache = KeySubmissionCache()
+    locker = RedisLockFactory(redis, CONFIG, cache)
+    other_process_locker = RedisLockFactory(redis, CONFIG, KeySubmissionCache())
+
+    async with locker(gryffindor):
+        cache.put(state)
+    async with locker(gryffindor):
+        assert cache.get(game_id=1, team_id=gryffindor.id) is state
+
+    async with other_process_locker(gryffindor):
+        pass
+    async with locker(gryffindor):
+        assert cache.get(game_id=1, team_id=gryffindor.id) is None
+
+
+@pytest.mark.asyncio
+async def test_no_duplicate_level_up_in_several_processes(redis: Redis, dishka: AsyncContainer):
+    redis_config = await dishka.get(RedisConfig)
+    ctx = multiprocessing.get_context("spawn")
+    processes = [
+        ctx.Process(target=type_keys, args=(redis_config, worker))
+        for worker in range(PROCESSES_COUNT)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=60)
+    assert [process.exitcode for process in processes] == [0] * PROCESSES_COUNT
+
+    level_ups = [int(lu.split(b":")[1]) for lu in await redis.lrange(LEVEL_UPS_KEY, 0, -1)]
+    assert level_ups == list(range(LEVELS_COUNT))
+    assert int(await redis.get(LEVEL_KEY)) == LEVELS_COUNT
+
+
+def type_keys(redis_config: RedisConfig, worker: int) -> None:
+    asyncio.run(_type_keys(redis_config, worker))
+
+
+async def _type_keys(redis_config: RedisConfig, worker: int) -> None:
+    """every worker types the right key of every level, only first one have to level up"""
+    async with create_redis(redis_config) as redis:
+        locker = RedisLockFactory(redis, CONFIG, KeySubmissionCache())
+        for level_number in range(LEVELS_COUNT):
+            async with locker(team(1)):
+                current = int(await redis.get(LEVEL_KEY) or 0)
+                await asyncio.sleep(0.001)  # checking key takes some time
+                if current == level_number:
+                    await redis.set(LEVEL_KEY, current + 1)
+                    await redis.rpush(LEVEL_UPS_KEY, f"{worker}:{current}")
@@ -0,0 +1,57 @@
+from datetime import datetime
+
+import pytest
+
+from shvatka.core.models import dto
+from shvatka.core.services.game_play import start_game
+from shvatka.core.utils.datetime_utils import tz_utc
+from shvatka.infrastructure.db.dao.holder import HolderDao
+from tests.mocks.game_log import GameLogWriterMock
+from tests.mocks.game_view import GameViewMock
+from tests.mocks.scheduler_mock import SchedulerMock
+
+
+@pytest.mark.asyncio
+async def test_start_game_fills_cache(
+    game_with_waivers: dto.FullGame,
+    dao: HolderDao,
+    scheduler: SchedulerMock,
+):
+    game = game_with_waivers
+    game.start_at = datetime.now(tz=tz_utc)
+    assert dao.running_games.get(game.id) is None
+
+    await start_game(game, dao.game_starter, GameLogWriterMock(), GameViewMock(), scheduler)
+
+    assert dao.running_games.get(game.id) is game
+    assert await dao.game.get_running(game.id) is game
+
+    await dao.game.set_finished(game)
+    assert dao.running_games.get(game.id) is None
+
+
+@pytest.mark.asyncio
+async def test_running_game_lookups(started_game: dto.FullGame, dao: HolderDao):
+    running = await dao.game.get_running(started_game.id)
+    assert dao.running_games.get(started_game.id) is running
+    assert await dao.game.get_running(started_game.id) is running
+
+    first, second = running.levels
+    assert running.get_level_by_number(0) == first
+    assert running.get_level_by_number(1) == second
+    assert running.get_level_by_name_id(second.name_id) == second
+    assert running.get_level_by_name_id("not-existing") is None
+    assert running.get_level_by_db_id(first.db_id) == first
+
+
+@pytest.mark.asyncio
+async def test_not_started_game_not_cached(game: dto.FullGame, dao: HolderDao):
+    await dao.game.get_running(game.id)
+    assert dao.running_games.get(game.id) is None
+
+
+@pytest.mark.asyncio
+async def test_level_edit_invalidates_cache(started_game: dto.FullGame, dao: HolderDao):
+    await dao.game.get_running(started_game.id)
+    await dao.level.unlink(started_game.levels[1])
+    assert dao.running_games.get(started_game.id) is None
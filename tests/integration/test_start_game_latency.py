@@ -0,0 +1,87 @@
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from shvatka.core.models import dto
+from shvatka.core.models.enums.chat_type import ChatType
+from shvatka.core.models.enums.played import Played
+from shvatka.core.services.chat import upsert_chat
+from shvatka.core.services.game import start_waivers
+from shvatka.core.services.game_play import start_game
+from shvatka.core.services.team import create_team
+from shvatka.core.services.waiver import add_vote, approve_waivers
+from shvatka.core.utils.datetime_utils import tz_utc
+from shvatka.infrastructure.db.dao.holder import HolderDao
+from tests.fixtures.player import create_player, promote
+from tests.mocks.game_log import GameLogWriterMock
+from tests.mocks.game_view import GameViewMock
+from tests.mocks.scheduler_mock import SchedulerMock
+from tests.utils.query_count import count_queries
+
+logger = logging.getLogger(__name__)
+
+TEAMS_COUNT = 40
+
+
+@dataclass
+class TimedGameViewMock(GameViewMock):
+    first_puzzle_at: float | None = None
+
+    async def send_puzzle(self, team: dto.Team, level: dto.Level) -> None:
+        if self.first_puzzle_at is None:
+            self.first_puzzle_at = time.perf_counter()
+        await super().send_puzzle(team, level)
+
+
+async def create_teams(game: dto.Game, dao: HolderDao) -> list[dto.Team]:
+    teams = []
+    for i in range(TEAMS_COUNT):
+        captain = await create_player(
+            dto.User(tg_id=10_000 + i, username=f"captain_{i}", first_name=f"Captain {i}"), dao
+        )
+        await promote(captain, dao)
+        chat = await upsert_chat(
+            dto.Chat(tg_id=-10_000 - i, type=ChatType.supergroup, title=f"team {i}"), dao.chat
+        )
+        team = await create_team(chat, captain, dao.team_creator, GameLogWriterMock())
+        await add_vote(game, team, captain, Played.yes, dao.waiver_vote_adder)
+        await approve_waivers(game, team, captain, dao.waiver_approver)
+        teams.append(team)
+    return teams
+
+
+@pytest.mark.asyncio
+async def test_start_game_latency(
+    game: dto.FullGame,
+    author: dto.Player,
+    dao: HolderDao,
+    check_dao: HolderDao,
+    engine: AsyncEngine,
+):
+    # session-wide scheduler mock can hold calls left over from other tests
+    scheduler = SchedulerMock()
+    await start_waivers(game, author, dao.game)
+    teams = await create_teams(game, dao)
+    game.start_at = datetime.now(tz=tz_utc)
+    view = TimedGameViewMock()
+
+    with count_queries(engine) as queries:
+        started_at = time.perf_counter()
+        await start_game(game, dao.game_starter, GameLogWriterMock(), view, scheduler)
+    assert view.first_puzzle_at is not None
+    latency = view.first_puzzle_at - started_at
+    logger.info("first puzzle for %s teams sent in %.1f ms", TEAMS_COUNT, latency * 1000)
+
+    assert len(queries.inserts) == 1
+    assert len(view.send_puzzle_calls) == TEAMS_COUNT
+    for team in teams:
+        scheduler.assert_only_one_hint_for_team(game.levels[0], team, 1)
+    scheduler.assert_no_unchecked()
+    assert TEAMS_COUNT == await check_dao.level_time.count()
+    for team in teams:
+        lt = await check_dao.level_time.get_current_level_time(team, game)
+        assert lt.level_number == 0
@@ -1,5 +1,6 @@
 import pytest
 import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncEngine
 
 from shvatka.core.models import dto
 from shvatka.core.models.enums.played import Played
@@ -14,6 +15,7 @@ from shvatka.core.services.waiver import (
 from shvatka.core.utils.exceptions import PlayerRestoredInTeam, WaiverForbidden
 from shvatka.infrastructure.db import models
 from shvatka.infrastructure.db.dao.holder import HolderDao
+from tests.utils.query_count import count_queries
 
 
 @pytest.mark.asyncio
@@ -178,3 +180,51 @@ async def test_waiver_list(
         waiver.player.id for waiver in gryffindor_waivers
     }
     assert {draco_waiver.player.id} == {waiver.player.id for waiver in slytherin_waivers}
+
+
+@pytest.mark.asyncio
+async def test_waiver_list_one_query(
+    harry_waiver: dto.Waiver,
+    hermi_waiver: dto.Waiver,
+    ron_waiver: dto.Waiver,
+    draco_waiver: dto.Waiver,
+    game: dto.FullGame,
+    dao: HolderDao,
+    engine: AsyncEngine,
+):
+    with count_queries(engine) as queries:
+        waivers = await get_all_played(game, dao.waiver)
+    assert queries.count == 1
+    assert {team.id: len(list(players)) for team, players in waivers.items()} == {
+        harry_waiver.team.id: 2,
+        draco_waiver.team.id: 1,
+    }
+
+
+@pytest.mark.asyncio
+async def test_approve_waivers_queries_not_depend_on_voters(
+    harry: dto.Player,
+    hermione: dto.Player,
+    ron: dto.Player,
+    author: dto.Player,
+    gryffindor: dto.Team,
+    game: dto.FullGame,
+    dao: HolderDao,
+    engine: AsyncEngine,
+):
+    await start_waivers(game, author, dao.game)
+    await add_vote(game, gryffindor, harry, Played.yes, dao.waiver_vote_adder)
+    with count_queries(engine) as one_voter:
+        await approve_waivers(game, gryffindor, harry, dao.waiver_approver)
+
+    for player in (hermione, ron):
+        await join_team(player, gryffindor, harry, dao.team_player)
+    await add_vote(game, gryffindor, hermione, Played.yes, dao.waiver_vote_adder)
+    await add_vote(game, gryffindor, ron, Played.no, dao.waiver_vote_adder)
+    with count_queries(engine) as three_voters:
+        await approve_waivers(game, gryffindor, harry, dao.waiver_approver)
+
+    assert three_voters.count == one_voter.count
+    assert len([q for q in three_voters.inserts if "INTO waivers" in q]) == 1
+    waivers = {w.player.id: w.played for w in await dao.waiver.get_all_by_game(game)}
+    assert waivers == {harry.id: Played.yes, hermione.id: Played.yes, ron.id: Played.no}
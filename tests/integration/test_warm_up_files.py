@@ -0,0 +1,48 @@
+import pytest
+
+from shvatka.core.models import dto
+from shvatka.core.services.game_play import warm_up_files
+from shvatka.infrastructure.db.dao.holder import HolderDao
+from tests.fixtures.scn_fixtures import GUID
+from tests.mocks.file_gateway import FileGatewayMock
+from tests.mocks.org_notifier import OrgNotifierMock
+
+
+@pytest.mark.asyncio
+async def test_warm_up_valid_files(game: dto.FullGame, dao: HolderDao):
+    file_gateway = FileGatewayMock()
+    org_notifier = OrgNotifierMock()
+
+    result = await warm_up_files(game, dao.files_warm_up, file_gateway, org_notifier)
+
+    assert result.checked == 1
+    assert result.renewed == []
+    assert result.failed == []
+    assert file_gateway.renewed == []
+    org_notifier.assert_one_event(result)
+    assert [org.player for org in result.orgs_list] == [game.author]
+
+
+@pytest.mark.asyncio
+async def test_warm_up_renew_invalid_files(game: dto.FullGame, dao: HolderDao):
+    file_gateway = FileGatewayMock(invalid={GUID})
+    org_notifier = OrgNotifierMock()
+
+    result = await warm_up_files(game, dao.files_warm_up, file_gateway, org_notifier)
+
+    assert result.renewed == [GUID]
+    assert result.failed == []
+    assert file_gateway.renewed == [GUID]
+    org_notifier.assert_one_event(result)
+
+
+@pytest.mark.asyncio
+async def test_warm_up_report_failed_files(game: dto.FullGame, dao: HolderDao):
+    file_gateway = FileGatewayMock(invalid={GUID}, broken={GUID})
+    org_notifier = OrgNotifierMock()
+
+    result = await warm_up_files(game, dao.files_warm_up, file_gateway, org_notifier)
+
+    assert result.renewed == []
+    assert result.failed == [GUID]
+    org_notifier.assert_one_event(result)
@@ -0,0 +1,35 @@
+from typing import BinaryIO, Iterable
+
+from shvatka.core.interfaces.clients.file_storage import FileGateway, FileReader
+from shvatka.core.models import dto
+from shvatka.core.models.dto import hints
+
+
+class FileGatewayMock(FileGateway):
+    def __init__(self, invalid: Iterable[str] = (), broken: Iterable[str] = ()) -> None:
+        self.invalid = set(invalid)
+        self.broken = set(broken)
+        self.renewed: list[str] = []
+
+    async def put(self, file_meta: hints.UploadedFileMeta, content: BinaryIO, author: dto.Player):
+        raise NotImplementedError
+
+    async def upload(
+        self, file_meta: hints.UploadedFileMeta, content: BinaryIO, author: dto.Player
+    ) -> hints.FileMeta:
+        raise NotImplementedError
+
+    async def get(self, file_link: hints.FileMeta) -> BinaryIO:
+        raise NotImplementedError
+
+    async def open(self, file_meta: hints.FileMeta) -> FileReader:
+        raise NotImplementedError
+
+    async def is_tg_link_valid(self, file_meta: hints.FileMeta) -> bool:
+        return file_meta.guid not in self.invalid
+
+    async def renew_file_id(self, author: dto.Player, file_meta: hints.StoredFileMeta) -> None:
+        if file_meta.guid in self.broken:
+            raise IOError("can't read file")
+        self.renewed.append(file_meta.guid)
+        self.invalid.discard(file_meta.guid)
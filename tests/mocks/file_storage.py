@@ -1,7 +1,8 @@
 from typing import BinaryIO
 
-from shvatka.core.interfaces.clients.file_storage import FileStorage
+from shvatka.core.interfaces.clients.file_storage import FileStorage, FileReader
 from shvatka.core.models.dto import hints
+from shvatka.infrastructure.clients.file_storage import MemoryFileReader
 
 
 class MemoryFileStorage(FileStorage):
@@ -23,3 +24,8 @@ class MemoryFileStorage(FileStorage):
 
     async def get(self, file_link: hints.FileContentLink) -> BinaryIO:
         return self.storage[file_link.file_path]
+
+    async def open(self, file_link: hints.FileContentLink) -> FileReader:
+        content = self.storage[file_link.file_path]
+        content.seek(0)
+        return MemoryFileReader(content.read())
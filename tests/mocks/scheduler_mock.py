@@ -59,3 +59,9 @@ class SchedulerMock(Scheduler):
 
     async def cancel_scheduled_game(self, game: dto.Game) -> None:
         self.cancel_scheduled_game_calls.append(game)
+
+    async def start(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
@@ -0,0 +1,129 @@
+import logging
+import os
+import timeit
+from datetime import timedelta
+
+import pytest
+
+from shvatka.core.models.dto import scn, action, hints
+
+logger = logging.getLogger(__name__)
+
+WIN_KEYS = 300
+BONUS_KEYS = 200
+HINT_BONUS_KEYS = 100
+
+
+@pytest.fixture
+def big_level() -> scn.LevelScenario:
+    return scn.LevelScenario(
+        id="big",
+        time_hints=scn.HintsList(
+            [hints.TimeHint(time=i * 5, hint=[hints.TextHint(f"hint {i}")]) for i in range(50)]
+        ),
+        conditions=scn.Conditions(
+            [
+                action.KeyWinCondition({f"SHWIN{i}" for i in range(WIN_KEYS)}),
+                action.KeyWinCondition({"SHROUTE"}, next_level="other"),
+                action.KeyBonusCondition(
+                    {action.BonusKey(f"SHBONUS{i}", i % 50 - 10) for i in range(BONUS_KEYS)}
+                ),
+                action.KeyBonusHintCondition(
+                    {f"SHHINT{i}" for i in range(HINT_BONUS_KEYS)},
+                    [hints.TextHint("bonus hint")],
+                ),
+            ]
+        ),
+        __model_version__=1,
+    )
+
+
+def check_all_conditions(
+    level: scn.LevelScenario, action_: action.Action, state: action.StateHolder
+) -> action.Decision:
+    """проверка ключа перебором всех условий уровня, как до компиляции уровня"""
+    decisions = action.Decisions([c.check(action_, state) for c in level.conditions])
+    implemented = decisions.get_implemented()
+    if not implemented:
+        return action.NotImplementedActionDecision()
+    if bonuses := implemented.get_all(action.BonusKeyDecision):
+        return bonuses.get_exactly_one(level.id)
+    key_decisions = implemented.get_all(action.TypedKeyDecision, action.WrongKeyDecision)
+    if significant := key_decisions.get_significant():
+        return significant.get_exactly_one(level.id)
+    if duplicate_correct := key_decisions.get_all(action.TypedKeyDecision):
+        return duplicate_correct.get_exactly_one(level.id)
+    return key_decisions[0]
+
+
+def all_typed_keys() -> list[str]:
+    return [
+        *(f"SHWIN{i}" for i in range(WIN_KEYS)),
+        *(f"SHBONUS{i}" for i in range(BONUS_KEYS)),
+        *(f"SHHINT{i}" for i in range(HINT_BONUS_KEYS)),
+        "SHROUTE",
+        "SHWRONG",
+    ]
+
+
+def states() -> list[action.InMemoryStateHolder]:
+    almost_all_win = {f"SHWIN{i}" for i in range(1, WIN_KEYS)}
+    almost_all_hint = {f"SHHINT{i}" for i in range(1, HINT_BONUS_KEYS)}
+    return [
+        action.InMemoryStateHolder(set(), set()),
+        action.InMemoryStateHolder(almost_all_win, {*almost_all_win, "SHWRONG", "SHBONUS0"}),
+        action.InMemoryStateHolder(almost_all_hint, almost_all_hint),
+    ]
+
+
+def test_compiled_level_same_decisions(big_level: scn.LevelScenario):
+    for state in states():
+        for key in all_typed_keys():
+            typed = action.TypedKeyAction(key)
+            assert big_level.check(typed, state) == check_all_conditions(big_level, typed, state)
+
+
+class OtherAction(action.Action):
+    pass
+
+
+def test_compiled_level_not_key_action(big_level: scn.LevelScenario):
+    decision = big_level.check(OtherAction(), action.InMemoryStateHolder(set(), set()))
+    assert isinstance(decision, action.NotImplementedActionDecision)
+
+
+def test_compiled_level_keys(big_level: scn.LevelScenario):
+    compiled = big_level.compiled
+    assert compiled is big_level.compiled
+    assert compiled.keys == big_level.conditions.get_keys()
+    assert compiled.bonus_keys == big_level.conditions.get_bonus_keys()
+    assert big_level.get_keys() == big_level.conditions.get_keys()
+
+
+def test_compiled_level_hint_by_time(big_level: scn.LevelScenario):
+    for seconds in range(0, 300 * 60, 17):
+        time = timedelta(seconds=seconds)
+        assert big_level.get_hint_by_time(time) == big_level.time_hints.get_hint_by_time(time)
+    for minutes in range(0, 300, 5):
+        time = timedelta(minutes=minutes)
+        assert big_level.get_hint_by_time(time) == big_level.time_hints.get_hint_by_time(time)
+
+
+@pytest.mark.skipif(not os.getenv("SHVATKA_BENCHMARK"), reason="set SHVATKA_BENCHMARK to run")
+def test_compiled_level_benchmark(big_level: scn.LevelScenario):
+    state = states()[1]
+    typed_keys = [action.TypedKeyAction(key) for key in all_typed_keys()]
+    big_level.compiled  # noqa: B018
+
+    def check_compiled():
+        for typed in typed_keys:
+            big_level.check(typed, state)
+
+    def check_linear():
+        for typed in typed_keys:
+            check_all_conditions(big_level, typed, state)
+
+    compiled = min(timeit.repeat(check_compiled, number=5, repeat=3))
+    linear = min(timeit.repeat(check_linear, number=5, repeat=3))
+    logger.info("compiled check %.1f ms, linear %.1f ms", compiled * 1000, linear * 1000)
+    assert compiled * 2 < linear
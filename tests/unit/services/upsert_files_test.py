@@ -0,0 +1,67 @@
+import asyncio
+from io import BytesIO
+from typing import BinaryIO, Iterable, Sequence, cast
+
+import pytest
+
+from shvatka.core.interfaces.dal.game import GameUpserter
+from shvatka.core.models import dto
+from shvatka.core.models.dto import hints
+from shvatka.core.models.enums.hint_type import HintType
+from shvatka.core.services.scenario.files import upsert_files
+from tests.mocks.file_gateway import FileGatewayMock
+
+
+class SlowUploadGateway(FileGatewayMock):
+    def __init__(self) -> None:
+        super().__init__()
+        self.uploading = 0
+        self.max_uploading = 0
+
+    async def upload(
+        self, file_meta: hints.UploadedFileMeta, content: BinaryIO, author: dto.Player
+    ) -> hints.FileMeta:
+        self.uploading += 1
+        self.max_uploading = max(self.max_uploading, self.uploading)
+        await asyncio.sleep(0.01)
+        self.uploading -= 1
+        return hints.FileMeta(
+            guid=file_meta.guid,
+            original_filename=file_meta.original_filename,
+            extension=file_meta.extension,
+            file_content_link=hints.FileContentLink(file_path=file_meta.local_file_name),
+            tg_link=hints.TgLink(file_id=file_meta.guid, content_type=HintType.photo),
+        )
+
+
+class FilesDaoMock:
+    def __init__(self) -> None:
+        self.checks: list[list[str]] = []
+        self.saved: list[hints.FileMeta] = []
+
+    async def check_author_can_own_guids(self, author: dto.Player, guids: Iterable[str]):
+        self.checks.append(list(guids))
+
+    async def upsert_files(self, files: Sequence[hints.FileMeta], author: dto.Player):
+        self.saved.extend(files)
+
+
+@pytest.mark.asyncio
+async def test_upload_files_concurrently():
+    files = [
+        hints.UploadedFileMeta(guid=f"file-{i}", original_filename="photo", extension=".jpg")
+        for i in range(10)
+    ]
+    contents: dict[str, BinaryIO] = {f.guid: BytesIO(b"content") for f in files}
+    dao = FilesDaoMock()
+    gateway = SlowUploadGateway()
+    author = cast(dto.Player, None)
+
+    guids = await upsert_files(
+        author, contents, files, cast(GameUpserter, dao), gateway, concurrency=3
+    )
+
+    assert guids == {f.guid for f in files}
+    assert dao.checks == [[f.guid for f in files]]
+    assert [f.guid for f in dao.saved] == [f.guid for f in files]
+    assert gateway.max_uploading == 3
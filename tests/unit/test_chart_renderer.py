@@ -0,0 +1,61 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+
+import pytest
+
+from shvatka.common.data_examples import game_example, game_stat_example
+from shvatka.infrastructure.picture import create_chart_renderer, ChartRenderer
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    def __init__(self) -> None:
+        super().__init__(max_workers=2)
+        self.submitted = 0
+
+    def submit(self, fn, /, *args, **kwargs):
+        self.submitted += 1
+        return super().submit(fn, *args, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_render_in_process_pool():
+    renderer = create_chart_renderer(workers=1)
+    try:
+        png = await renderer.render(game_stat_example, game_example)
+    finally:
+        renderer.shutdown()
+    assert png.startswith(PNG_SIGNATURE)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_render_once():
+    executor = CountingExecutor()
+    renderer = ChartRenderer(executor)
+    try:
+        results = await asyncio.gather(
+            *[renderer.render(game_stat_example, game_example) for _ in range(5)]
+        )
+        assert executor.submitted == 1
+        assert all(png == results[0] for png in results)
+
+        assert await renderer.render(game_stat_example, game_example) == results[0]
+        assert executor.submitted == 1
+    finally:
+        renderer.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_changed_stat_render_again():
+    executor = CountingExecutor()
+    renderer = ChartRenderer(executor)
+    try:
+        await renderer.render(game_stat_example, game_example)
+        level_times = dict(list(game_stat_example.level_times.items())[:1])
+        changed_stat = replace(game_stat_example, level_times=level_times)
+        await renderer.render(changed_stat, game_example)
+        assert executor.submitted == 2
+    finally:
+        renderer.shutdown()
@@ -0,0 +1,32 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from shvatka.api.config.parser.main import load_config as load_api_config
+from shvatka.common.config.models.paths import Paths
+from shvatka.infrastructure.db.config.models.locker import LockerType
+from shvatka.tgbot.config.models.bot import BotApiType
+from shvatka.tgbot.config.parser.main import load_config as load_bot_config
+
+CONFIG_DIST = Path(__file__).parents[2] / "config_dist"
+
+
+@pytest.fixture
+def dist_paths(tmp_path: Path) -> Paths:
+    shutil.copytree(CONFIG_DIST, tmp_path / "config")
+    return Paths(tmp_path)
+
+
+def test_bot_config_dist(dist_paths: Paths):
+    config = load_bot_config(dist_paths)
+
+    assert config.bot.bot_api.type == BotApiType.local
+    assert config.bot.webhook is not None
+    assert config.locker.type_ == LockerType.memory
+
+
+def test_api_config_dist(dist_paths: Paths):
+    config = load_api_config(dist_paths)
+
+    assert config.context_path == ""
@@ -0,0 +1,104 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+from aiohttp import web, ClientSession
+from aiohttp.test_utils import TestServer, unused_port
+
+from shvatka.infrastructure.crawler.game_scn.parser.fetcher import (
+    AdaptiveRateLimiter,
+    ContentDownloadError,
+    FetchCache,
+    Fetcher,
+)
+
+
+class FakeForum:
+    def __init__(self, fails: int = 0) -> None:
+        self.port = unused_port()
+        self.fails = fails
+        self.requests = 0
+        self.active = 0
+        self.max_active = 0
+
+    async def page(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        if self.fails:
+            self.fails -= 1
+            return web.Response(status=503)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        return web.Response(body=request.match_info["id"].encode("cp1251"))
+
+    async def image(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        return web.Response(body=b"png", content_type="image/png")
+
+
+async def fetch(forum: FakeForum, cache_path: Path, *urls: str, **kwargs) -> list[bytes]:
+    app = web.Application()
+    app.router.add_get("/page/{id}", forum.page)
+    app.router.add_get("/image", forum.image)
+    async with TestServer(app, port=forum.port) as server, ClientSession() as session:
+        fetcher = Fetcher(
+            session,
+            FetchCache(cache_path),
+            AdaptiveRateLimiter(interval=0.0, min_interval=0.0),
+            **kwargs,
+        )
+        return await asyncio.gather(*[fetcher.get(str(server.make_url(url))) for url in urls])
+
+
+@pytest.mark.asyncio
+async def test_fetch_cached(tmp_path: Path):
+    forum = FakeForum()
+    assert await fetch(forum, tmp_path, "/page/1", "/image") == [b"1", b"png"]
+    assert forum.requests == 2
+
+    assert await fetch(forum, tmp_path, "/page/1", "/image") == [b"1", b"png"]
+    assert forum.requests == 2
+
+
+@pytest.mark.asyncio
+async def test_fetch_offline_from_cache(tmp_path: Path):
+    forum = FakeForum()
+    await fetch(forum, tmp_path, "/page/1")
+
+    assert await fetch(forum, tmp_path, "/page/1", offline=True) == [b"1"]
+    with pytest.raises(ContentDownloadError):
+        await fetch(forum, tmp_path, "/page/2", offline=True)
+    assert forum.requests == 1
+
+
+@pytest.mark.asyncio
+async def test_fetch_retry_server_error(tmp_path: Path):
+    forum = FakeForum(fails=2)
+    assert await fetch(forum, tmp_path, "/page/1", retries=2) == [b"1"]
+    assert forum.requests == 3
+
+    forum = FakeForum(fails=2)
+    with pytest.raises(ContentDownloadError):
+        await fetch(forum, tmp_path / "other", "/page/1", retries=1)
+
+
+@pytest.mark.asyncio
+async def test_fetch_concurrency_bounded(tmp_path: Path):
+    forum = FakeForum()
+    urls = [f"/page/{i}" for i in range(10)]
+    assert await fetch(forum, tmp_path, *urls, concurrency=3) == [
+        str(i).encode() for i in range(10)
+    ]
+    assert forum.max_active == 3
+
+
+def test_rate_limiter_adapts():
+    limiter = AdaptiveRateLimiter(interval=1.0, min_interval=0.5, max_interval=4.0)
+    limiter.slow_down()
+    limiter.slow_down()
+    limiter.slow_down()
+    assert limiter.interval == 4.0
+    for _ in range(100):
+        limiter.speed_up()
+    assert limiter.interval == 0.5
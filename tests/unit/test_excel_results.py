@@ -0,0 +1,59 @@
+from dataclasses import replace
+from datetime import time
+from io import BytesIO
+
+import pytest
+from openpyxl import load_workbook
+
+from shvatka.common.data_examples import game_example, game_stat_example
+from shvatka.core.models.enums import GameStatus
+from shvatka.core.utils.datetime_utils import trim_tz
+from shvatka.core.utils.exceptions import GameNotFinished
+from shvatka.tgbot.views.results.level_times import (
+    export_results,
+    export_season_results,
+    DATETIME_EXCEL_FORMAT,
+)
+
+
+def test_export_results():
+    file = BytesIO()
+    export_results(game_example, game_stat_example, file)
+    file.seek(0)
+    ws = load_workbook(file).active
+    assert ws is not None
+
+    assert ws["A1"].value == game_example.name
+    assert [c.value for c in ws[2]][:4] == [None, 0, 0, 1]
+    assert ws["A3"].value == "Gryffindor"
+    first_level_time = next(iter(game_stat_example.level_times.values()))[0]
+    assert ws["B3"].value == trim_tz(first_level_time.start_at)
+    assert ws["B3"].number_format == DATETIME_EXCEL_FORMAT
+    assert ws["A4"].value == "Slytherin"
+    assert all(c.value is None for c in ws[5])
+    assert [c.value for c in ws[6]][:4] == [None, 0, 1, 2]
+    assert ws["B7"].value == time(0, 40)
+    assert ws["B7"].number_format == DATETIME_EXCEL_FORMAT
+    assert ws.column_dimensions["A"].width == len("Gryffindor")
+    assert ws.column_dimensions["B"].width == len("2023-03-19 02:00:00")
+
+
+def test_export_season_results():
+    second = replace(game_example, id=2)
+    file = BytesIO()
+    export_season_results(
+        [(game_example, game_stat_example.level_times), (second, game_stat_example.level_times)],
+        file,
+    )
+    file.seek(0)
+    wb = load_workbook(file)
+    assert wb.sheetnames == [game_example.name, f"{game_example.name} (2)"]
+    for ws in wb.worksheets:
+        assert ws["A1"].value == game_example.name
+        assert ws["A3"].value == "Gryffindor"
+
+
+def test_export_not_finished_game():
+    game = replace(game_example, status=GameStatus.started)
+    with pytest.raises(GameNotFinished):
+        export_results(game, game_stat_example, BytesIO())
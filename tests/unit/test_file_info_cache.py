@@ -0,0 +1,46 @@
+from datetime import timedelta
+
+from shvatka.core.models.dto import hints
+from shvatka.infrastructure.db.dao.memory.file_info import FileInfoCache
+from tests.fixtures.file_storage import FILE_META
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def create_meta(guid: str) -> hints.VerifiableFileMeta:
+    return hints.VerifiableFileMeta(
+        guid=guid,
+        original_filename=FILE_META.original_filename,
+        extension=FILE_META.extension,
+        file_content_link=FILE_META.file_content_link,
+        tg_link=FILE_META.tg_link,
+        author_id=1,
+    )
+
+
+def test_expired():
+    clock = FakeClock()
+    cache = FileInfoCache(ttl=timedelta(seconds=10), clock=clock)
+    meta = create_meta("1")
+    cache.put(meta)
+    clock.now = 5
+    assert cache.get("1") is meta
+    clock.now = 11
+    assert cache.get("1") is None
+
+
+def test_least_recently_used_evicted():
+    cache = FileInfoCache(maxsize=2)
+    cache.put(create_meta("1"))
+    cache.put(create_meta("2"))
+    assert cache.get("1") is not None
+    cache.put(create_meta("3"))
+    assert cache.get("2") is None
+    assert cache.get("1") is not None
+    assert cache.get("3") is not None
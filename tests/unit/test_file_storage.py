@@ -3,21 +3,73 @@ from io import BytesIO
 from pathlib import Path
 
 import pytest
+from fastapi import HTTPException
+
+from shvatka.api.utils.file_response import parse_range
 
 from shvatka.common.config.models.main import FileStorageConfig
-from shvatka.infrastructure.clients.file_storage import LocalFileStorage
+from shvatka.infrastructure.clients.file_storage import (
+    LocalFileStorage,
+    MemoryFileReader,
+    LocalFileReader,
+)
 from tests.fixtures.file_storage import FILE_META
 
 
-@pytest.mark.asyncio
-async def test_file_storage():
+@pytest.fixture
+def file_storage() -> LocalFileStorage:
     storage_config = FileStorageConfig(
         path=Path(tempfile.gettempdir()) / "shvatka-files",
         mkdir=True,
         parents=False,
         exist_ok=True,
     )
-    file_storage = LocalFileStorage(storage_config)
+    return LocalFileStorage(storage_config)
+
+
+@pytest.mark.asyncio
+async def test_file_storage(file_storage: LocalFileStorage):
     saved = await file_storage.put_content(FILE_META.local_file_name, BytesIO(b"12345"))
     loaded = await file_storage.get(saved)
     assert loaded.read() == b"12345"
+
+
+@pytest.mark.asyncio
+async def test_file_storage_read_chunks(file_storage: LocalFileStorage):
+    content = bytes(range(256)) * 1000
+    saved = await file_storage.put_content(FILE_META.local_file_name, BytesIO(content))
+    assert (await file_storage.open(saved)).size == len(content)
+    reader = LocalFileReader(Path(saved.file_path), len(content), chunk_size=1000)
+
+    chunks = [chunk async for chunk in reader.iter_chunks()]
+    assert len(chunks) == 256
+    assert b"".join(chunks) == content
+    assert b"".join([c async for c in reader.iter_chunks(1500, 2500)]) == content[1500:2500]
+
+
+@pytest.mark.asyncio
+async def test_memory_reader_chunks():
+    reader = MemoryFileReader(b"0123456789", chunk_size=3)
+    assert [c async for c in reader.iter_chunks()] == [b"012", b"345", b"678", b"9"]
+    assert [c async for c in reader.iter_chunks(2, 7)] == [b"234", b"56"]
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        ("bytes=0-4", (0, 5)),
+        ("bytes=5-", (5, 10)),
+        ("bytes=-3", (7, 10)),
+        ("bytes=8-100", (8, 10)),
+        ("bytes=0-1,4-5", None),
+        ("items=0-4", None),
+    ],
+)
+def test_parse_range(header: str, expected: tuple[int, int] | None):
+    assert parse_range(header, 10) == expected
+
+
+def test_parse_unsatisfiable_range():
+    with pytest.raises(HTTPException) as e:
+        parse_range("bytes=10-", 10)
+    assert e.value.status_code == 416
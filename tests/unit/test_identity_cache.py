@@ -0,0 +1,69 @@
+from dataclasses import replace
+from datetime import timedelta
+
+from shvatka.core.models import dto
+from shvatka.infrastructure.db.dao.memory.identity import IdentityCache, IdentityChanges
+from tests.fixtures.chat_constants import create_gryffindor_dto_chat
+from tests.fixtures.user_constants import create_dto_harry
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_changed_payload_not_same():
+    cache = IdentityCache()
+    saved = replace(create_dto_harry(), db_id=1)
+    cache.put_user(saved)
+    assert cache.get_same_user(replace(saved, db_id=None)) is saved
+    assert cache.get_same_user(replace(saved, db_id=None, username="potter")) is None
+
+    chat = replace(create_gryffindor_dto_chat(), db_id=1)
+    cache.put_chat(chat)
+    assert cache.get_same_chat(replace(chat, db_id=None, description="ignored")) is chat
+    assert cache.get_same_chat(replace(chat, db_id=None, title="Griffindor")) is None
+
+
+def test_chat_without_team_known():
+    clock = FakeClock()
+    cache = IdentityCache(ttl=timedelta(seconds=10), clock=clock)
+    assert not cache.is_team_known(1)
+    cache.put_team(1, None)
+    assert cache.is_team_known(1)
+    assert cache.get_team(1) is None
+
+    clock.now = 11
+    assert not cache.is_team_known(1)
+
+
+def test_player_invalidation_drops_teams():
+    cache = IdentityCache()
+    player = dto.Player(id=10, can_be_author=False, is_dummy=False)
+    cache.put_player(1, player)
+    cache.put_team(1, None)
+
+    cache.invalidate_player(10)
+    assert cache.get_player(1) is None
+    assert not cache.is_team_known(1)
+
+
+def test_changes_applied_only_after_commit():
+    cache = IdentityCache()
+    changes = IdentityChanges(cache)
+    old_player = dto.Player(id=10, can_be_author=False, is_dummy=False)
+    cache.put_player(1, old_player)
+    cache.put_team(1, None)
+
+    # user is linked to other player, cache has entry of the old one
+    changes.invalidate_user_player(1)
+    changes.invalidate_player(20)
+    assert cache.get_player(1) is old_player
+    assert cache.is_team_known(1)
+
+    changes.apply()
+    assert cache.get_player(1) is None
+    assert not cache.is_team_known(1)
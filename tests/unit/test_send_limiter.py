@@ -0,0 +1,55 @@
+from datetime import timedelta
+
+import pytest
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import SendMessage
+
+from shvatka.tgbot.views.send_limiter import TokenBucket, SendLimiter
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_bucket_burst_and_refill():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=1, capacity=3, clock=clock)
+    assert [bucket.reserve() for _ in range(3)] == [0, 0, 0]
+    assert bucket.reserve() == 1
+    assert bucket.reserve() == 2
+
+    clock.now = 10
+    assert bucket.reserve() == 0
+
+
+def test_group_slower_than_private_chat():
+    clock = FakeClock()
+    limiter = SendLimiter(chat_interval=timedelta(seconds=1), chat_burst=1, clock=clock)
+    for _ in range(30):
+        limiter._chat_bucket(1).reserve()
+        limiter._chat_bucket(-1).reserve()
+        limiter._group_bucket(-1).reserve()
+    assert limiter._chat_bucket(1).reserve() == pytest.approx(30)
+    assert limiter._group_bucket(-1).reserve() == pytest.approx(33)
+
+
+@pytest.mark.asyncio
+async def test_retry_after_flood_error():
+    limiter = SendLimiter()
+    calls = 0
+
+    async def send() -> str:
+        nonlocal calls
+        calls += 1
+        if calls < 3:
+            raise TelegramRetryAfter(
+                method=SendMessage(chat_id=1, text="hi"), message="flood", retry_after=0
+            )
+        return "sent"
+
+    assert await limiter.send(1, send) == "sent"
+    assert calls == 3